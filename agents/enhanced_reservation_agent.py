@@ -1,9 +1,9 @@
-from typing import List, Dict, Any, Tuple
-import json
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from utils.llm_client import LLMClient
 from tools.tool_registry import tool_registry
 from tools.enhanced_reservation_tools import enhanced_reservation_tools
+from tools.restaurant_payloads import encode_result
 from config import config
 
 # Set up logging
@@ -68,13 +68,13 @@ Be conversational and helpful. Don't show technical details to users."""
                 arguments = tool_call["arguments"]
                 
                 # Execute the tool
-                result = self._execute_tool(function_name, arguments)
+                result = self._execute_tool(function_name, arguments, tool_call.get("id"))
                 tool_results[function_name] = result
                 
                 # Add tool response to conversation
                 self.conversation_history.append({
                     "role": "tool",
-                    "content": json.dumps({"result": result}),
+                    "content": encode_result({"result": result}),
                     "tool_call_id": tool_call["id"]
                 })
             
@@ -97,7 +97,8 @@ Be conversational and helpful. Don't show technical details to users."""
             self.conversation_history.append({"role": "assistant", "content": message_content})
             return message_content, tool_results
     
-    def _execute_tool(self, function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_tool(self, function_name: str, arguments: Dict[str, Any],
+                      tool_call_id: Optional[str] = None) -> Dict[str, Any]:
         """Safely execute tools with proper error handling"""
         try:
             # Use the global instance directly
@@ -105,34 +106,50 @@ Be conversational and helpful. Don't show technical details to users."""
                 result = enhanced_reservation_tools.search_restaurants(**arguments)
             elif function_name == "check_availability":
                 result = enhanced_reservation_tools.check_availability(**arguments)
+            elif function_name == "check_availability_matrix":
+                result = enhanced_reservation_tools.check_availability_matrix(**arguments)
+            elif function_name == "find_next_available":
+                result = enhanced_reservation_tools.find_next_available(**arguments)
             elif function_name == "create_reservation":
                 # Validate restaurant_id before creating reservation
                 restaurant_id = arguments.get('restaurant_id', '')
                 if not restaurant_id or not restaurant_id.startswith('rest_'):
-                    # Try to find a restaurant by name
-                    restaurant_name = arguments.get('restaurant_name', '')
+                    # Try to find a restaurant by name (models often pass the name as the id)
+                    restaurant_name = arguments.pop('restaurant_name', '') or restaurant_id
                     if restaurant_name:
-                        # Search for restaurant by name to get valid ID
-                        search_results = enhanced_reservation_tools.search_restaurants(
-                            cuisine=None, location=None, party_size=arguments.get('party_size')
+                        matches = enhanced_reservation_tools.resolve_restaurant_name(
+                            restaurant_name, arguments.pop('location', None)
                         )
-                        # Find restaurant by name match
-                        matching_restaurant = next(
-                            (r for r in search_results if r['name'].lower() == restaurant_name.lower()), 
-                            None
-                        )
-                        if matching_restaurant:
-                            arguments['restaurant_id'] = matching_restaurant['id']
+                        if len(matches) == 1:
+                            arguments['restaurant_id'] = matches[0]['id']
+                        elif matches:
+                            return {
+                                "success": False,
+                                "error": f"Several restaurants match '{restaurant_name}'. Please pick one by restaurant_id.",
+                                "candidates": matches
+                            }
                         else:
                             return {"success": False, "error": f"Restaurant '{restaurant_name}' not found"}
                     else:
                         return {"success": False, "error": "Invalid restaurant ID provided"}
                 
+                # The tool call id makes a re-sent tool call replay the original booking
+                arguments["idempotency_key"] = tool_call_id
                 result = enhanced_reservation_tools.create_reservation(**arguments)
+            elif function_name == "create_batch_reservations":
+                result = enhanced_reservation_tools.create_batch_reservations(**arguments)
             elif function_name == "cancel_reservation":
                 result = enhanced_reservation_tools.cancel_reservation(**arguments)
             elif function_name == "get_reservation_details":
                 result = enhanced_reservation_tools.get_reservation_details(**arguments)
+            elif function_name == "get_customer_reservations":
+                result = enhanced_reservation_tools.get_customer_reservations(**arguments)
+            elif function_name == "join_waitlist":
+                result = enhanced_reservation_tools.join_waitlist(**arguments)
+            elif function_name == "get_waitlist_status":
+                result = enhanced_reservation_tools.get_waitlist_status(**arguments)
+            elif function_name == "leave_waitlist":
+                result = enhanced_reservation_tools.leave_waitlist(**arguments)
             elif function_name == "get_restaurant_recommendations":
                 result = enhanced_reservation_tools.get_restaurant_recommendations(**arguments)
             else:
@@ -1,28 +1,80 @@
 from typing import List, Dict, Any
-from tools.reservation_tools import reservation_tools_instance
+from tools.enhanced_reservation_tools import enhanced_reservation_tools
+from models.restaurant import feature_mask
+import numpy as np
 import random
 
+OCCASION_FEATURES = {
+    "romantic": ["romantic", "candlelit", "fine dining"],
+    "business": ["business lunch", "private dining"],
+    "family": ["family friendly", "kids menu"],
+    "celebration": ["private dining", "chef's table"],
+}
+
+OCCASION_BONUS_FEATURES = {
+    "romantic": ["romantic", "candlelit"],
+    "business": ["business lunch", "private dining"],
+    "family": ["family friendly", "kids menu"],
+}
+
+OCCASION_REASONS = {
+    "romantic": "perfect for romantic occasions",
+    "business": "ideal for business meetings",
+    "family": "great for family gatherings",
+}
+
+# Feature masks of the occasions, tested against Restaurant.feature_mask
+_OCCASION_MASKS = {keyword: feature_mask(features) for keyword, features in OCCASION_FEATURES.items()}
+_OCCASION_BONUS_MASKS = {keyword: feature_mask(features) for keyword, features in OCCASION_BONUS_FEATURES.items()}
+
 class RecommendationEngine:
     def __init__(self):
-        self.restaurants = reservation_tools_instance.restaurants
+        self.reservation_tools = enhanced_reservation_tools
+        self.restaurants = enhanced_reservation_tools.restaurants
     
     def get_personalized_recommendations(self, 
                                       user_preferences: Dict[str, Any],
                                       previous_bookings: List[str] = None) -> List[Dict[str, Any]]:
         """Get personalized restaurant recommendations based on user preferences and history"""
         
+        if self.reservation_tools.columnar_catalog is not None:
+            top_restaurants = self._columnar_top_restaurants(user_preferences, 6)
+        else:
+            top_restaurants = self._scan_top_restaurants(user_preferences)[:6]
+        
+        # Convert to response format
+        recommendations = []
+        for restaurant in top_restaurants:  # Top 6 recommendations
+            rec = {
+                "id": restaurant.id,
+                "name": restaurant.name,
+                "location": restaurant.location,
+                "cuisine": restaurant.cuisine.value,
+                "price_range": restaurant.price_range.value,
+                "rating": restaurant.rating,
+                "available_tables": restaurant.available_tables,
+                "special_features": restaurant.special_features,
+                "match_score": self._calculate_relevance_score(restaurant, user_preferences),
+                "recommendation_reason": self._generate_recommendation_reason(restaurant, user_preferences)
+            }
+            recommendations.append(rec)
+        
+        return recommendations
+    
+    def _scan_top_restaurants(self, user_preferences: Dict[str, Any]) -> List:
+        """Filter and rank the restaurant list, most relevant first"""
         filtered_restaurants = self.restaurants.copy()
         
         # Apply preference filters
         if user_preferences.get("cuisine"):
             cuisine_pref = user_preferences["cuisine"].lower()
             filtered_restaurants = [r for r in filtered_restaurants 
-                                  if cuisine_pref in r.cuisine.value.lower()]
+                                  if cuisine_pref in r.cuisine_key]
         
         if user_preferences.get("location"):
             location_pref = user_preferences["location"].lower()
             filtered_restaurants = [r for r in filtered_restaurants 
-                                  if location_pref in r.location.lower()]
+                                  if location_pref in r.location_key]
         
         if user_preferences.get("price_range"):
             price_pref = user_preferences["price_range"]
@@ -37,44 +89,52 @@ class RecommendationEngine:
         # Apply occasion-based filtering
         occasion = user_preferences.get("occasion", "").lower()
         if occasion:
-            if "romantic" in occasion:
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["romantic", "candlelit", "fine dining"] 
-                                           for feat in r.special_features)]
-            elif "business" in occasion:
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["business lunch", "private dining"] 
-                                           for feat in r.special_features)]
-            elif "family" in occasion:
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["family friendly", "kids menu"] 
-                                           for feat in r.special_features)]
-            elif "celebration" in occasion:
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["private dining", "chef's table"] 
-                                           for feat in r.special_features)]
+            for keyword, occasion_mask in _OCCASION_MASKS.items():
+                if keyword in occasion:
+                    filtered_restaurants = [r for r in filtered_restaurants if r.feature_mask & occasion_mask]
+                    break
         
         # Sort by relevance score
         filtered_restaurants.sort(key=lambda x: self._calculate_relevance_score(x, user_preferences), reverse=True)
         
-        # Convert to response format
-        recommendations = []
-        for restaurant in filtered_restaurants[:6]:  # Top 6 recommendations
-            rec = {
-                "id": restaurant.id,
-                "name": restaurant.name,
-                "location": restaurant.location,
-                "cuisine": restaurant.cuisine.value,
-                "price_range": restaurant.price_range.value,
-                "rating": restaurant.rating,
-                "available_tables": restaurant.available_tables,
-                "special_features": restaurant.special_features,
-                "match_score": self._calculate_relevance_score(restaurant, user_preferences),
-                "recommendation_reason": self._generate_recommendation_reason(restaurant, user_preferences)
-            }
-            recommendations.append(rec)
+        return filtered_restaurants
+    
+    def _columnar_top_restaurants(self, user_preferences: Dict[str, Any], limit: int) -> List:
+        """Same filters and ranking as _scan_top_restaurants, evaluated as column masks"""
+        catalog = self.reservation_tools.columnar_catalog
         
-        return recommendations
+        occasion = user_preferences.get("occasion", "").lower()
+        occasion_features = None
+        if occasion:
+            occasion_features = next((features for keyword, features in OCCASION_FEATURES.items()
+                                      if keyword in occasion), None)
+        
+        mask = catalog.mask(
+            cuisine=user_preferences.get("cuisine") or None,
+            location=user_preferences.get("location") or None,
+            price_range=user_preferences.get("price_range") or None,
+            min_available=user_preferences.get("party_size") or None,
+            any_features=occasion_features
+        )
+        
+        # Every surviving row satisfies the preference filters, so those bonuses are uniform
+        n = len(catalog.rows)
+        scores = catalog.rating[:n].copy()
+        if user_preferences.get("cuisine"):
+            scores += 1.0
+        if user_preferences.get("location"):
+            scores += 0.5
+        if user_preferences.get("price_range"):
+            scores += 0.5
+        if user_preferences.get("party_size"):
+            scores += 0.3
+        if occasion:
+            for keyword, features in OCCASION_BONUS_FEATURES.items():
+                if keyword in occasion:
+                    scores += np.where(catalog.has_any_feature(features), 0.7, 0.0)
+        scores = np.round(scores, 2)
+        
+        return catalog.restaurants_at(catalog.top_k(mask, limit, primary=scores))
     
     def _calculate_relevance_score(self, restaurant, user_preferences: Dict[str, Any]) -> float:
         """Calculate relevance score for a restaurant based on user preferences"""
@@ -82,12 +142,12 @@ class RecommendationEngine:
         
         # Cuisine match
         if user_preferences.get("cuisine"):
-            if user_preferences["cuisine"].lower() in restaurant.cuisine.value.lower():
+            if user_preferences["cuisine"].lower() in restaurant.cuisine_key:
                 score += 1.0
         
         # Location match
         if user_preferences.get("location"):
-            if user_preferences["location"].lower() in restaurant.location.lower():
+            if user_preferences["location"].lower() in restaurant.location_key:
                 score += 0.5
         
         # Price range match
@@ -103,12 +163,9 @@ class RecommendationEngine:
         # Occasion suitability
         occasion = user_preferences.get("occasion", "").lower()
         if occasion:
-            if "romantic" in occasion and any(feat.lower() in ["romantic", "candlelit"] for feat in restaurant.special_features):
-                score += 0.7
-            if "business" in occasion and any(feat.lower() in ["business lunch", "private dining"] for feat in restaurant.special_features):
-                score += 0.7
-            if "family" in occasion and any(feat.lower() in ["family friendly", "kids menu"] for feat in restaurant.special_features):
-                score += 0.7
+            for keyword, occasion_mask in _OCCASION_BONUS_MASKS.items():
+                if keyword in occasion and restaurant.feature_mask & occasion_mask:
+                    score += 0.7
         
         return round(score, 2)
     
@@ -124,23 +181,20 @@ class RecommendationEngine:
         
         # Cuisine match
         if user_preferences.get("cuisine"):
-            if user_preferences["cuisine"].lower() in restaurant.cuisine.value.lower():
+            if user_preferences["cuisine"].lower() in restaurant.cuisine_key:
                 reasons.append("matches your preferred cuisine")
         
         # Location convenience
         if user_preferences.get("location"):
-            if user_preferences["location"].lower() in restaurant.location.lower():
+            if user_preferences["location"].lower() in restaurant.location_key:
                 reasons.append("convenient location")
         
         # Occasion suitability
         occasion = user_preferences.get("occasion", "").lower()
         if occasion:
-            if "romantic" in occasion and any(feat.lower() in ["romantic", "candlelit"] for feat in restaurant.special_features):
-                reasons.append("perfect for romantic occasions")
-            if "business" in occasion and any(feat.lower() in ["business lunch", "private dining"] for feat in restaurant.special_features):
-                reasons.append("ideal for business meetings")
-            if "family" in occasion and any(feat.lower() in ["family friendly", "kids menu"] for feat in restaurant.special_features):
-                reasons.append("great for family gatherings")
+            for keyword, reason in OCCASION_REASONS.items():
+                if keyword in occasion and restaurant.feature_mask & _OCCASION_BONUS_MASKS[keyword]:
+                    reasons.append(reason)
         
         # Special features
         if restaurant.special_features:
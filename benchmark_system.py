@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the restaurant reservation system.
+
+Run all benchmarks with `python benchmark_system.py`, or pick some by name:
+`python benchmark_system.py spatial`
+"""
+
+import sys
+import time
+from data.sample_restaurants import AREA_COORDINATES
+from data.synthetic import SyntheticCatalog
+from tools.enhanced_reservation_tools import EnhancedReservationTools
+
+
+def _timed(func, repeat: int) -> float:
+    """Average wall time of func() in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _catalog(count: int, seed: int = 7):
+    # Same seed, same restaurants: every benchmark runs on reproducible data
+    return SyntheticCatalog(count, seed=seed).restaurants()
+
+
+def benchmark_spatial(count: int = 50000):
+    """Radius and k-nearest search against a full scan of the catalog"""
+    print(f"📍 Spatial search over {count} restaurants...")
+
+    tools = EnhancedReservationTools(_catalog(count))
+    lat, lon = AREA_COORDINATES["Harbor View"]
+
+    def full_scan():
+        from tools.spatial_index import haversine_km
+        hits = [(haversine_km(lat, lon, r.latitude, r.longitude), r) for r in tools.restaurants
+                if r.available_tables >= 6]
+        return sorted((h for h in hits if h[0] <= 2.0), key=lambda h: h[0])[:10]
+
+    def radius_search():
+        tools._search_restaurants(None, None, 6, None, None, None, None,
+                                  near="Harbor View", radius_km=2.0)
+
+    def nearest_search():
+        tools._search_restaurants(None, None, 6, None, None, None, None,
+                                  near=f"{lat},{lon}", nearest=10)
+
+    print(f"  full scan:        {_timed(full_scan, 5):8.2f} ms")
+    print(f"  radius 2 km:      {_timed(radius_search, 5):8.2f} ms")
+    print(f"  10 nearest:       {_timed(nearest_search, 50):8.2f} ms")
+
+
+def benchmark_availability_matrix(count: int = 2000):
+    """One matrix call against the equivalent loop of check_availability calls"""
+    print(f"🗓️ Availability matrix over {count} restaurants...")
+
+    from datetime import date, timedelta
+    tools = EnhancedReservationTools(_catalog(count))
+    ids = [r.id for r in tools.restaurants[:50]]
+    days = [(date.today() + timedelta(days=i)).isoformat() for i in range(1, 8)]
+    times = ["18:00", "18:30", "19:00", "19:30", "20:00", "20:30", "21:00"]
+
+    def looped():
+        for rid in ids:
+            for day in days:
+                for at in times:
+                    tools.check_availability(rid, day, at, 4)
+
+    def matrix():
+        tools.check_availability_matrix(4, days[0], times, date_to=days[-1], restaurant_ids=ids)
+
+    print(f"  looped checks:    {_timed(looped, 1):8.2f} ms")
+    print(f"  single matrix:    {_timed(matrix, 20):8.2f} ms")
+
+
+def benchmark_next_available(count: int = 20000):
+    """Next-available search for a fully booked evening against probing slot by slot"""
+    print(f"⏭️ Next available slot over {count} restaurants...")
+
+    from datetime import date, datetime, timedelta
+    tools = EnhancedReservationTools(_catalog(count))
+    ledger = tools.capacity_ledger
+    restaurant = tools.restaurants[0]
+    day = date.today() + timedelta(days=3)
+    for offset in range(-3, 4):
+        # Fill every evening around the requested one so the search has to move outward
+        for hour in (11, 13, 15, 17, 19, 21):
+            at = datetime.strptime(f"{hour}:00", "%H:%M").time()
+            ledger.book(restaurant.id, day + timedelta(days=offset), at,
+                        ledger.seats_free(restaurant.id, day + timedelta(days=offset), at))
+
+    def probing():
+        hits = []
+        for offset in tools._outward_offsets(7):
+            for slot in range(ledger.slots_per_day):
+                at = (datetime.min + timedelta(minutes=slot * ledger.slot_minutes)).time()
+                result = tools.check_availability(restaurant.id, (day + timedelta(days=offset)).isoformat(),
+                                                  at.strftime("%H:%M"), 4)
+                if result["available"]:
+                    hits.append(result)
+            if len(hits) >= 5:
+                return hits
+
+    def summary():
+        tools.find_next_available([restaurant.id], 4, day.isoformat(), "19:00", include_similar=False)
+
+    print(f"  slot probing:     {_timed(probing, 3):8.2f} ms")
+    print(f"  day summary:      {_timed(summary, 50):8.2f} ms")
+
+
+def benchmark_concurrency(count: int = 2000, bookings: int = 4000):
+    """
+    Concurrent create/cancel stress test: checks that nothing is overbooked or lost
+    and reports booking throughput as the number of threads grows.
+    """
+    print(f"🧵 Concurrent bookings over {count} restaurants...")
+
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import date, timedelta
+
+    day = (date.today() + timedelta(days=1)).isoformat()
+    for threads in (1, 2, 4, 8):
+        tools = EnhancedReservationTools(_catalog(count))
+        hot = tools.restaurants[0]
+        initial = sum(r.current_reservations for r in tools.restaurants)
+
+        def worker(seed: int):
+            rng = random.Random(seed)
+            booked = []
+            for i in range(bookings // threads):
+                # Every fourth booking targets the same restaurant and slot to force contention;
+                # each one is a different customer, so none is replayed as a retry of another
+                restaurant = hot if i % 4 == 0 else rng.choice(tools.restaurants)
+                result = tools.create_reservation(restaurant.id, "Stress Test", f"555{seed}{i:06d}",
+                                                  f"stress{seed}.{i}@example.com", 4, day, "19:00")
+                if result["success"]:
+                    booked.append(result["reservation_id"])
+                if booked and rng.random() < 0.2:
+                    tools.cancel_reservation(booked.pop(rng.randrange(len(booked))))
+            return len(booked)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            kept = sum(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - start
+
+        ledger = tools.capacity_ledger
+        n = len(tools.restaurants)
+        overbooked = int((ledger.booked[:n].max(axis=(1, 2)) > ledger.capacity[:n]).sum())
+        counters = sum(r.current_reservations for r in tools.restaurants) - initial
+        consistent = kept == len(tools.reservations) == counters
+        print(f"  {threads} thread(s):      {bookings / elapsed:8.0f} bookings/s, "
+              f"overbooked restaurants: {overbooked}, records consistent: {consistent}")
+
+
+def benchmark_reservation_store(count: int = 200000):
+    """Reservation lookups by id and by customer against scanning a plain list"""
+    print(f"📒 Reservation lookups over {count} bookings...")
+
+    from models.restaurant import Reservation
+    from tools.reservation_store import ReservationStore
+    store = ReservationStore()
+    for i in range(count):
+        store.add(Reservation(
+            id=f"RES_{i:08d}", restaurant_id=f"rest_{i % 5000:06d}", customer_name="Guest",
+            customer_phone=f"555{i % 50000:07d}", customer_email=f"guest{i % 50000}@example.com",
+            party_size=2, reservation_date="2025-01-01", reservation_time="19:00"
+        ))
+    as_list = list(store)
+    target = f"RES_{count - 1:08d}"
+
+    print(f"  list scan by id:  {_timed(lambda: next(r for r in as_list if r.id == target), 5):8.3f} ms")
+    print(f"  store by id:      {_timed(lambda: store.get(target), 1000):8.3f} ms")
+    print(f"  list by email:    {_timed(lambda: [r for r in as_list if r.customer_email == 'guest7@example.com'], 5):8.3f} ms")
+    print(f"  store by email:   {_timed(lambda: store.for_customer(email='guest7@example.com'), 1000):8.3f} ms")
+
+
+def benchmark_tables(restaurants: int = 200, requests: int = 60):
+    """
+    Busy Friday night: a stream of parties per restaurant between 17:00 and 21:30,
+    assigned by best-fit packing versus naive first-fit (first free table that is
+    big enough, no combining). Reports seated covers and assignment latency.
+    """
+    print(f"🍽️ Friday-night table assignment, {restaurants} restaurants x {requests} requests...")
+
+    import random
+    from datetime import date, datetime, timedelta
+    from data.sample_restaurants import generate_tables
+    from models.restaurant import Restaurant
+    from tools.table_allocator import TableAllocator
+
+    class FirstFitAllocator(TableAllocator):
+        def _choose(self, layout, slots, span, party_size):
+            busy = 0
+            for slot in range(*span):
+                busy |= slots[slot] if slots else 0
+            bits = [layout.bit_by_id[t.id] for t in sorted(layout.tables, key=lambda t: t.id)
+                    if t.seats >= party_size and not busy & layout.bit_by_id[t.id]]
+            return bits[:1] or None
+
+    rng = random.Random(7)
+    random.seed(7)  # generate_tables draws from the module generator
+    friday = date.today() + timedelta(days=(4 - date.today().weekday()) % 7 or 7)
+    venues = [Restaurant(id=f"rest_{i:06d}", name="Bench", location="Downtown", cuisine="Italian",
+                         price_range="$$", capacity=60, tables=generate_tables(60)) for i in range(restaurants)]
+    sizes, weights = [1, 2, 3, 4, 5, 6, 7, 8, 10], [3, 40, 12, 22, 8, 8, 3, 3, 1]
+    stream = [(venue.id, datetime.strptime(rng.choice(["17:00", "17:30", "18:00", "18:30", "19:00", "19:30",
+                                                         "20:00", "20:30", "21:00", "21:30"]), "%H:%M").time(),
+               rng.choices(sizes, weights)[0]) for venue in venues for _ in range(requests)]
+
+    for label, allocator in (("best fit", TableAllocator()), ("first fit", FirstFitAllocator())):
+        for venue in venues:
+            allocator.register(venue)
+        seated = 0
+        start = time.perf_counter()
+        for restaurant_id, at, party in stream:
+            if allocator.assign(restaurant_id, friday, at, party) is not None:
+                seated += party
+        elapsed = time.perf_counter() - start
+        print(f"  {label:10s} {seated / restaurants:6.1f} covers/restaurant, "
+              f"{elapsed / len(stream) * 1e6:6.1f} us per assignment")
+
+
+def benchmark_batch(count: int = 2000, items: int = 50, rounds: int = 20):
+    """Per-item cost of create_batch_reservations against one create_reservation call per item"""
+    print(f"📦 Batch bookings of {items} items over {count} restaurants...")
+
+    import random
+    from datetime import date, timedelta
+    tools = EnhancedReservationTools(_catalog(count))
+    rng = random.Random(3)
+    contact = {"customer_name": "Acme Corp", "customer_phone": "5551234567", "customer_email": "events@acme.com"}
+
+    def batch_items():
+        return [{"restaurant_id": rng.choice(tools.restaurants).id, "party_size": 2,
+                 "date": (date.today() + timedelta(days=rng.randint(1, 30))).isoformat(),
+                 "time": rng.choice(["12:00", "13:00", "19:00", "20:00"])} for _ in range(items)]
+
+    def single_calls():
+        for item in batch_items():
+            tools.create_reservation(item["restaurant_id"], contact["customer_name"], contact["customer_phone"],
+                                     contact["customer_email"], item["party_size"], item["date"], item["time"])
+
+    def batch_call():
+        tools.create_batch_reservations(batch_items(), **contact)
+
+    print(f"  single calls:     {_timed(single_calls, rounds) / items * 1000:8.1f} us per item")
+    print(f"  one batch call:   {_timed(batch_call, rounds) / items * 1000:8.1f} us per item")
+
+
+def benchmark_storage(count: int = 2000, bookings: int = 2000):
+    """
+    Booking throughput and lookup latency with reservations kept in memory only
+    against writing them through to SQLite, plus the time to reload on restart.
+    """
+    print(f"💾 Storage backends, {bookings} bookings over {count} restaurants...")
+
+    import os
+    import random
+    import tempfile
+    from datetime import date, timedelta
+    from storage import SQLiteBackend
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    restaurants = _catalog(count)
+    days = [(date.today() + timedelta(days=d)).isoformat() for d in range(1, 31)]
+    for label, storage in (("memory", None), ("sqlite", SQLiteBackend(path))):
+        tools = EnhancedReservationTools([r.model_copy(deep=True) for r in restaurants], storage=storage)
+        rng = random.Random(5)
+        start = time.perf_counter()
+        booked = []
+        for i in range(bookings):
+            result = tools.create_reservation(rng.choice(tools.restaurants).id, "Guest", f"555{i % 500:07d}",
+                                              f"guest{i % 500}@example.com", 2, rng.choice(days), "19:00")
+            if result["success"]:
+                booked.append(result["reservation_id"])
+        elapsed = time.perf_counter() - start
+        target = booked[len(booked) // 2]
+        if storage is None:
+            by_id = _timed(lambda: tools.reservations.get(target), 1000)
+            by_email = _timed(lambda: tools.reservations.for_customer(email="guest7@example.com"), 1000)
+        else:
+            by_id = _timed(lambda: storage.get_reservation(target), 1000)
+            by_email = _timed(lambda: storage.find_reservations(email="guest7@example.com"), 1000)
+        print(f"  {label:7s} {len(booked) / elapsed:8.0f} bookings/s, by id {by_id * 1000:6.1f} us, "
+              f"by email {by_email * 1000:6.1f} us")
+
+    start = time.perf_counter()
+    reloaded = EnhancedReservationTools(storage=SQLiteBackend(path))
+    print(f"  sqlite restart:   {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"({len(reloaded.restaurants)} restaurants, {len(reloaded.reservations)} reservations)")
+
+
+def benchmark_journal(history: int = 1000000, threads: int = 8, appends: int = 4000):
+    """
+    Group-commit throughput of the journal, then crash-recovery time after a
+    history of bookings (a fifth of them cancelled) with and without snapshots.
+    """
+    print(f"📜 Journal with group commit, recovery after {history} bookings...")
+
+    import os
+    import random
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from models.restaurant import Reservation
+    from storage import JournalBackend
+
+    restaurants = _catalog(500)
+
+    def reservation(i: int) -> Reservation:
+        return Reservation.model_construct(
+            id=f"RES_{i:08d}", restaurant_id=restaurants[i % len(restaurants)].id, customer_name="Guest",
+            customer_phone=f"555{i % 50000:07d}", customer_email=f"guest{i % 50000}@example.com", party_size=2,
+            reservation_date="2025-01-01", reservation_time="19:00", special_requests="", table_ids=[],
+            status="confirmed", created_at="2025-01-01T12:00:00")
+
+    for workers in (1, threads):
+        journal = JournalBackend(tempfile.mkdtemp())
+        start = time.perf_counter()
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda i: journal.save_bookings([reservation(i)], []), range(appends)))
+        elapsed = time.perf_counter() - start
+        print(f"  {workers} thread(s):      {appends / elapsed:8.0f} fsynced bookings/s, "
+              f"{journal.records / journal.writes:5.1f} records per fsync")
+        journal.close()
+
+    for label, snapshot_every in (("with snapshots", 100000), ("journal only", history + 1)):
+        directory = tempfile.mkdtemp()
+        journal = JournalBackend(directory, snapshot_every=snapshot_every, fsync=False)
+        journal.save_restaurants(restaurants)
+        rng = random.Random(11)
+        # Ten bookings per record, about what group commit gathers under load
+        for first in range(0, history, 10):
+            batch = range(first, min(first + 10, history))
+            journal.save_bookings([reservation(i) for i in batch], [])
+            for i in rng.sample(batch, 2):
+                journal.delete_booking(reservation(i), None)
+        journal.close()
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        start = time.perf_counter()
+        recovered = JournalBackend(directory)
+        opened = time.perf_counter() - start
+        loaded = len(recovered.load_reservations())
+        total = time.perf_counter() - start
+        recovered.close()
+        print(f"  {label:15s} {size / 2**20:7.1f} MB on disk, state rebuilt in {opened:6.2f} s, "
+              f"{loaded} reservations loaded in {total:6.2f} s")
+
+
+def benchmark_catalog_file(count: int = 100000):
+    """
+    Cold start of a columnar search catalog from pydantic objects (parsed from
+    JSON lines) against mapping a binary catalog file, plus the first query.
+    """
+    print(f"🗂️ Catalog start-up with {count} restaurants...")
+
+    import json
+    import os
+    import tempfile
+    from data.catalog_file import write_catalog, MappedCatalog
+    from models.restaurant import Restaurant
+    from tools.columnar_catalog import ColumnarCatalog
+
+    directory = tempfile.mkdtemp()
+    restaurants = _catalog(count)
+    json_path, catalog_path = os.path.join(directory, "catalog.jsonl"), os.path.join(directory, "catalog.bin")
+    with open(json_path, "w") as file:
+        file.writelines(r.model_dump_json() + "\n" for r in restaurants)
+    write_catalog(restaurants, catalog_path)
+    del restaurants
+
+    def first_query(catalog: ColumnarCatalog):
+        mask = catalog.mask(cuisine="italian", location="downtown", min_party=6)
+        return catalog.restaurants_at(catalog.top_k(mask, 10))
+
+    start = time.perf_counter()
+    with open(json_path) as file:
+        catalog = ColumnarCatalog(Restaurant.model_validate(json.loads(line)) for line in file)
+    loaded = time.perf_counter() - start
+    first_query(catalog)
+    del catalog
+    print(f"  from JSON lines:  {loaded * 1000:8.1f} ms, first query after {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"({os.path.getsize(json_path) / 2**20:.1f} MB)")
+
+    start = time.perf_counter()
+    view = MappedCatalog(catalog_path)
+    opened = time.perf_counter() - start
+    catalog = ColumnarCatalog.from_view(view)
+    built = time.perf_counter() - start
+    first_query(catalog)
+    print(f"  mapped file:      {opened * 1000:8.1f} ms to map, {built * 1000:.1f} ms to columns, first query after "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms ({os.path.getsize(catalog_path) / 2**20:.1f} MB)")
+    start = time.perf_counter()
+    view.get(f"rest_{count // 2:06d}")
+    print(f"  lookup by id:     {(time.perf_counter() - start) * 1000:8.1f} ms first, "
+          f"{_timed(lambda: view.get(f'rest_{count // 3:06d}'), 1000) * 1000:.1f} us after")
+
+
+def benchmark_ingest(count: int = 50000, changed: int = 500):
+    """
+    Streaming a JSONL export into an empty catalog, reloading it with a few
+    changed rows, and the loader's own memory use while streaming the file.
+    """
+    print(f"📥 Ingesting {count} restaurants from JSONL...")
+
+    import os
+    import resource
+    import tempfile
+    from data.loaders import CatalogLoader
+
+    path = os.path.join(tempfile.mkdtemp(), "export.jsonl")
+    restaurants = _catalog(count)
+    with open(path, "w") as file:
+        file.writelines(r.model_dump_json() + "\n" for r in restaurants)
+    size = os.path.getsize(path) / 2**20
+
+    class Discard:
+        """Catalog stand-in that drops rows, so only the loader's memory is measured"""
+        catalog_index = {}
+
+        def add_restaurants(self, restaurants):
+            pass
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    CatalogLoader(Discard()).load(path)
+    growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024
+    print(f"  stream only:      peak RSS +{growth:.0f} MB for a {size:.0f} MB file")
+
+    tools = EnhancedReservationTools(restaurants=[])
+    loader = CatalogLoader(tools)
+    start = time.perf_counter()
+    report = loader.load(path)
+    print(f"  full load:        {count / (time.perf_counter() - start):8.0f} rows/s, {report['added']} added")
+
+    for restaurant in restaurants[::count // changed]:
+        restaurant.address += " (moved)"
+    with open(path, "w") as file:
+        file.writelines(r.model_dump_json() + "\n" for r in restaurants)
+    start = time.perf_counter()
+    report = loader.load(path)
+    print(f"  reload:           {(time.perf_counter() - start) * 1000:8.1f} ms, "
+          f"{report['updated']} updated, {report['unchanged']} unchanged")
+
+
+def benchmark_synthetic(count: int = 1000000, days: int = 7, history_count: int = 100000):
+    """
+    Generating a synthetic catalog straight into a catalog file, and a booking
+    history for part of it straight into a capacity ledger.
+    """
+    print(f"🧪 Synthetic data: {count} restaurants, {days}-day history for {history_count}...")
+
+    import os
+    import tempfile
+    import numpy as np
+    from data.catalog_file import MappedCatalog
+    from data.synthetic import generate_history
+    from tools.capacity_ledger import CapacityLedger
+
+    path = os.path.join(tempfile.mkdtemp(), "synthetic.bin")
+    start = time.perf_counter()
+    catalog = SyntheticCatalog(count, seed=1)
+    generated = time.perf_counter() - start
+    catalog.write(path)
+    print(f"  catalog:          {generated:8.2f} s to generate, {time.perf_counter() - start:.2f} s with the file "
+          f"({os.path.getsize(path) / 2**20:.0f} MB, {len(MappedCatalog(path))} rows)")
+
+    catalog = SyntheticCatalog(history_count, seed=1)
+    start = time.perf_counter()
+    history = generate_history(catalog, days=days, seed=1)
+    generated = time.perf_counter() - start
+    ledger = CapacityLedger(days=days)
+    ids = [catalog.restaurant_id(row) for row in range(history_count)]
+    for restaurant_id, capacity in zip(ids, catalog.capacity.tolist()):
+        ledger.register(restaurant_id, capacity)
+    start = time.perf_counter()
+    loaded = history.load_into(ledger, ids)
+    load_time = time.perf_counter() - start
+    peak = ledger.booked[:history_count].max(axis=(1, 2))
+    print(f"  history:          {len(history)} bookings in {generated:.2f} s, loaded into the ledger in "
+          f"{load_time:.2f} s ({loaded} loaded)")
+    print(f"  busiest slot:     {np.mean(peak / catalog.capacity) * 100:5.1f}% of capacity on average, "
+          f"overbooked restaurants: {int((peak > catalog.capacity).sum())}")
+
+
+def benchmark_shards(shards: int = 20, per_shard: int = 2000, max_loaded: int = 4):
+    """
+    One flat catalog holding every city against catalogs sharded by city:
+    start-up, a cold shard's first search, and warm search latency.
+    """
+    print(f"🗺️ {shards} city shards x {per_shard} restaurants, {max_loaded} kept loaded...")
+
+    import os
+    import tempfile
+    from data.catalog_file import write_catalog
+    from tools.sharded_tools import ShardedReservationTools
+
+    directory = tempfile.mkdtemp()
+    everything = []
+    os.makedirs(os.path.join(directory, "goodfoods"))
+    for shard in range(shards):
+        restaurants = SyntheticCatalog(per_shard, seed=shard).restaurants()
+        for restaurant in restaurants:
+            restaurant.id = f"c{shard:02d}_{restaurant.id}"
+        write_catalog(restaurants, os.path.join(directory, "goodfoods", f"city-{shard:02d}.catalog"))
+        everything += restaurants
+
+    start = time.perf_counter()
+    flat = EnhancedReservationTools(everything)
+    print(f"  flat start-up:    {(time.perf_counter() - start) * 1000:8.1f} ms for {len(everything)} restaurants")
+    del everything
+
+    start = time.perf_counter()
+    router = ShardedReservationTools(directory, max_loaded=max_loaded)
+    print(f"  sharded start-up: {(time.perf_counter() - start) * 1000:8.1f} ms")
+    start = time.perf_counter()
+    router.search_restaurants("goodfoods", "city-00", cuisine="Italian", party_size=4)
+    print(f"  cold shard:       {(time.perf_counter() - start) * 1000:8.1f} ms to load and search one city")
+
+    cities = [f"city-{shard % max_loaded:02d}" for shard in range(10)]
+    for city in cities:
+        router.shard("goodfoods", city)
+    flat_ms = _timed(lambda: [flat._search_restaurants("Italian", None, 4, None, None, None, None)
+                              for _ in range(10)], 5) / 10
+    shard_ms = _timed(lambda: [router.shard("goodfoods", city)._search_restaurants("Italian", None, 4, None,
+                                                                                    None, None, None)
+                               for city in cities], 5) / 10
+    print(f"  warm search:      {flat_ms:8.2f} ms flat, {shard_ms:.2f} ms in one shard "
+          f"({router.loads} loads, {router.unloads} unloads)")
+    router.close()
+
+
+def benchmark_records(restaurants: int = 100000, reservations: int = 10000000, chunk: int = 100000):
+    """
+    Memory footprint and construction rate of pydantic models against the
+    compact internal forms: restaurants as columns mapped from a catalog file,
+    reservations as slotted ReservationRecords. Reservations are built a
+    chunk at a time and the footprint of one chunk is scaled up, so the
+    pydantic side fits in memory. Records share the input strings, while
+    pydantic models hold copies of them.
+    """
+    print(f"📦 Records: {restaurants} restaurants, {reservations} reservations...")
+
+    import os
+    import tempfile
+    import tracemalloc
+    from data.catalog_file import MappedCatalog
+    from models.records import ReservationRecord, RESERVATION_FIELDS
+    from models.restaurant import Reservation, Restaurant
+    from tools.columnar_catalog import ColumnarCatalog
+
+    def measure(build):
+        tracemalloc.start()
+        start = time.perf_counter()
+        built = build()
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return built, elapsed, size
+
+    synthetic = SyntheticCatalog(restaurants, seed=7)
+    path = os.path.join(tempfile.mkdtemp(), "records.bin")
+    synthetic.write(path)
+    data = [r.model_dump() for r in synthetic.restaurants()]
+    models, elapsed, size = measure(lambda: [Restaurant.model_validate(row) for row in data])
+    print(f"  pydantic restaurants: {restaurants / elapsed:10.0f}/s, {size / 2**20:7.1f} MB")
+    del models, data
+    view = MappedCatalog(path)
+    columns, elapsed, size = measure(lambda: ColumnarCatalog.from_view(view))
+    print(f"  mapped columns:       {restaurants / elapsed:10.0f}/s, {size / 2**20:7.1f} MB "
+          "(strings stay in the file until a row is materialized)")
+    del columns
+
+    ids = [synthetic.restaurant_id(row) for row in range(restaurants)]
+    rows = [(f"RES_{n:08X}", ids[n % restaurants], f"Guest {n}", f"555{n:07d}", f"guest{n}@example.com",
+             2 + n % 5, f"2025-06-{1 + n % 28:02d}", f"{17 + n % 5}:{n % 2 * 30:02d}", "", [f"T{1 + n % 9}"],
+             "confirmed", "2025-05-01T12:00:00") for n in range(chunk)]
+    data = [dict(zip(RESERVATION_FIELDS, row)) for row in rows]
+    scale = reservations / chunk
+    for label, build in (("pydantic reservations", lambda: [Reservation.model_validate(d) for d in data]),
+                         ("reservation records", lambda: [ReservationRecord(*row) for row in rows])):
+        built, elapsed, size = measure(build)
+        del built
+        for _ in range(int(scale) - 1):
+            start = time.perf_counter()
+            build()
+            elapsed += time.perf_counter() - start
+        print(f"  {label + ':':22s}{reservations / elapsed:10.0f}/s, {size * scale / 2**30:7.2f} GB "
+              f"for {reservations} ({size / chunk:.0f} bytes each)")
+
+
+def benchmark_payloads(count: int = 2000, rounds: int = 2000):
+    """
+    Building and JSON-encoding a page of 10 search results, as the agent does,
+    from cached payload fragments against formatting every field per call
+    """
+    print(f"🧾 Search result payloads over {count} restaurants...")
+
+    import json
+    from tools.restaurant_payloads import encode_result
+    tools = EnhancedReservationTools(_catalog(count))
+    page = tools.restaurants[:10]
+
+    def formatted():
+        json.dumps({"result": [{
+            "id": r.id, "name": r.name, "location": r.location, "cuisine": r.cuisine.value,
+            "price_range": r.price_range.value, "rating": r.rating, "available_tables": r.available_tables,
+            "capacity": r.capacity, "special_features": r.special_features, "contact_phone": r.contact_phone,
+            "address": r.address, "opening_time": r.opening_time.strftime("%H:%M"),
+            "closing_time": r.closing_time.strftime("%H:%M")} for r in page]})
+
+    def cached():
+        encode_result({"result": tools._format_restaurant_results(page)})
+
+    print(f"  format + dumps:   {_timed(formatted, rounds) * 1000:8.1f} us per page")
+    print(f"  cached payloads:  {_timed(cached, rounds) * 1000:8.1f} us per page")
+
+
+def benchmark_validation(rows: int = 100000):
+    """Validating booking rows in bulk against strptime checks that parse every date and time twice"""
+    print(f"✅ Validating {rows} booking rows...")
+
+    import re
+    from datetime import date, datetime, timedelta
+    from utils.validation import BOOKING_FIELDS, validate_bookings
+    bookings = [{"customer_name": f"Guest {i % 500}", "customer_phone": f"+1 555 {i % 500:03d} 4567",
+                 "customer_email": f"guest{i % 500}@example.com", "party_size": str(i % 6 + 1),
+                 "date": (date.today() + timedelta(days=i % 30)).isoformat(),
+                 "time": f"{12 + i % 10}:{30 * (i % 2):02d}"} for i in range(rows)]
+
+    def strptime_checks():
+        for row in bookings:
+            re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', row["customer_email"])
+            re.sub(r'[\s\-\(\)]', '', row["customer_phone"]).isdigit()
+            for _ in range(2):
+                datetime.strptime(row["date"], "%Y-%m-%d")
+                datetime.strptime(row["time"], "%H:%M")
+
+    def bulk():
+        validate_bookings(bookings, required=BOOKING_FIELDS)
+
+    print(f"  strptime checks:   {_timed(strptime_checks, 1) * 1000 / rows:8.2f} us per row")
+    print(f"  validate_bookings: {_timed(bulk, 1) * 1000 / rows:8.2f} us per row")
+
+
+BENCHMARKS = {
+    "spatial": benchmark_spatial,
+    "matrix": benchmark_availability_matrix,
+    "next_available": benchmark_next_available,
+    "concurrency": benchmark_concurrency,
+    "reservation_store": benchmark_reservation_store,
+    "tables": benchmark_tables,
+    "batch": benchmark_batch,
+    "storage": benchmark_storage,
+    "journal": benchmark_journal,
+    "catalog_file": benchmark_catalog_file,
+    "ingest": benchmark_ingest,
+    "synthetic": benchmark_synthetic,
+    "shards": benchmark_shards,
+    "records": benchmark_records,
+    "payloads": benchmark_payloads,
+    "validation": benchmark_validation,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    print("🚀 Starting GoodFoods Reservation System Benchmarks...\n")
+    for name in selected:
+        BENCHMARKS[name]()
+        print()
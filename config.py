@@ -12,10 +12,36 @@ class Config:
     # Application Settings
     MAX_RESERVATION_DAYS = 30
     MAX_PARTY_SIZE = 20
+    RESERVATION_SLOT_MINUTES = 30
+    RESERVATION_DURATION_MINUTES = 120
+    MAX_MATRIX_RESTAURANTS = 50
+    NEXT_AVAILABLE_SEARCH_DAYS = 7
+    MAX_COMBINED_TABLES = 3
+    MAX_BATCH_RESERVATIONS = 50
+    IDEMPOTENCY_TTL_SECONDS = 600
     DEFAULT_TIMEZONE = "UTC"
     
     # Restaurant Data
     SAMPLE_RESTAURANT_COUNT = 75
+    CATALOG_PATH = os.getenv("CATALOG_PATH", "")  # catalog file (data/catalog_file.py) used instead of samples
+    LOADER_CHUNK_SIZE = 1000  # rows validated and indexed at a time by data/loaders.py
+    USE_COLUMNAR_CATALOG = os.getenv("USE_COLUMNAR_CATALOG", "false").lower() == "true"
+    QUERY_CACHE_SIZE = 256
+    SPATIAL_CELL_KM = 0.25
+    DEFAULT_SEARCH_RADIUS_KM = 2.0
+    MAX_SEARCH_RADIUS_KM = 50.0  # "near" searches never look further, whatever radius or count is asked for
+    
+    # Sharded catalogs: SHARD_DIR/<tenant>/<city>.catalog files, loaded on first use
+    SHARD_DIR = os.getenv("SHARD_DIR", "goodfoods_shards")
+    MAX_LOADED_SHARDS = int(os.getenv("MAX_LOADED_SHARDS", "8"))
+    
+    # Storage ("memory" keeps everything in process, "sqlite" persists to SQLITE_PATH,
+    # "journal" stays in memory and appends every change to a journal in JOURNAL_DIR)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+    SQLITE_PATH = os.getenv("SQLITE_PATH", "goodfoods.db")
+    JOURNAL_DIR = os.getenv("JOURNAL_DIR", "goodfoods_journal")
+    JOURNAL_SNAPSHOT_EVERY = 100000
+    JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "true").lower() == "true"
     
     # UI Settings
     PAGE_TITLE = "GoodFoods AI Reservation System"
@@ -0,0 +1,296 @@
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple, NamedTuple
+from datetime import time
+import json
+import math
+import mmap
+import os
+import sys
+import numpy as np
+from models.restaurant import Restaurant, Table, CuisineType, PriceRange
+from tools.table_allocator import max_party_size
+
+# File layout (little-endian):
+#   magic | header length (uint64) | JSON header | records | tables | string table
+# Sections start on 8-byte boundaries. Strings are (offset, length) pairs into the
+# string table; all ids are written first, newline separated, so they decode in one call.
+MAGIC = b"GFCATLG1"
+_ALIGN = 8
+_FEATURE_SEPARATOR = "\x1f"
+_CUISINES = list(CuisineType)
+_PRICES = list(PriceRange)
+TABLE_RECORD = np.dtype([("id", "<u4", (2,)), ("seats", "<i4"), ("combinable", "u1")], align=True)
+
+
+class RestaurantOutline(NamedTuple):
+    """
+    The fields of a mapped restaurant that the tools index (search keys, name,
+    coordinates, capacity and hours), read without building a Restaurant.
+    The name, spatial and text indexes accept it in place of a Restaurant.
+    """
+    id: str
+    name: str
+    location: str
+    cuisine: CuisineType
+    price_range: PriceRange
+    capacity: int
+    opening_time: time
+    closing_time: time
+    special_features: List[str]
+    address: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+    @property
+    def cuisine_key(self) -> str:
+        return sys.intern(self.cuisine.value.lower())
+
+    @property
+    def location_key(self) -> str:
+        return sys.intern(self.location.lower())
+
+    @property
+    def feature_keys(self) -> Tuple[str, ...]:
+        return tuple([sys.intern(feature.lower()) for feature in self.special_features])
+
+
+def record_dtype(feature_words: int) -> np.dtype:
+    """Restaurant record layout for a catalog with ``feature_words`` 64-bit feature words"""
+    return np.dtype([
+        ("id", "<u4", (2,)), ("name", "<u4", (2,)), ("location_name", "<u4", (2,)),
+        ("contact_phone", "<u4", (2,)), ("address", "<u4", (2,)), ("special_features", "<u4", (2,)),
+        ("tables", "<u4", (2,)),  # first row in the tables section, count
+        ("cuisine", "<i4"), ("price", "<i4"), ("location", "<i4"),
+        ("capacity", "<i4"), ("current_reservations", "<i4"), ("max_party", "<i4"),
+        ("opening_time", "<i4"), ("closing_time", "<i4"),  # seconds after midnight
+        ("rating", "<f8"), ("latitude", "<f8"), ("longitude", "<f8"),  # NaN for a missing coordinate
+        ("features", "<u8", (feature_words,)),
+    ], align=True)
+
+
+def write_catalog(restaurants: Iterable[Restaurant], path: str, max_combined_tables: int = 3) -> int:
+    """
+    Write restaurants to a catalog file that MappedCatalog can map. The file is
+    written next to ``path`` and renamed into place, so processes that already
+    mapped the old file keep a consistent view. Returns the number of records.
+    """
+    restaurants = list(restaurants)
+    strings = bytearray()
+    offsets: Dict[str, Tuple[int, int]] = {}
+
+    def intern(value: str) -> Tuple[int, int]:
+        span = offsets.get(value)
+        if span is None:
+            encoded = value.encode("utf-8")
+            span = offsets[value] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return span
+
+    strings.extend("\n".join(r.id for r in restaurants).encode("utf-8"))
+    ids_size = len(strings)
+
+    locations: Dict[str, int] = {}
+    features: Dict[str, int] = {}
+    for restaurant in restaurants:
+        locations.setdefault(restaurant.location.lower(), len(locations))
+        for feature in restaurant.special_features:
+            features.setdefault(feature.lower(), len(features))
+    feature_words = max(1, math.ceil(len(features) / 64))
+
+    columns: Dict[str, list] = {name: [] for name in record_dtype(feature_words).names}
+    table_rows = []
+    id_offset = 0
+    for restaurant in restaurants:
+        id_size = len(restaurant.id.encode("utf-8"))
+        columns["id"].append((id_offset, id_size))
+        id_offset += id_size + 1
+        for field in ("name", "contact_phone", "address"):
+            columns[field].append(intern(getattr(restaurant, field)))
+        columns["location_name"].append(intern(restaurant.location))
+        columns["special_features"].append(intern(_FEATURE_SEPARATOR.join(restaurant.special_features)))
+        columns["tables"].append((len(table_rows), len(restaurant.tables)))
+        table_rows.extend((intern(table.id), table.seats, table.combinable) for table in restaurant.tables)
+        columns["cuisine"].append(_CUISINES.index(restaurant.cuisine))
+        columns["price"].append(_PRICES.index(restaurant.price_range))
+        columns["location"].append(locations[restaurant.location.lower()])
+        columns["capacity"].append(restaurant.capacity)
+        columns["current_reservations"].append(restaurant.current_reservations)
+        columns["max_party"].append(max_party_size(restaurant, max_combined_tables))
+        columns["opening_time"].append(_seconds(restaurant.opening_time))
+        columns["closing_time"].append(_seconds(restaurant.closing_time))
+        columns["rating"].append(restaurant.rating)
+        columns["latitude"].append(math.nan if restaurant.latitude is None else restaurant.latitude)
+        columns["longitude"].append(math.nan if restaurant.longitude is None else restaurant.longitude)
+        bits = sum(1 << features[feature.lower()] for feature in set(restaurant.special_features))
+        columns["features"].append([bits >> (64 * word) & (2**64 - 1) for word in range(feature_words)])
+
+    records = np.zeros(len(restaurants), dtype=record_dtype(feature_words))
+    for name, values in columns.items():
+        if values:
+            records[name] = np.array(values, dtype=records.dtype[name].base)
+    tables = np.array(table_rows, dtype=TABLE_RECORD)
+    return write_records(path, records, tables, strings, ids_size, list(locations), list(features),
+                         max_combined_tables)
+
+
+def write_records(path: str,
+                  records: np.ndarray,
+                  tables: np.ndarray,
+                  strings: bytes,
+                  ids_size: int,
+                  locations: List[str],
+                  features: List[str],
+                  max_combined_tables: int = 3) -> int:
+    """
+    Write already encoded sections as a catalog file (see write_catalog). The
+    string table must start with the ids, newline separated, ``ids_size``
+    bytes long; ``locations`` and ``features`` are the lower-cased values
+    behind the location codes and feature bits.
+    """
+    header = {"count": len(records), "feature_words": records.dtype["features"].shape[0],
+              "max_combined_tables": max_combined_tables, "locations": locations, "features": features,
+              "table_count": len(tables), "ids_size": ids_size, "strings_size": len(strings)}
+    encoded = json.dumps(header).encode("utf-8")
+    header_size = _aligned(len(MAGIC) + 8 + len(encoded))
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+        file.write(np.uint64(len(encoded)).tobytes())
+        file.write(encoded.ljust(header_size - len(MAGIC) - 8, b" "))
+        for section in (records.tobytes(), tables.tobytes()):
+            file.write(section.ljust(_aligned(len(section)), b"\0"))
+        file.write(strings)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return len(records)
+
+
+class MappedCatalog:
+    """
+    Read-only view of a catalog file mapped into memory.
+
+    Opening it only parses the small header: the numeric fields of every
+    restaurant are NumPy views of the mapped records, so they are paged in on
+    use and the pages are shared by every process that maps the same file.
+    Restaurant objects are built from a record only when one is asked for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a restaurant catalog file")
+        length = int(np.frombuffer(self._map, dtype="<u8", count=1, offset=len(MAGIC))[0])
+        start = len(MAGIC) + 8
+        header = json.loads(self._map[start:start + length])
+
+        self.max_combined_tables: int = header["max_combined_tables"]
+        self.locations: List[str] = header["locations"]
+        self.features: List[str] = header["features"]
+        self.feature_words: int = header["feature_words"]
+        offset = _aligned(start + length)
+        self.records = np.frombuffer(self._map, dtype=record_dtype(self.feature_words),
+                                     count=header["count"], offset=offset)
+        offset += _aligned(self.records.nbytes)
+        self._tables = np.frombuffer(self._map, dtype=TABLE_RECORD, count=header["table_count"], offset=offset)
+        self._strings_at = offset + _aligned(self._tables.nbytes)
+        self._ids_size = header["ids_size"]
+        self._row_by_id: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, row: int) -> Restaurant:
+        record = dict(zip(self.records.dtype.names, self.records[row].item()))
+        first, count = record["tables"]
+        features = self._string(record["special_features"])
+        return Restaurant.model_validate({
+            "id": self._string(record["id"]),
+            "name": self._string(record["name"]),
+            "location": self._string(record["location_name"]),
+            "cuisine": _CUISINES[record["cuisine"]],
+            "price_range": _PRICES[record["price"]],
+            "capacity": record["capacity"],
+            "current_reservations": record["current_reservations"],
+            "opening_time": _time(record["opening_time"]),
+            "closing_time": _time(record["closing_time"]),
+            "rating": record["rating"],
+            "special_features": features.split(_FEATURE_SEPARATOR) if features else [],
+            "contact_phone": self._string(record["contact_phone"]),
+            "address": self._string(record["address"]),
+            "latitude": None if math.isnan(record["latitude"]) else record["latitude"],
+            "longitude": None if math.isnan(record["longitude"]) else record["longitude"],
+            "tables": [{"id": self._string(span), "seats": seats, "combinable": bool(combinable)}
+                       for span, seats, combinable in self._tables[first:first + count].tolist()],
+        })
+
+    def __iter__(self) -> Iterator[Restaurant]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def outlines(self) -> Iterator[RestaurantOutline]:
+        """Outline of every restaurant in row order; columns are read in bulk rather than record by record"""
+        records = self.records
+        times: Dict[int, time] = {}
+        columns = zip(
+            self.ids(),
+            *(map(self._string, records[field].tolist())
+              for field in ("name", "location_name", "special_features", "address")),
+            records["cuisine"].tolist(), records["price"].tolist(), records["capacity"].tolist(),
+            records["opening_time"].tolist(), records["closing_time"].tolist(),
+            records["latitude"].tolist(), records["longitude"].tolist(),
+        )
+        for (restaurant_id, name, location, features, address, cuisine, price, capacity,
+             opening, closing, latitude, longitude) in columns:
+            for seconds in (opening, closing):
+                if seconds not in times:
+                    times[seconds] = _time(seconds)
+            yield RestaurantOutline(
+                restaurant_id, name, location, _CUISINES[cuisine], _PRICES[price], capacity,
+                times[opening], times[closing], features.split(_FEATURE_SEPARATOR) if features else [],
+                address, None if math.isnan(latitude) else latitude, None if math.isnan(longitude) else longitude,
+            )
+
+    def __contains__(self, restaurant_id: str) -> bool:
+        return restaurant_id in self._ids()
+
+    def ids(self) -> List[str]:
+        """Restaurant ids in row order"""
+        if not len(self):
+            return []
+        return self._map[self._strings_at:self._strings_at + self._ids_size].decode("utf-8").split("\n")
+
+    def row_of(self, restaurant_id: str) -> Optional[int]:
+        return self._ids().get(restaurant_id)
+
+    def get(self, restaurant_id: str) -> Optional[Restaurant]:
+        row = self.row_of(restaurant_id)
+        return None if row is None else self[row]
+
+    def close(self) -> None:
+        # NumPy views keep the map alive until they are released
+        self.records = self._tables = None
+        self._map.close()
+
+    def _ids(self) -> Dict[str, int]:
+        if self._row_by_id is None:
+            self._row_by_id = {restaurant_id: row for row, restaurant_id in enumerate(self.ids())}
+        return self._row_by_id
+
+    def _string(self, span) -> str:
+        start = self._strings_at + int(span[0])
+        return self._map[start:start + int(span[1])].decode("utf-8")
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _seconds(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _time(seconds: int) -> time:
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60)
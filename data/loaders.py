@@ -0,0 +1,138 @@
+from typing import List, Dict, Any, Iterator, Tuple
+import csv
+import hashlib
+import itertools
+import json
+from pydantic import TypeAdapter, ValidationError
+from models.restaurant import Restaurant
+from config import config
+
+# Restaurant fields holding lists. In CSV they are JSON arrays; special features
+# may also be written as "|"-separated names.
+_LIST_FIELDS = {"special_features", "tables"}
+_RESTAURANTS = TypeAdapter(List[Restaurant])
+
+# (line number, row hash, raw record)
+Row = Tuple[int, str, Dict[str, Any]]
+
+
+def read_records(path: str) -> Iterator[Row]:
+    """
+    Stream raw restaurant records from a .csv or .jsonl file, one row at a time.
+    CSV headers are Restaurant field names and empty cells are left out, so
+    the schema defaults apply. Each row comes with a hash of its raw text; a
+    line that is not JSON is passed on as text and fails validation.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader, [])
+            for cells in reader:
+                if cells:
+                    yield reader.line_num, _digest("\x1f".join(cells)), _csv_record(header, cells)
+    elif path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                line = line.strip()
+                if line:
+                    yield number, _digest(line), _json_record(line)
+    else:
+        raise ValueError(f"Unsupported catalog file (expected .csv or .jsonl): {path}")
+
+
+class CatalogLoader:
+    """
+    Streams restaurant files into the catalog of an EnhancedReservationTools.
+
+    Rows are read, validated and indexed ``chunk_size`` at a time, so apart from
+    the catalog itself a load only keeps one chunk and one hash per restaurant
+    in memory, however large the file. The hashes are remembered by restaurant
+    id: loading a newer export only validates and re-indexes rows whose content
+    changed. Restaurants already in the catalog keep their live reservation
+    counter.
+    """
+
+    def __init__(self, tools, chunk_size: int = config.LOADER_CHUNK_SIZE, max_errors: int = 100):
+        self.tools = tools
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self._hashes: Dict[str, str] = {}
+
+    def load(self, path: str, remove_missing: bool = False) -> Dict[str, Any]:
+        """
+        Load a file and report what changed. Invalid rows are skipped and listed
+        under ``errors`` (up to ``max_errors``). With ``remove_missing``,
+        restaurants loaded from an earlier file that are absent now are removed.
+        """
+        report = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "invalid": 0, "errors": []}
+        seen = set()
+        changed = (row for row in read_records(path) if self._changed(row, seen, report))
+        while True:
+            chunk = list(itertools.islice(changed, self.chunk_size))
+            if not chunk:
+                break
+            restaurants = []
+            for (_, digest, _), restaurant in self._validate(chunk, report):
+                existing = self.tools.catalog_index.get(restaurant.id)
+                if existing is None:
+                    report["added"] += 1
+                else:
+                    restaurant.current_reservations = existing.current_reservations
+                    report["updated"] += 1
+                self._hashes[restaurant.id] = digest
+                restaurants.append(restaurant)
+            self.tools.add_restaurants(restaurants)
+
+        if remove_missing:
+            for restaurant_id in [rid for rid in self._hashes if rid not in seen]:
+                del self._hashes[restaurant_id]
+                if self.tools.remove_restaurant(restaurant_id):
+                    report["removed"] += 1
+        return report
+
+    def _changed(self, row: Row, seen: set, report: Dict[str, Any]) -> bool:
+        _, digest, record = row
+        restaurant_id = record.get("id") if isinstance(record, dict) else None
+        seen.add(restaurant_id)
+        if restaurant_id is not None and self._hashes.get(restaurant_id) == digest:
+            report["unchanged"] += 1
+            return False
+        return True
+
+    def _validate(self, chunk: List[Row], report: Dict[str, Any]) -> List[Tuple[Row, Restaurant]]:
+        # One validation call per chunk; only a chunk with bad rows is validated twice
+        try:
+            return list(zip(chunk, _RESTAURANTS.validate_python([record for _, _, record in chunk])))
+        except ValidationError as error:
+            failures: Dict[int, str] = {}
+            for detail in error.errors():
+                position, *field = detail["loc"]
+                failures.setdefault(position, f"{'.'.join(map(str, field)) or 'row'}: {detail['msg']}")
+        report["invalid"] += len(failures)
+        for position, message in failures.items():
+            if len(report["errors"]) < self.max_errors:
+                report["errors"].append({"line": chunk[position][0], "error": message})
+        valid = [row for position, row in enumerate(chunk) if position not in failures]
+        return list(zip(valid, _RESTAURANTS.validate_python([record for _, _, record in valid])))
+
+
+def _csv_record(header: List[str], cells: List[str]) -> Dict[str, Any]:
+    record = {}
+    for field, value in zip(header, cells):
+        if value == "":
+            continue
+        if field in _LIST_FIELDS:
+            value = _json_record(value) if value.startswith("[") else value.split("|")
+        record[field] = value
+    return record
+
+
+def _json_record(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return line
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
@@ -1,41 +1,82 @@
 import random
-from models.restaurant import Restaurant, CuisineType, PriceRange
+from models.restaurant import Restaurant, Table, CuisineType, PriceRange
 from datetime import time
 
+# Approximate centre of each neighbourhood (lat, lon); restaurants are scattered around it
+AREA_COORDINATES = {
+    "Downtown": (40.7075, -74.0113),
+    "Midtown": (40.7549, -73.9840),
+    "Uptown": (40.7870, -73.9754),
+    "East Side": (40.7736, -73.9566),
+    "West End": (40.7736, -73.9900),
+    "North District": (40.8200, -73.9500),
+    "South Quarter": (40.6950, -73.9900),
+    "Central Plaza": (40.7505, -73.9934),
+    "Riverside": (40.8010, -73.9720),
+    "Harbor View": (40.7033, -74.0170),
+    "City Center": (40.7306, -73.9866),
+    "Metro": (40.7420, -73.9890),
+    "Historic District": (40.7200, -74.0010),
+    "Financial District": (40.7074, -74.0090),
+    "Arts Quarter": (40.7260, -73.9980),
+}
+
+# Restaurants are placed up to this many degrees (~0.9 km) from their area centre
+AREA_JITTER_DEGREES = 0.008
+
+# Table sizes and how often each appears in a dining room; 2- and 4-tops can be pushed together
+TABLE_SIZE_WEIGHTS = {2: 35, 4: 40, 6: 15, 8: 10}
+COMBINABLE_TABLE_SIZES = {2, 4}
+
+RESTAURANT_NAMES = [
+    "Bella", "Sapore", "Gusto", "Trattoria", "Ristorante", "Cafe", "Bistro",
+    "Grill", "Kitchen", "Table", "Feast", "Harvest", "Vine", "Spice", "Flame",
+    "Ocean", "Garden", "Market", "Street", "Urban", "Classic", "Modern"
+]
+NAME_SUFFIXES = [" Italian", " Grill", " Kitchen", " Bistro", " Cafe", ""]
+STREET_NAMES = ['Main', 'Oak', 'Maple', 'Park', 'Broadway']
+
+# A restaurant gets one to three features from one of these groups
+FEATURE_GROUPS = [
+    ["Outdoor Seating", "Live Music", "Wine Bar"],
+    ["Private Dining", "Chef's Table", "Tasting Menu"],
+    ["Family Friendly", "Kids Menu", "Play Area"],
+    ["Romantic", "Candlelit", "Fine Dining"],
+    ["Business Lunch", "Free WiFi", "Power Outlets"],
+    ["Wheelchair Access", "Vegetarian Options", "Gluten Free"],
+    ["Late Night", "Happy Hour", "Cocktail Bar"],
+    ["Waterfront", "Skyline View", "Rooftop"]
+]
+
+def generate_tables(capacity: int) -> list[Table]:
+    """Split a seat capacity into a table inventory with roughly that many seats"""
+    tables = []
+    remaining = capacity
+    while remaining >= 2:
+        seats = random.choices(list(TABLE_SIZE_WEIGHTS), weights=list(TABLE_SIZE_WEIGHTS.values()))[0]
+        seats = min(seats, remaining - remaining % 2)
+        tables.append(Table(id=f"T{len(tables) + 1}", seats=seats, combinable=seats in COMBINABLE_TABLE_SIZES))
+        remaining -= seats
+    return tables
+
 def generate_sample_restaurants(count: int = 75) -> list[Restaurant]:
     """Generate sample restaurant data"""
     
-    restaurant_names = [
-        "Bella", "Sapore", "Gusto", "Trattoria", "Ristorante", "Cafe", "Bistro",
-        "Grill", "Kitchen", "Table", "Feast", "Harvest", "Vine", "Spice", "Flame",
-        "Ocean", "Garden", "Market", "Street", "Urban", "Classic", "Modern"
-    ]
-    
     location_areas = [
         "Downtown", "Midtown", "Uptown", "East Side", "West End", "North District",
         "South Quarter", "Central Plaza", "Riverside", "Harbor View", "City Center",
         "Metro", "Historic District", "Financial District", "Arts Quarter"
     ]
     
-    features_list = [
-        ["Outdoor Seating", "Live Music", "Wine Bar"],
-        ["Private Dining", "Chef's Table", "Tasting Menu"],
-        ["Family Friendly", "Kids Menu", "Play Area"],
-        ["Romantic", "Candlelit", "Fine Dining"],
-        ["Business Lunch", "Free WiFi", "Power Outlets"],
-        ["Wheelchair Access", "Vegetarian Options", "Gluten Free"],
-        ["Late Night", "Happy Hour", "Cocktail Bar"],
-        ["Waterfront", "Skyline View", "Rooftop"]
-    ]
-    
     restaurants = []
     
     for i in range(count):
-        name_base = random.choice(restaurant_names)
-        name_suffix = random.choice([" Italian", " Grill", " Kitchen", " Bistro", " Cafe", ""])
+        name_base = random.choice(RESTAURANT_NAMES)
+        name_suffix = random.choice(NAME_SUFFIXES)
         restaurant_name = f"{name_base}{name_suffix}"
         
         location = f"{random.choice(location_areas)}"
+        area_lat, area_lon = AREA_COORDINATES[location]
         
         # Ensure diverse cuisine distribution
         cuisine = random.choice(list(CuisineType))
@@ -58,6 +99,9 @@ def generate_sample_restaurants(count: int = 75) -> list[Restaurant]:
         else:
             base_rating += random.uniform(0.0, 0.5)
         
+        tables = generate_tables(capacity)
+        capacity = sum(table.seats for table in tables)
+        
         restaurant = Restaurant(
             id=f"rest_{i+1:03d}",
             name=restaurant_name,
@@ -68,11 +112,14 @@ def generate_sample_restaurants(count: int = 75) -> list[Restaurant]:
             current_reservations=random.randint(0, capacity // 2),
             rating=round(base_rating, 1),
             special_features=random.sample(
-                random.choice(features_list), 
+                random.choice(FEATURE_GROUPS), 
                 random.randint(1, 3)
             ),
             contact_phone=f"+1-555-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-            address=f"{random.randint(100, 999)} {random.choice(['Main', 'Oak', 'Maple', 'Park', 'Broadway'])} St, {location}"
+            address=f"{random.randint(100, 999)} {random.choice(STREET_NAMES)} St, {location}",
+            latitude=round(area_lat + random.uniform(-AREA_JITTER_DEGREES, AREA_JITTER_DEGREES), 6),
+            longitude=round(area_lon + random.uniform(-AREA_JITTER_DEGREES, AREA_JITTER_DEGREES), 6),
+            tables=tables
         )
         
         restaurants.append(restaurant)
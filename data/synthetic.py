@@ -0,0 +1,311 @@
+from typing import List, Optional, Sequence
+from datetime import date as Date
+from itertools import permutations
+import numpy as np
+from models.restaurant import Restaurant, CuisineType, PriceRange
+from data.sample_restaurants import (AREA_COORDINATES, AREA_JITTER_DEGREES, TABLE_SIZE_WEIGHTS,
+                                     COMBINABLE_TABLE_SIZES, RESTAURANT_NAMES, NAME_SUFFIXES,
+                                     STREET_NAMES, FEATURE_GROUPS)
+from data.catalog_file import record_dtype, write_records, TABLE_RECORD
+from tools.capacity_ledger import CapacityLedger
+
+# Relative booking volume from Monday to Sunday
+WEEKDAY_WEIGHTS = [0.6, 0.7, 0.8, 0.9, 1.3, 1.5, 1.1]
+
+# (mean start hour, standard deviation in hours, share of bookings) for the lunch and dinner peaks
+MEAL_PEAKS = [(12.5, 0.75, 0.35), (19.25, 1.0, 0.65)]
+
+# How often each party size books
+PARTY_SIZE_WEIGHTS = {1: 3, 2: 40, 3: 12, 4: 22, 5: 8, 6: 8, 7: 3, 8: 3, 10: 1}
+
+_CUISINES = list(CuisineType)
+_PRICES = list(PriceRange)
+_AREAS = list(AREA_COORDINATES)
+_NAMES = [f"{base}{suffix}" for base in RESTAURANT_NAMES for suffix in NAME_SUFFIXES]
+_FEATURES = list(dict.fromkeys(feature.lower() for group in FEATURE_GROUPS for feature in group))
+_PHONE_WIDTH = len("+1-555-000-0000")
+_OPENING_HOUR, _CLOSING_HOUR = 11, 23
+_HISTORY_BLOCK = 50000
+
+# Every ordered pick of one to three features from one group, as random.sample makes
+# them; (group, count) -> first position and number of picks in _FEATURE_SETS
+_FEATURE_SETS: List[List[str]] = []
+_FEATURE_SET_START = np.zeros((len(FEATURE_GROUPS), 4), dtype=np.int64)
+_FEATURE_SET_COUNT = np.zeros((len(FEATURE_GROUPS), 4), dtype=np.int64)
+for _group, _features in enumerate(FEATURE_GROUPS):
+    for _count in (1, 2, 3):
+        _picks = [list(pick) for pick in permutations(_features, _count)]
+        _FEATURE_SET_START[_group, _count] = len(_FEATURE_SETS)
+        _FEATURE_SET_COUNT[_group, _count] = len(_picks)
+        _FEATURE_SETS.extend(_picks)
+
+
+class SyntheticCatalog:
+    """
+    Restaurant catalog generated column by column from a seed.
+
+    Follows the distributions of generate_sample_restaurants (cuisine-dependent
+    price, capacity and rating, the table mix, coordinates around each
+    neighbourhood), but every column is drawn with one vectorized NumPy call,
+    so millions of rows take seconds and a seed always gives the same catalog.
+    Rows are written straight to a catalog file or built into Restaurant
+    objects on request.
+    """
+
+    def __init__(self, count: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.count = count
+        self.id_width = max(6, len(str(count)))
+
+        self.cuisine = rng.integers(0, len(_CUISINES), count)
+        fine = np.isin(self.cuisine, [_CUISINES.index(CuisineType.FRENCH), _CUISINES.index(CuisineType.JAPANESE)])
+        american = self.cuisine == _CUISINES.index(CuisineType.AMERICAN)
+        self.price = np.select([fine, american], [rng.integers(2, 4, count), rng.integers(0, 2, count)],
+                               rng.integers(0, len(_PRICES), count))
+        target = np.select([fine, american], [rng.integers(15, 51, count), rng.integers(50, 151, count)],
+                           rng.integers(30, 101, count))
+        bonus = np.where(self.price >= 2, rng.uniform(0.3, 0.8, count), rng.uniform(0.0, 0.5, count))
+        self.rating = np.round(4.0 + bonus, 1)
+
+        # Enough tables of the usual mix for the target seats; capacity is what they add up to
+        sizes = np.array(list(TABLE_SIZE_WEIGHTS))
+        weights = np.array(list(TABLE_SIZE_WEIGHTS.values()), dtype=np.float64)
+        weights /= weights.sum()
+        self.table_count = np.maximum(1, np.round(target / (sizes * weights).sum())).astype(np.int64)
+        self.table_first = np.cumsum(self.table_count) - self.table_count
+        self.table_seats = rng.choice(sizes, size=int(self.table_count.sum()), p=weights)
+        self.table_combinable = np.isin(self.table_seats, list(COMBINABLE_TABLE_SIZES))
+        self.capacity = (np.add.reduceat(self.table_seats, self.table_first) if count
+                         else np.zeros(0, dtype=np.int64))
+        self.current_reservations = rng.integers(0, self.capacity // 2 + 1)
+
+        self.name = rng.integers(0, len(_NAMES), count)
+        self.location = rng.integers(0, len(_AREAS), count)
+        centres = np.array([AREA_COORDINATES[area] for area in _AREAS])
+        jitter = rng.uniform(-AREA_JITTER_DEGREES, AREA_JITTER_DEGREES, (count, 2))
+        self.latitude, self.longitude = np.round(centres[self.location] + jitter, 6).T
+        group = rng.integers(0, len(FEATURE_GROUPS), count)
+        picked = rng.integers(1, 4, count)
+        self.feature_set = (_FEATURE_SET_START[group, picked]
+                            + (rng.random(count) * _FEATURE_SET_COUNT[group, picked]).astype(np.int64))
+        self.street_number = rng.integers(100, 1000, count)
+        self.street = rng.integers(0, len(STREET_NAMES), count)
+        self.phone = rng.integers(100, 1000, count) * 10000 + rng.integers(1000, 10000, count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def restaurant_id(self, row: int) -> str:
+        return f"rest_{row + 1:0{self.id_width}d}"
+
+    def max_party(self, max_combined_tables: int = 3) -> np.ndarray:
+        """max_party_size of every restaurant, computed over the table columns"""
+        if not self.count:
+            return np.zeros(0, dtype=np.int64)
+        largest = np.maximum.reduceat(self.table_seats, self.table_first)
+        owner = np.repeat(np.arange(self.count), self.table_count)
+        combinable = np.where(self.table_combinable, self.table_seats, 0)
+        order = np.lexsort((-combinable, owner))
+        top = np.arange(len(order)) - self.table_first[owner[order]] < max_combined_tables
+        pushed = np.bincount(owner[order][top], weights=combinable[order][top], minlength=self.count)
+        enough = np.bincount(owner, weights=self.table_combinable, minlength=self.count) > 1
+        return np.maximum(largest, np.where(enough, pushed, 0)).astype(np.int64)
+
+    def restaurants(self, rows: Optional[Sequence[int]] = None) -> List[Restaurant]:
+        """Restaurant objects for the given rows (all rows by default)"""
+        rows = np.arange(self.count) if rows is None else np.asarray(rows, dtype=np.int64)
+        columns = zip(rows.tolist(), self.name[rows].tolist(), self.location[rows].tolist(),
+                      self.cuisine[rows].tolist(), self.price[rows].tolist(), self.capacity[rows].tolist(),
+                      self.current_reservations[rows].tolist(), self.rating[rows].tolist(),
+                      self.feature_set[rows].tolist(), self.phone[rows].tolist(),
+                      self.street_number[rows].tolist(), self.street[rows].tolist(),
+                      self.latitude[rows].tolist(), self.longitude[rows].tolist(),
+                      self.table_first[rows].tolist(), self.table_count[rows].tolist())
+        seats, combinable = self.table_seats.tolist(), self.table_combinable.tolist()
+        restaurants = []
+        for (row, name, location, cuisine, price, capacity, current, rating, features, phone,
+             number, street, latitude, longitude, first, count) in columns:
+            restaurants.append(Restaurant.model_validate({
+                "id": self.restaurant_id(row),
+                "name": _NAMES[name],
+                "location": _AREAS[location],
+                "cuisine": _CUISINES[cuisine],
+                "price_range": _PRICES[price],
+                "capacity": capacity,
+                "current_reservations": current,
+                "rating": rating,
+                "special_features": _FEATURE_SETS[features],
+                "contact_phone": f"+1-555-{phone // 10000}-{phone % 10000}",
+                "address": f"{number} {STREET_NAMES[street]} St, {_AREAS[location]}",
+                "latitude": latitude,
+                "longitude": longitude,
+                "tables": [{"id": f"T{k + 1}", "seats": seats[first + k], "combinable": combinable[first + k]}
+                           for k in range(count)],
+            }))
+        return restaurants
+
+    def write(self, path: str, max_combined_tables: int = 3) -> int:
+        """Write the catalog file format (data/catalog_file.py) directly from the columns"""
+        n = self.count
+        strings = bytearray()
+        # Ids and phone numbers are fixed width, so their bytes are built as arrays of digits
+        numbers = np.arange(1, n + 1)
+        strings.extend(_text([b"rest_", _digits(numbers, self.id_width), b"\n"], n).tobytes()[:-1])
+        ids_size = len(strings)
+        phones_at = len(strings)
+        strings.extend(_text([b"+1-555-", _digits(self.phone // 10000, 3), b"-",
+                              _digits(self.phone % 10000, 4)], n).tobytes())
+
+        def spans(values: Sequence[str]) -> np.ndarray:
+            result = np.zeros((len(values), 2), dtype=np.uint32)
+            for position, value in enumerate(values):
+                encoded = value.encode("utf-8")
+                result[position] = (len(strings), len(encoded))
+                strings.extend(encoded)
+            return result
+
+        name_spans = spans(_NAMES)
+        area_spans = spans(_AREAS)
+        feature_spans = spans(["\x1f".join(features) for features in _FEATURE_SETS])
+        address_spans = spans([f"{number} {street} St, {area}" for number in range(100, 1000)
+                               for street in STREET_NAMES for area in _AREAS])
+        table_id_spans = spans([f"T{k + 1}" for k in range(int(self.table_count.max(initial=0)))])
+        feature_bits = np.array([sum(1 << _FEATURES.index(f.lower()) for f in features)
+                                 for features in _FEATURE_SETS], dtype=np.uint64)
+
+        records = np.zeros(n, dtype=record_dtype(1))
+        records["id"][:, 0] = np.arange(n) * (self.id_width + 6)
+        records["id"][:, 1] = self.id_width + 5
+        records["name"] = name_spans[self.name]
+        records["location_name"] = area_spans[self.location]
+        records["contact_phone"][:, 0] = phones_at + np.arange(n) * _PHONE_WIDTH
+        records["contact_phone"][:, 1] = _PHONE_WIDTH
+        address = ((self.street_number - 100) * len(STREET_NAMES) + self.street) * len(_AREAS) + self.location
+        records["address"] = address_spans[address]
+        records["special_features"] = feature_spans[self.feature_set]
+        records["tables"][:, 0] = self.table_first
+        records["tables"][:, 1] = self.table_count
+        records["cuisine"] = self.cuisine
+        records["price"] = self.price
+        records["location"] = self.location
+        records["capacity"] = self.capacity
+        records["current_reservations"] = self.current_reservations
+        records["max_party"] = self.max_party(max_combined_tables)
+        records["opening_time"] = _OPENING_HOUR * 3600
+        records["closing_time"] = _CLOSING_HOUR * 3600
+        records["rating"] = self.rating
+        records["latitude"] = self.latitude
+        records["longitude"] = self.longitude
+        records["features"][:, 0] = feature_bits[self.feature_set]
+
+        tables = np.zeros(len(self.table_seats), dtype=TABLE_RECORD)
+        rank = np.arange(len(tables)) - np.repeat(self.table_first, self.table_count)
+        tables["id"] = table_id_spans[rank]
+        tables["seats"] = self.table_seats
+        tables["combinable"] = self.table_combinable
+        return write_records(path, records, tables, bytes(strings), ids_size,
+                             [area.lower() for area in _AREAS], _FEATURES, max_combined_tables)
+
+
+def _digits(numbers: np.ndarray, width: int) -> np.ndarray:
+    # ASCII digits of each number, zero-padded to ``width``, one row per number
+    return (numbers[:, None] // 10 ** np.arange(width - 1, -1, -1) % 10 + ord("0")).astype(np.uint8)
+
+
+def _text(parts: list, rows: int) -> np.ndarray:
+    # Concatenate byte literals (repeated on every row) and digit arrays column-wise
+    return np.concatenate([np.broadcast_to(np.frombuffer(part, dtype=np.uint8), (rows, len(part)))
+                           if isinstance(part, bytes) else part for part in parts], axis=1)
+
+
+class SyntheticHistory:
+    """
+    Generated bookings as parallel arrays: catalog row, day (offset from
+    ``start``), start slot and party size, in the order they were made.
+    """
+
+    def __init__(self, rows: np.ndarray, days: np.ndarray, slots: np.ndarray, party_sizes: np.ndarray,
+                 start: Date, slot_minutes: int):
+        self.rows = rows
+        self.days = days
+        self.slots = slots
+        self.party_sizes = party_sizes
+        self.start = start
+        self.slot_minutes = slot_minutes
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def load_into(self, ledger: CapacityLedger, restaurant_ids: Sequence[str]) -> int:
+        """
+        Book the history into a ledger, where ``restaurant_ids[row]`` is the id of
+        each catalog row. Bookings for untracked restaurants or days outside the
+        ledger window are skipped. Returns the number of bookings loaded.
+        """
+        if ledger.slot_minutes != self.slot_minutes:
+            raise ValueError("History and ledger use different slot lengths")
+        start_index = (self.start - ledger.origin).days
+        ledger_rows = ledger.rows_of(restaurant_ids)[self.rows]
+        day_indices = self.days + start_index
+        keep = (ledger_rows >= 0) & (day_indices >= 0) & (day_indices < ledger.days)
+        ledger.load(ledger_rows[keep], day_indices[keep], self.slots[keep], self.party_sizes[keep])
+        return int(keep.sum())
+
+
+def generate_history(catalog: SyntheticCatalog,
+                     days: int = 31,
+                     start: Optional[Date] = None,
+                     seed: int = 0,
+                     bookings_per_seat: float = 0.25,
+                     slot_minutes: int = 30,
+                     duration_minutes: int = 120) -> SyntheticHistory:
+    """
+    Bookings for every restaurant and day from ``start`` (today by default).
+
+    Demand per restaurant and day is Poisson, proportional to capacity and
+    scaled by WEEKDAY_WEIGHTS; start times follow the lunch and dinner peaks
+    of MEAL_PEAKS within opening hours and party sizes PARTY_SIZE_WEIGHTS.
+    Requests are accepted in arrival order while the seats starting in their
+    slot stay within capacity divided by the slots a booking spans, so no
+    slot is ever overbooked however bookings overlap.
+    """
+    rng = np.random.default_rng(seed)
+    start = start or Date.today()
+    slots_per_booking = max(1, -(-duration_minutes // slot_minutes))
+    sizes = np.array(list(PARTY_SIZE_WEIGHTS))
+    weights = np.array(list(PARTY_SIZE_WEIGHTS.values()), dtype=np.float64)
+    weights /= weights.sum()
+
+    weekday = np.array(WEEKDAY_WEIGHTS)[(start.weekday() + np.arange(days)) % 7] / np.mean(WEEKDAY_WEIGHTS)
+    slots_per_day = 24 * 60 // slot_minutes
+    parts = []
+    # Restaurants are done a block at a time to bound the size of the temporary arrays
+    for block in range(0, catalog.count, _HISTORY_BLOCK):
+        capacity = catalog.capacity[block:block + _HISTORY_BLOCK]
+        counts = rng.poisson(capacity[:, None] * bookings_per_seat * weekday[None, :]).ravel()
+        rows = np.repeat(np.repeat(np.arange(len(capacity)), days), counts)
+        day = np.repeat(np.tile(np.arange(days), len(capacity)), counts)
+        total = len(rows)
+
+        meal = rng.choice(len(MEAL_PEAKS), size=total, p=[share for _, _, share in MEAL_PEAKS])
+        means = np.array([mean for mean, _, _ in MEAL_PEAKS])[meal]
+        deviations = np.array([deviation for _, deviation, _ in MEAL_PEAKS])[meal]
+        hours = np.clip(rng.normal(means, deviations), _OPENING_HOUR, _CLOSING_HOUR - duration_minutes / 60)
+        slot = (hours * 60 // slot_minutes).astype(np.int64)
+        party = rng.choice(sizes, size=total, p=weights)
+
+        # Running seat total per (restaurant, day, start slot), in arrival order
+        key = (rows * days + day) * slots_per_day + slot
+        order = np.argsort(key, kind="stable")
+        seats = np.cumsum(party[order])
+        first = np.r_[True, key[order][1:] != key[order][:-1]]
+        running = seats - (seats - party[order])[first][np.cumsum(first) - 1]
+        accepted = np.zeros(total, dtype=bool)
+        accepted[order] = running <= capacity[rows[order]] // slots_per_booking
+        parts.append(((rows[accepted] + block).astype(np.int32), day[accepted].astype(np.int16),
+                      slot[accepted].astype(np.int16), party[accepted].astype(np.int16)))
+
+    if not parts:
+        parts = [tuple(np.zeros(0, dtype=np.int32) for _ in range(4))]
+    rows, day, slot, party = (np.concatenate(column) for column in zip(*parts))
+    return SyntheticHistory(rows, day, slot, party, start, slot_minutes)
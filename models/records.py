@@ -0,0 +1,63 @@
+from typing import Dict, Any, Union
+import sys
+from models.restaurant import Reservation
+
+# Slot order of ReservationRecord, the same as the Reservation field order
+RESERVATION_FIELDS = tuple(Reservation.model_fields)
+
+
+class ReservationRecord:
+    """
+    Compact internal form of a Reservation.
+
+    Bookings are validated once, as Reservation models, where they enter
+    through the tools; the reservation store and storage recovery then hold
+    them as slotted records: no per-instance dict and no validation on
+    construction. Restaurant ids, dates and times repeat across bookings and
+    are interned, so each distinct value is stored once. ``to_model`` and
+    ``to_dict`` turn a record back into the public form.
+    """
+
+    __slots__ = RESERVATION_FIELDS
+
+    def __init__(self, id: str, restaurant_id: str, customer_name: str, customer_phone: str,
+                 customer_email: str, party_size: int, reservation_date: str, reservation_time: str,
+                 special_requests: str = "", table_ids=(), status: str = "confirmed", created_at: str = ""):
+        self.id = id
+        self.restaurant_id = sys.intern(restaurant_id)
+        self.customer_name = customer_name
+        self.customer_phone = customer_phone
+        self.customer_email = customer_email
+        self.party_size = party_size
+        self.reservation_date = sys.intern(reservation_date)
+        self.reservation_time = sys.intern(reservation_time)
+        self.special_requests = special_requests
+        self.table_ids = tuple(table_ids)
+        self.status = sys.intern(status)
+        self.created_at = created_at
+
+    @classmethod
+    def from_model(cls, reservation: Union[Reservation, "ReservationRecord"]) -> "ReservationRecord":
+        if isinstance(reservation, cls):
+            return reservation
+        return cls(*[getattr(reservation, field) for field in RESERVATION_FIELDS])
+
+    def to_model(self) -> Reservation:
+        return Reservation.model_validate(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in RESERVATION_FIELDS}
+        data["table_ids"] = list(self.table_ids)
+        return data
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (ReservationRecord, Reservation)):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in RESERVATION_FIELDS
+                   if field != "table_ids") and list(self.table_ids) == list(other.table_ids)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ReservationRecord(id={self.id!r}, restaurant_id={self.restaurant_id!r}, " \
+               f"{self.reservation_date} {self.reservation_time}, party_size={self.party_size})"
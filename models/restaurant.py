@@ -1,6 +1,8 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from enum import Enum
 from pydantic import BaseModel
+import sys
+import threading
 import uuid
 from datetime import datetime, time
 
@@ -22,6 +24,40 @@ class PriceRange(str, Enum):
     FINE_DINING = "$$$"
     LUXURY = "$$$$"
 
+# Features with a fixed bit in Restaurant.feature_mask; any other feature gets the
+# next free bit the first time it is seen, so masks stay comparable within a process
+FEATURE_VOCABULARY = [
+    "outdoor seating", "live music", "wine bar", "private dining", "chef's table", "tasting menu",
+    "family friendly", "kids menu", "play area", "romantic", "candlelit", "fine dining",
+    "business lunch", "free wifi", "power outlets", "wheelchair access", "vegetarian options",
+    "gluten free", "late night", "happy hour", "cocktail bar", "waterfront", "skyline view", "rooftop",
+]
+_FEATURE_BITS: Dict[str, int] = {feature: bit for bit, feature in enumerate(FEATURE_VOCABULARY)}
+_FEATURE_BITS_LOCK = threading.Lock()
+
+# Fields the precomputed search keys of a Restaurant are derived from
+_KEYED_FIELDS = {"cuisine", "location", "special_features"}
+
+# Fields that change with bookings and do not count as edits of a Restaurant
+_OCCUPANCY_FIELDS = {"current_reservations"}
+
+def feature_mask(features: Iterable[str]) -> int:
+    """Bit mask of a set of feature names (any case), as in Restaurant.feature_mask"""
+    mask = 0
+    for feature in features:
+        key = feature.lower()
+        bit = _FEATURE_BITS.get(key)
+        if bit is None:
+            with _FEATURE_BITS_LOCK:
+                bit = _FEATURE_BITS.setdefault(key, len(_FEATURE_BITS))
+        mask |= 1 << bit
+    return mask
+
+class Table(BaseModel):
+    id: str
+    seats: int
+    combinable: bool = False  # can be pushed together with other combinable tables
+
 class Restaurant(BaseModel):
     id: str
     name: str
@@ -36,6 +72,66 @@ class Restaurant(BaseModel):
     special_features: List[str] = []
     contact_phone: str = ""
     address: str = ""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    tables: List[Table] = []
+    
+    # Lower-cased keys and the feature mask, kept in step with the fields they come from
+    _cuisine_key: str
+    _location_key: str
+    _feature_keys: Tuple[str, ...]
+    _feature_mask: int
+    _revision: int
+    
+    def model_post_init(self, __context: Any) -> None:
+        self.__pydantic_private__["_revision"] = 0
+        self._refresh_keys()
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _OCCUPANCY_FIELDS:
+            return
+        self.__pydantic_private__["_revision"] += 1
+        if name in _KEYED_FIELDS:
+            self._refresh_keys()
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "Restaurant":
+        copy = super().model_copy(update=update, deep=deep)
+        if update and not _KEYED_FIELDS.isdisjoint(update):
+            copy._refresh_keys()
+        return copy
+    
+    def _refresh_keys(self) -> None:
+        # Read and written through __pydantic_private__ directly: attribute access to
+        # private attributes goes through BaseModel.__getattr__, which is much slower
+        private = self.__pydantic_private__
+        feature_keys = tuple([sys.intern(feature.lower()) for feature in self.special_features])
+        private["_cuisine_key"] = sys.intern(self.cuisine.value.lower())
+        private["_location_key"] = sys.intern(self.location.lower())
+        private["_feature_keys"] = feature_keys
+        private["_feature_mask"] = feature_mask(feature_keys)
+    
+    @property
+    def cuisine_key(self) -> str:
+        return self.__pydantic_private__["_cuisine_key"]
+    
+    @property
+    def location_key(self) -> str:
+        return self.__pydantic_private__["_location_key"]
+    
+    @property
+    def feature_keys(self) -> Tuple[str, ...]:
+        return self.__pydantic_private__["_feature_keys"]
+    
+    @property
+    def feature_mask(self) -> int:
+        """Bits of this restaurant's features; test with ``restaurant.feature_mask & feature_mask(names)``"""
+        return self.__pydantic_private__["_feature_mask"]
+    
+    @property
+    def revision(self) -> int:
+        """Number of field assignments since validation, not counting current_reservations"""
+        return self.__pydantic_private__["_revision"]
     
     @property
     def available_tables(self) -> int:
@@ -54,6 +150,7 @@ class Reservation(BaseModel):
     reservation_date: str  # YYYY-MM-DD
     reservation_time: str  # HH:MM
     special_requests: str = ""
+    table_ids: List[str] = []
     status: str = "confirmed"
     created_at: str = ""
     
@@ -68,6 +165,35 @@ class Reservation(BaseModel):
             "reservation_date": self.reservation_date,
             "reservation_time": self.reservation_time,
             "special_requests": self.special_requests,
+            "table_ids": self.table_ids,
+            "status": self.status,
+            "created_at": self.created_at
+        }
+
+class WaitlistEntry(BaseModel):
+    id: str
+    restaurant_id: str
+    customer_name: str
+    customer_phone: str
+    customer_email: str
+    party_size: int
+    reservation_date: str  # YYYY-MM-DD
+    reservation_time: str  # HH:MM
+    special_requests: str = ""
+    priority: int = 0  # higher is served first; equal priorities are served by request time
+    status: str = "waiting"  # waiting, promoted or left
+    reservation_id: Optional[str] = None  # set when the party was booked from the waitlist
+    created_at: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "restaurant_id": self.restaurant_id,
+            "customer_name": self.customer_name,
+            "party_size": self.party_size,
+            "reservation_date": self.reservation_date,
+            "reservation_time": self.reservation_time,
             "status": self.status,
+            "reservation_id": self.reservation_id,
             "created_at": self.created_at
-        }
\ No newline at end of file
+        }
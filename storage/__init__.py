@@ -0,0 +1,20 @@
+from typing import Optional
+from config import config
+from .base import StorageBackend
+from .sqlite import SQLiteBackend
+from .journal import JournalBackend
+
+
+def create_backend(name: str, path: Optional[str] = None) -> Optional[StorageBackend]:
+    """Backend for a STORAGE_BACKEND setting; "memory" means no persistence (None)"""
+    if name == "memory":
+        return None
+    if name == "sqlite":
+        return SQLiteBackend(path or config.SQLITE_PATH)
+    if name == "journal":
+        return JournalBackend(path or config.JOURNAL_DIR, snapshot_every=config.JOURNAL_SNAPSHOT_EVERY,
+                              fsync=config.JOURNAL_FSYNC)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+__all__ = ["StorageBackend", "SQLiteBackend", "JournalBackend", "create_backend"]
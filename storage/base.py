@@ -0,0 +1,48 @@
+from typing import List, Optional, Iterable
+from models.restaurant import Restaurant, Reservation
+
+
+class StorageBackend:
+    """
+    Where restaurants and reservations are kept between process restarts.
+
+    The reservation tools keep their in-memory indexes as the source for reads
+    and write every change through to the backend; on start-up they load the
+    catalog and the active reservations back from it. A booking or cancellation
+    is written together with the restaurant's updated reservation counter.
+    """
+
+    def load_restaurants(self) -> List[Restaurant]:
+        raise NotImplementedError
+
+    def save_restaurants(self, restaurants: Iterable[Restaurant]) -> None:
+        raise NotImplementedError
+
+    def delete_restaurant(self, restaurant_id: str) -> None:
+        raise NotImplementedError
+
+    def load_reservations(self) -> List[Reservation]:
+        """Every stored reservation, for restoring the in-memory store (ReservationRecords will do)"""
+        raise NotImplementedError
+
+    def save_bookings(self, reservations: Iterable[Reservation], restaurants: Iterable[Restaurant]) -> None:
+        """Store new reservations and the counters of their restaurants in one transaction"""
+        raise NotImplementedError
+
+    def delete_booking(self, reservation: Reservation, restaurant: Optional[Restaurant]) -> None:
+        """Remove a cancelled reservation and store its restaurant's counter in one transaction"""
+        raise NotImplementedError
+
+    def get_reservation(self, reservation_id: str) -> Optional[Reservation]:
+        raise NotImplementedError
+
+    def find_reservations(self,
+                          restaurant_id: Optional[str] = None,
+                          date: Optional[str] = None,
+                          email: Optional[str] = None,
+                          phone: Optional[str] = None) -> List[Reservation]:
+        """Reservations matching every given filter (email and phone are normalized)"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
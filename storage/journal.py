@@ -0,0 +1,272 @@
+from typing import List, Dict, Optional, Iterable, Any
+import json
+import os
+import threading
+from models.restaurant import Restaurant, Reservation
+from models.records import ReservationRecord, RESERVATION_FIELDS
+from storage.base import StorageBackend
+from tools.reservation_store import normalize_email, normalize_phone
+
+# Reservations are kept, journaled and snapshotted as rows in this field order
+_FIELDS = list(RESERVATION_FIELDS)
+
+# Reservation rows per snapshot line; each line is decoded with a single json.loads
+_SNAPSHOT_CHUNK = 10000
+
+
+class _Batch:
+    """Journal records that share one write and fsync"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class JournalBackend(StorageBackend):
+    """
+    Keeps restaurants and reservations in memory and makes every change durable
+    by appending it to a journal before the call returns.
+
+    Appends are group-committed: a writer thread takes every record queued
+    while the previous write was in progress and persists them with a single
+    write and fsync, so concurrent bookings share the cost of syncing. After
+    ``snapshot_every`` reservation changes a new journal segment is started and
+    the state at that point is written to a compact snapshot in the background;
+    segments and snapshots it covers are then deleted.
+
+    Opening the directory loads the newest snapshot and replays the segments
+    written after it. A record torn by a crash can only be the last line of a
+    segment, because every start opens a new one, and is skipped.
+    """
+
+    def __init__(self, directory: str = "goodfoods_journal", snapshot_every: int = 100000, fsync: bool = True):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.writes = 0
+        self.records = 0
+        self._restaurants: Dict[str, Dict[str, Any]] = {}
+        self._reservations: Dict[str, list] = {}
+        self._changes = 0
+        self._error: Optional[BaseException] = None
+        self._closing = False
+        self._batch = _Batch()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._segment = self._recover()
+        self._file = open(self._path("journal", self._segment), "a", encoding="utf-8")
+        self._sync_directory()
+        self._writer = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def load_restaurants(self) -> List[Restaurant]:
+        with self._lock:
+            return [Restaurant.model_validate(data) for data in self._restaurants.values()]
+
+    def save_restaurants(self, restaurants: Iterable[Restaurant]) -> None:
+        self._append(["restaurants", [r.model_dump(mode="json") for r in restaurants]])
+
+    def delete_restaurant(self, restaurant_id: str) -> None:
+        self._append(["delete_restaurant", restaurant_id])
+
+    def load_reservations(self) -> List[ReservationRecord]:
+        # Rows were validated when they were booked; records skip validating them again
+        with self._lock:
+            rows = list(self._reservations.values())
+        return [ReservationRecord(*row) for row in rows]
+
+    def save_bookings(self, reservations: Iterable[Reservation], restaurants: Iterable[Restaurant]) -> None:
+        rows = [[getattr(r, field) for field in _FIELDS] for r in reservations]
+        self._append(["book", rows, [[r.id, r.current_reservations] for r in restaurants]], changes=len(rows))
+
+    def delete_booking(self, reservation: Reservation, restaurant: Optional[Restaurant]) -> None:
+        if restaurant is None:
+            self._append(["cancel", reservation.id, None, None], changes=1)
+        else:
+            self._append(["cancel", reservation.id, restaurant.id, restaurant.current_reservations], changes=1)
+
+    def get_reservation(self, reservation_id: str) -> Optional[Reservation]:
+        row = self._reservations.get(reservation_id)
+        return Reservation.model_validate(dict(zip(_FIELDS, row))) if row else None
+
+    def find_reservations(self,
+                          restaurant_id: Optional[str] = None,
+                          date: Optional[str] = None,
+                          email: Optional[str] = None,
+                          phone: Optional[str] = None) -> List[Reservation]:
+        # A full scan: the reservation tools answer lookups from their own indexes
+        return [r for r in self.load_reservations()
+                if (not restaurant_id or r.restaurant_id == restaurant_id)
+                and (not date or r.reservation_date == date)
+                and (not email or normalize_email(r.customer_email) == normalize_email(email))
+                and (not phone or normalize_phone(r.customer_phone) == normalize_phone(phone))]
+
+    def snapshot(self) -> None:
+        """Snapshot the state after the records already queued, then wait for it to be written"""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._lock:
+            self._changes = max(self._changes, self.snapshot_every)
+            self._wake.notify()
+        self._append(["checkpoint"])
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closing = True
+            self._wake.notify()
+        self._writer.join()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self._file.close()
+
+    def _append(self, record: list, changes: int = 0) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._error is not None:
+                raise RuntimeError("journal is unavailable after a failed write") from self._error
+            if self._closing:
+                raise RuntimeError("journal is closed")
+            self._apply(record)
+            self._changes += changes
+            batch = self._batch
+            batch.lines.append(line)
+            self._wake.notify()
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def _apply(self, record: list) -> None:
+        kind = record[0]
+        if kind == "book":
+            for row in record[1]:
+                self._reservations[row[0]] = row
+            self._set_counters(record[2])
+        elif kind == "cancel":
+            self._reservations.pop(record[1], None)
+            if record[2] is not None:
+                self._set_counters([record[2:]])
+        elif kind == "restaurants":
+            for data in record[1]:
+                self._restaurants[data["id"]] = data
+        elif kind == "delete_restaurant":
+            self._restaurants.pop(record[1], None)
+
+    def _set_counters(self, counters: Iterable[list]) -> None:
+        for restaurant_id, count in counters:
+            data = self._restaurants.get(restaurant_id)
+            if data is not None:
+                data["current_reservations"] = count
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                while not self._batch.lines and not self._closing:
+                    self._wake.wait()
+                if not self._batch.lines:
+                    return
+                batch, self._batch = self._batch, _Batch()
+                snapshot = None
+                busy = self._snapshot_thread is not None and self._snapshot_thread.is_alive()
+                if self._changes >= self.snapshot_every and not busy:
+                    # State as of the end of this batch; rows are never changed in place
+                    snapshot = ({key: dict(data) for key, data in self._restaurants.items()},
+                                list(self._reservations.values()))
+                    self._changes = 0
+
+            try:
+                self._file.write("".join(batch.lines))
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                if snapshot is not None:
+                    self._file.close()
+                    self._segment += 1
+                    self._file = open(self._path("journal", self._segment), "a", encoding="utf-8")
+                    self._sync_directory()
+            except BaseException as error:
+                # Nothing can be appended after a failed write: fail this batch and the one queued behind it
+                with self._lock:
+                    self._error = error
+                    pending, self._batch = self._batch, _Batch()
+                for failed in (batch, pending):
+                    failed.error = error
+                    failed.done.set()
+                return
+            if snapshot is not None:
+                self._snapshot_thread = threading.Thread(target=self._write_snapshot,
+                                                         args=(self._segment, *snapshot),
+                                                         name="journal-snapshot", daemon=True)
+                self._snapshot_thread.start()
+            self.writes += 1
+            self.records += len(batch.lines)
+            batch.done.set()
+
+    def _write_snapshot(self, segment: int, restaurants: Dict[str, Dict[str, Any]], rows: List[list]) -> None:
+        # Header line with the restaurants, then arrays of reservation rows, one per line
+        path = self._path("snapshot", segment)
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            file.write(encode({"restaurants": list(restaurants.values())}) + "\n")
+            for start in range(0, len(rows), _SNAPSHOT_CHUNK):
+                file.write(encode(rows[start:start + _SNAPSHOT_CHUNK]) + "\n")
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+        self._sync_directory()
+        for kind, number in self._files():
+            if number < segment:
+                os.remove(self._path(kind, number))
+
+    def _recover(self) -> int:
+        files = self._files()
+        snapshots = [number for kind, number in files if kind == "snapshot"]
+        base = max(snapshots, default=0)
+        if snapshots:
+            with open(self._path("snapshot", base), encoding="utf-8") as file:
+                for data in json.loads(file.readline())["restaurants"]:
+                    self._restaurants[data["id"]] = data
+                for line in file:
+                    self._reservations.update((row[0], row) for row in json.loads(line))
+        segments = sorted(number for kind, number in files if kind == "journal" and number >= base)
+        for segment in segments:
+            with open(self._path("journal", segment), encoding="utf-8") as file:
+                lines = file.readlines()
+            for position, line in enumerate(lines):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if position == len(lines) - 1:
+                        break
+                    raise ValueError(f"Corrupt record {position + 1} in journal segment {segment}")
+                self._apply(record)
+        return max(segments, default=base - 1) + 1
+
+    def _files(self) -> List[tuple]:
+        found = []
+        for name in os.listdir(self.directory):
+            stem, _, extension = name.partition(".")
+            kind, _, number = stem.partition("-")
+            if (kind, extension) in (("journal", "log"), ("snapshot", "json")) and number.isdigit():
+                found.append((kind, int(number)))
+        return found
+
+    def _path(self, kind: str, number: int) -> str:
+        extension = "log" if kind == "journal" else "json"
+        return os.path.join(self.directory, f"{kind}-{number:08d}.{extension}")
+
+    def _sync_directory(self) -> None:
+        # Make new and renamed files durable as well (not supported on Windows)
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Iterable
+import json
+import sqlite3
+import threading
+from models.restaurant import Restaurant, Reservation
+from storage.base import StorageBackend
+from tools.reservation_store import normalize_email, normalize_phone
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS restaurants (
+    id TEXT PRIMARY KEY,
+    current_reservations INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    id TEXT PRIMARY KEY,
+    restaurant_id TEXT NOT NULL,
+    reservation_date TEXT NOT NULL,
+    reservation_time TEXT NOT NULL,
+    email_key TEXT NOT NULL,
+    phone_key TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reservations_by_restaurant_date ON reservations (restaurant_id, reservation_date);
+CREATE INDEX IF NOT EXISTS reservations_by_email ON reservations (email_key);
+CREATE INDEX IF NOT EXISTS reservations_by_phone ON reservations (phone_key);
+"""
+
+# Fixed SQL text, so sqlite3's statement cache prepares each one once per connection
+_UPSERT_RESTAURANT = ("INSERT INTO restaurants (id, current_reservations, data) VALUES (?, ?, ?) "
+                      "ON CONFLICT (id) DO UPDATE SET current_reservations = excluded.current_reservations, "
+                      "data = excluded.data")
+_UPDATE_COUNTER = "UPDATE restaurants SET current_reservations = ? WHERE id = ?"
+_DELETE_RESTAURANT = "DELETE FROM restaurants WHERE id = ?"
+_INSERT_RESERVATION = ("INSERT OR REPLACE INTO reservations "
+                       "(id, restaurant_id, reservation_date, reservation_time, email_key, phone_key, data) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_DELETE_RESERVATION = "DELETE FROM reservations WHERE id = ?"
+_SELECT_RESERVATION = "SELECT data FROM reservations WHERE id = ?"
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    SQLite storage in WAL mode, so readers never block the writer.
+
+    Each thread gets its own connection; connections of threads that have
+    exited are closed when the next thread connects. Reservations keep their lookup keys
+    (restaurant and date, normalized email and phone) in indexed columns next to
+    the JSON of the full record, and restaurants are stored as JSON with their
+    reservation counter in a separate column so bookings only update that.
+    """
+
+    def __init__(self, path: str = "goodfoods.db"):
+        self.path = path
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(_SCHEMA)
+
+    def load_restaurants(self) -> List[Restaurant]:
+        rows = self._connection().execute("SELECT current_reservations, data FROM restaurants ORDER BY rowid")
+        restaurants = []
+        for counter, data in rows:
+            restaurant = Restaurant.model_validate_json(data)
+            restaurant.current_reservations = counter
+            restaurants.append(restaurant)
+        return restaurants
+
+    def save_restaurants(self, restaurants: Iterable[Restaurant]) -> None:
+        with self._connection() as connection:
+            connection.executemany(_UPSERT_RESTAURANT, (
+                (r.id, r.current_reservations, r.model_dump_json()) for r in restaurants
+            ))
+
+    def delete_restaurant(self, restaurant_id: str) -> None:
+        with self._connection() as connection:
+            connection.execute(_DELETE_RESTAURANT, (restaurant_id,))
+
+    def load_reservations(self) -> List[Reservation]:
+        rows = self._connection().execute("SELECT data FROM reservations ORDER BY rowid")
+        return [Reservation.model_validate_json(data) for data, in rows]
+
+    def save_bookings(self, reservations: Iterable[Reservation], restaurants: Iterable[Restaurant]) -> None:
+        with self._connection() as connection:
+            connection.executemany(_INSERT_RESERVATION, (self._reservation_row(r) for r in reservations))
+            connection.executemany(_UPDATE_COUNTER, ((r.current_reservations, r.id) for r in restaurants))
+
+    def delete_booking(self, reservation: Reservation, restaurant: Optional[Restaurant]) -> None:
+        with self._connection() as connection:
+            connection.execute(_DELETE_RESERVATION, (reservation.id,))
+            if restaurant is not None:
+                connection.execute(_UPDATE_COUNTER, (restaurant.current_reservations, restaurant.id))
+
+    def get_reservation(self, reservation_id: str) -> Optional[Reservation]:
+        row = self._connection().execute(_SELECT_RESERVATION, (reservation_id,)).fetchone()
+        return Reservation.model_validate_json(row[0]) if row else None
+
+    def find_reservations(self,
+                          restaurant_id: Optional[str] = None,
+                          date: Optional[str] = None,
+                          email: Optional[str] = None,
+                          phone: Optional[str] = None) -> List[Reservation]:
+        conditions, parameters = [], []
+        for column, value in (("restaurant_id", restaurant_id), ("reservation_date", date),
+                              ("email_key", email and normalize_email(email)),
+                              ("phone_key", phone and normalize_phone(phone))):
+            if value:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        sql = "SELECT data FROM reservations"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        rows = self._connection().execute(sql + " ORDER BY rowid", parameters)
+        return [Reservation.model_validate_json(data) for data, in rows]
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=128)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+            with self._connections_lock:
+                for thread in [t for t in self._connections if not t.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = connection
+        return connection
+
+    @staticmethod
+    def _reservation_row(reservation: Reservation) -> tuple:
+        return (reservation.id, reservation.restaurant_id, reservation.reservation_date,
+                reservation.reservation_time, normalize_email(reservation.customer_email),
+                normalize_phone(reservation.customer_phone), reservation.model_dump_json())
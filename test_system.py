@@ -4,7 +4,8 @@ Test script to verify the restaurant reservation system works correctly
 """
 
 from data.sample_restaurants import generate_sample_restaurants
-from tools.reservation_tools import ReservationTools
+from datetime import date, timedelta
+from tools.enhanced_reservation_tools import EnhancedReservationTools
 
 def test_restaurant_generation():
     """Test that restaurants are generated correctly"""
@@ -12,45 +13,47 @@ def test_restaurant_generation():
     
     restaurants = generate_sample_restaurants(5)  # Generate just 5 for testing
     print(f"✅ Generated {len(restaurants)} restaurants")
+    assert len(restaurants) == 5
     
     for i, restaurant in enumerate(restaurants):
         print(f"  {i+1}. {restaurant.name} - {restaurant.cuisine.value} - {restaurant.location}")
     
-    return True
 
 def test_reservation_tools():
     """Test reservation tools functionality"""
     print("\n🧪 Testing reservation tools...")
     
-    tools = ReservationTools()
+    tools = EnhancedReservationTools(storage=None)
     print(f"✅ Loaded {len(tools.restaurants)} restaurants")
+    assert tools.restaurants
     
     # Test search
     results = tools.search_restaurants(cuisine="Italian", party_size=2)
     print(f"✅ Found {len(results)} Italian restaurants for 2 people")
+    assert all(r["cuisine"] == "Italian" for r in results)
     
     # Test availability check
     if results:
         restaurant_id = results[0]["id"]
-        availability = tools.check_availability(restaurant_id, "2024-12-25", "19:00", 2)
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        availability = tools.check_availability(restaurant_id, tomorrow, "19:00", 2)
         print(f"✅ Availability check: {availability['available']}")
+        assert "available" in availability
     
-    return True
 
 def test_recommendations():
     """Test recommendation engine"""
     print("\n🧪 Testing recommendation engine...")
     
-    from tools.search_tools import SearchTools
-    search_tools = SearchTools()
+    tools = EnhancedReservationTools(storage=None)
     
-    recommendations = search_tools.get_restaurant_recommendations(
+    recommendations = tools.get_restaurant_recommendations(
         occasion="romantic dinner",
         group_type="couple"
     )
     print(f"✅ Generated {len(recommendations)} romantic recommendations")
+    assert len(recommendations) <= 8
     
-    return True
 
 if __name__ == "__main__":
     print("🚀 Starting GoodFoods Reservation System Tests...\n")
@@ -0,0 +1,39 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.synthetic import SyntheticCatalog
+from tools.enhanced_reservation_tools import EnhancedReservationTools
+
+
+@pytest.fixture
+def restaurants():
+    return SyntheticCatalog(300, seed=11).restaurants()
+
+
+@pytest.fixture
+def make_tools(restaurants):
+    """EnhancedReservationTools over a fresh copy of the test catalog"""
+    def make(**options):
+        catalog = options.pop("restaurants", None) or [r.model_copy(deep=True) for r in restaurants]
+        options.setdefault("storage", None)
+        return EnhancedReservationTools(catalog, **options)
+    return make
+
+
+@pytest.fixture
+def day():
+    """YYYY-MM-DD of the day that many days from today"""
+    return lambda days_ahead=1: (date.today() + timedelta(days=days_ahead)).isoformat()
+
+
+@pytest.fixture
+def guest():
+    """Contact details of a test customer, numbered to tell customers apart"""
+    return lambda number=0: {"customer_name": f"Guest {number}",
+                             "customer_phone": f"555{number:07d}",
+                             "customer_email": f"guest{number}@example.com"}
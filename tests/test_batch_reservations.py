@@ -0,0 +1,77 @@
+import sqlite3
+
+from storage import SQLiteBackend
+
+
+def _snapshot(tools, restaurants, date, time):
+    """Free seats, free tables and booking counters of the restaurants at one slot"""
+    day, at = tools._parse_slot(date, time)
+    return [(tools.capacity_ledger.seats_free(r.id, day, at),
+             tools.table_allocator.find(r.id, day, at, 2) is not None,
+             r.current_reservations) for r in restaurants]
+
+
+def test_batch_books_every_reservation(make_tools, day, guest):
+    tools = make_tools()
+    first, second = tools.restaurants[0], tools.restaurants[1]
+    items = [{"restaurant_id": first.id, "party_size": 4, "date": day(2), "time": "19:00"},
+             {"restaurant_id": second.id, "party_size": 2, "date": day(3), "time": "20:00",
+              "customer_name": "Second Guest"}]
+
+    result = tools.create_batch_reservations(items, **guest())
+
+    assert result["success"], result
+    assert [r["customer_name"] for r in result["reservations"]] == [guest()["customer_name"], "Second Guest"]
+    for reservation in result["reservations"]:
+        assert tools.get_reservation_details(reservation["reservation_id"])["found"]
+
+
+def test_batch_that_cannot_be_seated_books_nothing(make_tools, day, guest):
+    tools = make_tools()
+    first, second = tools.restaurants[0], tools.restaurants[1]
+    before = _snapshot(tools, [first, second], day(2), "19:00")
+    # The last party is larger than any combination of the first restaurant's tables
+    items = [{"restaurant_id": first.id, "party_size": 2, "date": day(2), "time": "19:00"},
+             {"restaurant_id": second.id, "party_size": 4, "date": day(2), "time": "19:00"},
+             {"restaurant_id": first.id, "party_size": 20, "date": day(2), "time": "19:00"}]
+
+    result = tools.create_batch_reservations(items, **guest())
+
+    assert not result["success"]
+    assert [r["success"] for r in result["reservations"]] == [False] * 3
+    assert "Not enough seats" in result["reservations"][2]["message"]
+    assert _snapshot(tools, [first, second], day(2), "19:00") == before
+    assert not tools.get_customer_reservations(customer_email=guest()["customer_email"])["found"]
+
+
+def test_invalid_item_fails_the_batch_before_booking(make_tools, day, guest):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    before = _snapshot(tools, [restaurant], day(2), "19:00")
+    items = [{"restaurant_id": restaurant.id, "party_size": 2, "date": day(2), "time": "19:00"},
+             {"restaurant_id": "no_such_restaurant", "party_size": 2, "date": day(2), "time": "19:00"}]
+
+    result = tools.create_batch_reservations(items, **guest())
+
+    assert not result["success"]
+    assert result["reservations"][1]["message"] == "Restaurant not found"
+    assert _snapshot(tools, [restaurant], day(2), "19:00") == before
+
+
+def test_failed_batch_write_rolls_back_every_reservation(make_tools, restaurants, day, guest, tmp_path):
+    storage = SQLiteBackend(str(tmp_path / "goodfoods.db"))
+    tools = make_tools(restaurants=[r.model_copy(deep=True) for r in restaurants[:5]], storage=storage)
+    first, second = tools.restaurants[0], tools.restaurants[1]
+    before = _snapshot(tools, [first, second], day(2), "19:00")
+
+    def failing_save(reservations, restaurants):
+        raise sqlite3.OperationalError("database is locked")
+
+    storage.save_bookings = failing_save
+    items = [{"restaurant_id": restaurant.id, "party_size": 2, "date": day(2), "time": "19:00"}
+             for restaurant in (first, second, first)]
+    result = tools.create_batch_reservations(items, **guest())
+
+    assert not result["success"] and "database is locked" in result["error"]
+    assert _snapshot(tools, [first, second], day(2), "19:00") == before
+    assert storage.find_reservations(email=guest()["customer_email"]) == []
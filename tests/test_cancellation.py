@@ -0,0 +1,30 @@
+import sqlite3
+
+from storage import SQLiteBackend
+
+
+def test_failed_cancel_write_keeps_the_reservation(make_tools, restaurants, day, guest, tmp_path):
+    storage = SQLiteBackend(str(tmp_path / "goodfoods.db"))
+    tools = make_tools(restaurants=[r.model_copy(deep=True) for r in restaurants[:5]], storage=storage)
+    restaurant = tools.restaurants[0]
+    booked = tools.create_reservation(restaurant.id, party_size=2, date=day(2), time="19:00", **guest())
+    assert booked["success"], booked
+    counter = restaurant.current_reservations
+    seats = tools.capacity_ledger.seats_free(restaurant.id, *tools._parse_slot(day(2), "19:00"))
+
+    def failing_delete(reservation, restaurant):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    storage.delete_booking = failing_delete
+    result = tools.cancel_reservation(booked["reservation_id"])
+
+    assert not result["success"]
+    assert tools.get_reservation_details(booked["reservation_id"])["found"]
+    assert tools.capacity_ledger.seats_free(restaurant.id, *tools._parse_slot(day(2), "19:00")) == seats
+    assert restaurant.current_reservations == counter
+    assert storage.get_reservation(booked["reservation_id"]) is not None
+
+    del storage.delete_booking
+    assert tools.cancel_reservation(booked["reservation_id"])["success"]
+    assert restaurant.current_reservations == counter - 1
+    assert storage.get_reservation(booked["reservation_id"]) is None
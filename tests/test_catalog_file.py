@@ -0,0 +1,38 @@
+from data.catalog_file import write_catalog
+from tools.enhanced_reservation_tools import EnhancedReservationTools
+
+
+def _mapped_tools(restaurants, tmp_path):
+    path = str(tmp_path / "restaurants.catalog")
+    write_catalog(restaurants, path)
+    return EnhancedReservationTools(columnar=True, storage=None, catalog_path=path)
+
+
+def _built(tools):
+    return {rid for rid, restaurant in tools.catalog_index._restaurants.items() if restaurant is not None}
+
+
+def test_mapped_catalog_builds_restaurants_on_first_use(restaurants, tmp_path, day, guest):
+    tools = _mapped_tools(restaurants, tmp_path)
+    assert len(tools.restaurants) == len(restaurants)
+    assert not _built(tools)
+
+    results = tools.search_restaurants(cuisine="Italian", party_size=4)
+    assert results and _built(tools) == {r["id"] for r in results}
+
+    # The columnar rows and the catalog hand out the same object, so bookings show up in both
+    restaurant = tools.catalog_index.get(results[0]["id"])
+    assert tools.columnar_catalog.restaurants_at([tools.columnar_catalog._row_by_id[restaurant.id]]) == [restaurant]
+    booked = tools.create_reservation(restaurant.id, party_size=4, date=day(2), time="19:00", **guest())
+    assert booked["success"] and booked["table_ids"], booked
+    assert tools.columnar_catalog.current_reservations[tools.columnar_catalog._row_by_id[restaurant.id]] == \
+        restaurant.current_reservations
+
+
+def test_mapped_catalog_answers_like_the_loaded_catalog(make_tools, restaurants, tmp_path, day):
+    mapped, loaded = _mapped_tools(restaurants, tmp_path), make_tools(columnar=True)
+    for arguments in ({"cuisine": "thai"}, {"location": "Downtown", "party_size": 6},
+                      {"party_size": 4, "date": day(1), "time": "19:00"}, {"features": ["rooftop"]},
+                      {"near": "Downtown", "nearest": 5}):
+        assert mapped.search_restaurants(**arguments) == loaded.search_restaurants(**arguments), arguments
+    assert mapped.resolve_restaurant_name(restaurants[7].name) == loaded.resolve_restaurant_name(restaurants[7].name)
@@ -0,0 +1,36 @@
+import threading
+from datetime import date, time, timedelta
+
+
+def test_concurrent_bookings_of_one_slot_never_overbook(make_tools, guest):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    initial = restaurant.current_reservations
+    day = date.today() + timedelta(days=2)
+    start = threading.Barrier(32)
+    cancelled = []
+
+    def book(number):
+        start.wait()
+        for attempt in range(3):
+            result = tools.create_reservation(restaurant.id, party_size=4, date=day.isoformat(), time="19:00",
+                                              **guest(number * 3 + attempt))
+            if result["success"] and attempt == 1:
+                assert tools.cancel_reservation(result["reservation_id"])["success"]
+                cancelled.append(result["reservation_id"])
+
+    threads = [threading.Thread(target=book, args=(number,)) for number in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    confirmed = tools.reservations.for_restaurant(restaurant.id, day.isoformat())
+    seats = sum(reservation.party_size for reservation in confirmed)
+    assert confirmed and cancelled
+    assert seats <= restaurant.capacity < 3 * 32 * 4
+    # The ledger holds exactly the stored bookings, and no table is given out twice
+    assert restaurant.capacity - tools.capacity_ledger.seats_free(restaurant.id, day, time(19, 0)) == seats
+    tables = [table for reservation in confirmed for table in reservation.table_ids]
+    assert len(tables) == len(set(tables))
+    assert restaurant.current_reservations - initial == len(confirmed)
@@ -0,0 +1,86 @@
+import threading
+
+from tools.idempotency import IdempotencyStore
+
+
+def _reservation_id(result):
+    return result.get("reservation_id") if result.get("success") else None
+
+
+def test_retried_booking_returns_the_original_confirmation(make_tools, day, guest):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    arguments = dict(restaurant_id=restaurant.id, party_size=2, date=day(2), time="19:00", **guest())
+    counter = restaurant.current_reservations
+
+    first = tools.create_reservation(**arguments)
+    retry = tools.create_reservation(**arguments)
+    assert first["success"] and retry == first
+    assert restaurant.current_reservations == counter + 1
+    assert len(tools.get_customer_reservations(customer_email=guest()["customer_email"])["reservations"]) == 1
+
+    # A retry under the caller's key matches even if the model rephrased the details
+    keyed = tools.create_reservation(**{**arguments, "time": "20:00"}, idempotency_key="call_1")
+    assert tools.create_reservation(**{**arguments, "time": "20:30"}, idempotency_key="call_1") == keyed
+    assert tools.idempotency.replays == 2
+
+
+def test_cancelled_booking_can_be_made_again(make_tools, day, guest):
+    tools = make_tools()
+    arguments = dict(restaurant_id=tools.restaurants[0].id, party_size=2, date=day(2), time="19:00", **guest())
+    first = tools.create_reservation(**arguments)
+    assert tools.cancel_reservation(first["reservation_id"])["success"]
+
+    second = tools.create_reservation(**arguments)
+    assert second["success"] and second["reservation_id"] != first["reservation_id"]
+
+
+def test_failures_are_not_remembered_and_results_expire():
+    now = [0.0]
+    store = IdempotencyStore(ttl_seconds=60, clock=lambda: now[0])
+    calls = []
+
+    def call(result):
+        calls.append(result)
+        return result
+
+    failed = {"success": False}
+    assert store.run(["key"], lambda: call(failed), _reservation_id) == failed
+    booked = {"success": True, "reservation_id": "RES_1"}
+    assert store.run(["key"], lambda: call(booked), _reservation_id) == booked
+    assert store.run(["key"], lambda: call({"success": True, "reservation_id": "RES_2"}), _reservation_id) == booked
+    assert len(calls) == 2
+
+    now[0] = 61
+    assert store.run(["key"], lambda: call({"success": True, "reservation_id": "RES_2"}),
+                     _reservation_id)["reservation_id"] == "RES_2"
+    assert len(calls) == 3
+
+
+def test_concurrent_retry_waits_for_the_call_in_flight():
+    store = IdempotencyStore()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_booking():
+        calls.append("booked")
+        started.set()
+        assert release.wait(5)
+        return {"success": True, "reservation_id": "RES_1"}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(store.run(["key"], slow_booking, _reservation_id)))
+    first.start()
+    assert started.wait(5)
+    # Matches on a second key shared with the running call
+    retry = threading.Thread(target=lambda: results.append(store.run(["other", "key"], slow_booking, _reservation_id)))
+    retry.start()
+    retry.join(0.2)
+    assert retry.is_alive()
+
+    release.set()
+    first.join(5)
+    retry.join(5)
+    assert calls == ["booked"]
+    assert results == [{"success": True, "reservation_id": "RES_1"}] * 2
+    assert store.replays == 1
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import pytest
+
+from storage import JournalBackend
+
+
+def test_failed_fsync_fails_every_waiting_append(tmp_path, monkeypatch):
+    journal = JournalBackend(str(tmp_path / "journal"))
+    release = threading.Event()
+
+    def failing_fsync(descriptor):
+        release.wait()
+        raise OSError(5, "Input/output error")
+
+    monkeypatch.setattr("storage.journal.os.fsync", failing_fsync)
+    outcomes = []
+
+    def append(number):
+        try:
+            journal.delete_restaurant(f"rest_{number}")
+            outcomes.append("written")
+        except Exception as error:
+            outcomes.append(error)
+
+    appenders = [threading.Thread(target=append, args=(n,), daemon=True) for n in range(8)]
+    for appender in appenders:
+        appender.start()
+    # Let the first record reach the writer and the rest queue up behind it
+    time.sleep(0.1)
+    release.set()
+    for appender in appenders:
+        appender.join(timeout=5)
+
+    assert not any(appender.is_alive() for appender in appenders)
+    assert len(outcomes) == 8 and all(isinstance(outcome, Exception) for outcome in outcomes)
+    with pytest.raises(RuntimeError):
+        journal.delete_restaurant("rest_late")
+    journal.close()
+
+
+def _book(tools, guest, day, count):
+    ids = []
+    for number in range(count):
+        restaurant = tools.restaurants[number % len(tools.restaurants)]
+        result = tools.create_reservation(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(number))
+        assert result["success"], result
+        ids.append(result["reservation_id"])
+    return ids
+
+
+def _state(journal):
+    reservations = sorted((r.id, r.restaurant_id, r.party_size) for r in journal.load_reservations())
+    counters = sorted((r.id, r.current_reservations) for r in journal.load_restaurants())
+    return reservations, counters
+
+
+def test_reopening_replays_the_journal_and_skips_a_torn_record(make_tools, restaurants, day, guest, tmp_path):
+    directory = str(tmp_path / "journal")
+    journal = JournalBackend(directory, fsync=False)
+    tools = make_tools(restaurants=[r.model_copy(deep=True) for r in restaurants[:5]], storage=journal)
+    booked = _book(tools, guest, day, 6)
+    assert tools.cancel_reservation(booked[0])["success"]
+    expected = _state(journal)
+    assert [row[0] for row in expected[0]] == sorted(booked[1:])
+    journal.close()
+
+    # A crash in the middle of a write leaves half a record at the end of the segment
+    segment = max(name for name in os.listdir(directory) if name.startswith("journal-"))
+    with open(os.path.join(directory, segment), "a", encoding="utf-8") as file:
+        file.write('["book",[["RES_TORN"')
+
+    reopened = JournalBackend(directory, fsync=False)
+    assert _state(reopened) == expected
+    restored = make_tools(restaurants=[r.model_copy(deep=True) for r in restaurants[:5]], storage=reopened)
+    assert restored.get_reservation_details(booked[1])["found"]
+    assert not restored.get_reservation_details(booked[0])["found"]
+    reopened.close()
+
+
+def test_corrupt_record_before_the_end_is_an_error(tmp_path):
+    directory = str(tmp_path / "journal")
+    JournalBackend(directory, fsync=False).close()
+    with open(os.path.join(directory, "journal-00000000.log"), "w", encoding="utf-8") as file:
+        file.write('["delete_restaurant"\n["delete_restaurant","rest_1"]\n')
+
+    with pytest.raises(ValueError):
+        JournalBackend(directory, fsync=False)
+
+
+def test_recovery_starts_from_the_snapshot(make_tools, restaurants, day, guest, tmp_path):
+    directory = str(tmp_path / "journal")
+    journal = JournalBackend(directory, snapshot_every=4, fsync=False)
+    tools = make_tools(restaurants=[r.model_copy(deep=True) for r in restaurants[:5]], storage=journal)
+    booked = _book(tools, guest, day, 10)
+    journal.snapshot()
+    assert tools.cancel_reservation(booked[3])["success"]
+    expected = _state(journal)
+    journal.close()
+
+    names = sorted(os.listdir(directory))
+    snapshots = [name for name in names if name.startswith("snapshot-")]
+    assert len(snapshots) == 1 and not any(name.endswith(".tmp") for name in names)
+    # Segments the snapshot covers were deleted; only the ones written after it remain
+    assert all(name >= snapshots[0].replace("snapshot", "journal").replace(".json", ".log")
+               for name in names if name.startswith("journal-"))
+
+    reopened = JournalBackend(directory, fsync=False)
+    assert _state(reopened) == expected
+    assert len(reopened.load_reservations()) == 9
+    reopened.close()
@@ -0,0 +1,16 @@
+from tools.name_index import RestaurantNameIndex
+
+
+def test_removed_names_stop_resolving_while_chain_siblings_remain(restaurants):
+    index = RestaurantNameIndex(restaurants)
+    name = restaurants[7].name
+    chain = [r.id for r in restaurants if r.name == name]
+    assert len(chain) > 1 and set(index.lookup(name, limit=len(chain))) == set(chain)
+
+    for restaurant_id in chain[:-1]:
+        index.remove(restaurant_id)
+    assert index.lookup(name) == chain[-1:]
+
+    index.remove(chain[-1])
+    assert name not in index._exact
+    assert chain[-1] not in index.lookup(name)
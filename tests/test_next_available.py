@@ -0,0 +1,51 @@
+from datetime import date, time, timedelta
+
+from tools.capacity_ledger import CapacityLedger
+
+
+def _fill_day(ledger, restaurant_id, day, capacity):
+    # Back-to-back bookings of every seat from opening (11:00) to the last start (23:00)
+    for hour in range(11, 24, 2):
+        assert ledger.book(restaurant_id, day, time(hour, 0), capacity)
+
+
+def test_day_summary_only_counts_opening_hours():
+    ledger = CapacityLedger(days=7)
+    ledger.register("rest_1", 10, time(11, 0), time(23, 0))
+    day = date.today() + timedelta(days=1)
+    assert ledger.best_free_seats(["rest_1"], 1).tolist() == [10]
+
+    _fill_day(ledger, "rest_1", day, 10)
+    # Overnight slots are empty, but nobody can book them
+    assert ledger.best_free_seats(["rest_1"], 1).tolist() == [0]
+
+    ledger.release("rest_1", day, time(19, 0), 4)
+    assert ledger.best_free_seats(["rest_1"], 1).tolist() == [4]
+
+
+def test_restaurant_that_never_opens_has_no_free_seats():
+    ledger = CapacityLedger(days=7)
+    ledger.register("rest_1", 10, time(23, 45), time(23, 50))
+    assert ledger.best_free_seats(["rest_1"], 0).tolist() == [0]
+
+
+def test_find_next_available_skips_a_fully_booked_day(make_tools, day):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    ledger = tools.capacity_ledger
+    preferred = date.today() + timedelta(days=3)
+    _fill_day(ledger, restaurant.id, preferred, restaurant.capacity)
+
+    probed = []
+    probe = ledger.free_seats_by_slot
+
+    def recording_probe(restaurant_id, day_index):
+        probed.append(day_index)
+        return probe(restaurant_id, day_index)
+
+    ledger.free_seats_by_slot = recording_probe
+    result = tools.find_next_available([restaurant.id], 2, day(3), "19:00", include_similar=False)
+
+    assert result["success"]
+    assert ledger.day_index(preferred) not in probed
+    assert all(alternative["date"] != day(3) for alternative in result["alternatives"])
@@ -0,0 +1,93 @@
+import itertools
+
+import pytest
+
+from data.synthetic import SyntheticCatalog
+from tools.enhanced_reservation_tools import EnhancedReservationTools
+
+
+@pytest.fixture(scope="module")
+def both_catalogs():
+    """The same catalog behind a list-scanning and a columnar EnhancedReservationTools"""
+    return tuple(EnhancedReservationTools(SyntheticCatalog(300, seed=11).restaurants(), columnar=columnar, storage=None)
+                 for columnar in (False, True))
+
+
+def _ranked(results):
+    # Restaurants tied on rating and free tables may come back in either order
+    return [(r["rating"], r["available_tables"]) for r in results], sorted(r["id"] for r in results)
+
+
+@pytest.mark.parametrize("cuisine, location, price_range, party_size", list(itertools.product(
+    [None, "Italian", "thai"], [None, "Downtown", "harbor view"], [None, "$$", "$$$$"], [None, 2, 8])))
+def test_columnar_search_matches_list_search(both_catalogs, cuisine, location, price_range, party_size):
+    listed, columnar = both_catalogs
+    arguments = dict(cuisine=cuisine, location=location, price_range=price_range, party_size=party_size)
+    assert _ranked(columnar.search_restaurants(**arguments)) == _ranked(listed.search_restaurants(**arguments))
+
+
+def test_columnar_search_follows_bookings_and_catalog_edits(make_tools, day, guest):
+    listed, columnar = make_tools(columnar=False), make_tools(columnar=True)
+    for tools in (listed, columnar):
+        for number, restaurant in enumerate(tools.restaurants[:20]):
+            result = tools.create_reservation(restaurant.id, party_size=4, date=day(2), time="19:00", **guest(number))
+            assert result["success"], result
+        tools.remove_restaurant(tools.restaurants[-1].id)
+        edited = tools.restaurants[0].model_copy(update={"rating": 5.0})
+        tools.add_restaurant(edited)
+
+    for arguments in ({}, {"cuisine": "Italian"}, {"location": "Downtown", "party_size": 4}):
+        assert _ranked(columnar.search_restaurants(**arguments)) == _ranked(listed.search_restaurants(**arguments))
+
+
+def test_recommendations_match_after_removals(make_tools):
+    listed, columnar = make_tools(columnar=False), make_tools(columnar=True)
+    for tools in (listed, columnar):
+        for restaurant in tools.restaurants[:40:3]:
+            assert tools.remove_restaurant(restaurant.id)
+        assert len(tools.restaurants) == 300 - 14
+        assert sorted(r.id for r in tools.restaurants) == sorted(r.id for r in tools.catalog_index.lookup())
+
+    for occasion, group_type in (("romantic dinner", None), (None, "large group"), (None, None)):
+        assert (columnar.get_restaurant_recommendations(occasion=occasion, group_type=group_type) ==
+                listed.get_restaurant_recommendations(occasion=occasion, group_type=group_type))
+
+
+def test_null_filters_are_ignored_in_any_case(make_tools, day):
+    tools = make_tools()
+    unfiltered = tools.search_restaurants(party_size=2)
+    assert tools.search_restaurants(cuisine="NULL", location="Null", price_range="NULL", party_size=2) == unfiltered
+    assert tools.query_cache.stats()["entries"] == 1
+
+    matrix = tools.check_availability_matrix(2, day(1), ["19:00"], cuisine="Null", location="NULL", price_range="NULL")
+    assert matrix == tools.check_availability_matrix(2, day(1), ["19:00"])
+    assert matrix["success"], matrix
+
+
+def test_null_recommendation_filters_do_not_poison_the_cache(make_tools):
+    tools = make_tools()
+    unfiltered = make_tools().get_restaurant_recommendations()
+    assert unfiltered
+
+    assert tools.get_restaurant_recommendations(budget="null", occasion="NULL", group_type="Null",
+                                                preferences="null") == unfiltered
+    assert tools.get_restaurant_recommendations() == unfiltered
+
+
+def test_null_contact_details_are_not_searched(make_tools):
+    result = make_tools().get_customer_reservations(customer_email="NULL", customer_phone="Null")
+    assert not result["found"]
+    assert "Please provide" in result["message"]
+
+
+def test_search_radius_is_coerced_and_validated(make_tools):
+    tools = make_tools()
+    near = tools.restaurants[0].location
+    by_number = tools.search_restaurants(near=near, radius_km=3)
+    assert by_number and all(r["distance_km"] <= 3 for r in by_number)
+    assert tools.search_restaurants(near=near, radius_km="3") == by_number
+
+    for radius in (-1, 0, "-2", "far"):
+        result = tools.search_restaurants(near=near, radius_km=radius)
+        assert isinstance(result, dict) and not result["success"], radius
+    assert tools.query_cache.stats()["entries"] == 1
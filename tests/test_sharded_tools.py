@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from data.catalog_file import write_catalog
+from data.synthetic import SyntheticCatalog
+from tools.sharded_tools import ShardedReservationTools
+
+
+@pytest.fixture
+def shard_dir(tmp_path):
+    """Two cities of one tenant, with restaurant ids that differ between them"""
+    for seed, city in enumerate(("austin", "boston")):
+        restaurants = SyntheticCatalog(60, seed=seed).restaurants()
+        for restaurant in restaurants:
+            restaurant.id = f"{city}_{restaurant.id}"
+        (tmp_path / "acme").mkdir(exist_ok=True)
+        write_catalog(restaurants, str(tmp_path / "acme" / f"{city}.catalog"))
+    return str(tmp_path)
+
+
+def test_slow_shard_load_does_not_block_other_shards(shard_dir):
+    router = ShardedReservationTools(shard_dir, storage_backend="memory")
+    started, release = threading.Event(), threading.Event()
+    load = router._load
+
+    def slow_load(key):
+        if key == "acme/austin":
+            started.set()
+            release.wait(30)
+        return load(key)
+
+    router._load = slow_load
+    results = []
+    waiting = [threading.Thread(target=lambda: results.append(router.search_restaurants("acme", "austin")))
+               for _ in range(3)]
+    for thread in waiting:
+        thread.start()
+    assert started.wait(5)
+
+    # Boston loads and answers while Austin is still loading
+    boston = []
+    other = threading.Thread(target=lambda: boston.append(router.search_restaurants("acme", "boston")))
+    other.start()
+    other.join(3)
+    assert boston and boston[0] and not results
+    release.set()
+    for thread in waiting:
+        thread.join(5)
+    assert len(results) == 3 and all(results)
+    assert router.loads == 2
+
+
+def test_unloaded_shard_forgets_its_ids(shard_dir, day, guest):
+    router = ShardedReservationTools(shard_dir, max_loaded=1, storage_backend="sqlite")
+    restaurant_id = router.search_restaurants("acme", "austin")[0]["id"]
+    booked = router.create_reservation(restaurant_id, party_size=2, date=day(2), time="19:00", **guest())
+    assert booked["success"], booked
+    assert router._owners[booked["reservation_id"]] == "acme/austin"
+
+    router.search_restaurants("acme", "boston")
+    assert router.loaded_shards() == ["acme/boston"]
+    assert not any(key == "acme/austin" for key in router._owners.values())
+    # The reservation is still found, through the unloaded shard's storage
+    assert router.cancel_reservation(booked["reservation_id"])["success"]
+    router.close()
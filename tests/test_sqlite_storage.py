@@ -0,0 +1,22 @@
+import threading
+
+from storage import SQLiteBackend
+
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    storage = SQLiteBackend(str(tmp_path / "goodfoods.db"))
+    for _ in range(3):
+        workers = [threading.Thread(target=storage.get_reservation, args=("RES_NONE",)) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    storage.get_reservation("RES_NONE")
+    # Only the main thread and the last batch of workers connected since the last prune
+    assert len(storage._connections) <= 9
+    last = threading.Thread(target=storage.get_reservation, args=("RES_NONE",))
+    last.start()
+    last.join()
+    assert set(storage._connections) <= {threading.main_thread(), last}
+    storage.close()
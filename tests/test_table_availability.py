@@ -0,0 +1,44 @@
+from models.restaurant import Table
+
+
+def _two_tops_only_at_seven(make_tools, restaurants, day, guest, **options):
+    # One four-top and eight two-tops; once the four-top is taken at 19:00 a party
+    # of four no longer fits then, although 16 seats are still free
+    tables = [Table(id="t4", seats=4)] + [Table(id=f"t2-{n}", seats=2) for n in range(8)]
+    restaurant = restaurants[0].model_copy(update={"tables": tables, "capacity": 20})
+    tools = make_tools(restaurants=[restaurant] + [r.model_copy(deep=True) for r in restaurants[1:]], **options)
+    booked = tools.create_reservation(restaurant.id, party_size=4, date=day(2), time="19:00", **guest())
+    assert booked["success"], booked
+    assert not tools.check_availability(restaurant.id, day(2), "19:00", 4)["available"]
+    return tools, restaurant
+
+
+def test_find_next_available_only_offers_seatable_slots(make_tools, restaurants, day, guest):
+    tools, restaurant = _two_tops_only_at_seven(make_tools, restaurants, day, guest)
+    result = tools.find_next_available([restaurant.id], 4, day(2), "19:00", limit=10, include_similar=False)
+
+    assert result["success"]
+    for alternative in result["alternatives"]:
+        check = tools.check_availability(restaurant.id, alternative["date"], alternative["time"], 4)
+        assert check["available"], alternative
+    assert {"date": day(2), "time": "19:00"} not in [
+        {"date": a["date"], "time": a["time"]} for a in result["alternatives"]]
+
+
+def test_availability_matrix_only_lists_seatable_slots(make_tools, restaurants, day, guest):
+    tools, restaurant = _two_tops_only_at_seven(make_tools, restaurants, day, guest)
+    result = tools.check_availability_matrix(4, day(2), ["18:00-21:00"], restaurant_ids=[restaurant.id])
+
+    row = result["restaurants"][0]
+    assert f"{day(2)} 19:00" not in row["available_slots"]
+    for label in row["available_slots"]:
+        date, time = label.split()
+        assert tools.check_availability(restaurant.id, date, time, 4)["available"], label
+
+
+def test_search_by_slot_skips_restaurants_without_a_fitting_table(make_tools, restaurants, day, guest):
+    for columnar in (False, True):
+        tools, restaurant = _two_tops_only_at_seven(make_tools, restaurants, day, guest, columnar=columnar)
+        results = tools.search_restaurants(cuisine=restaurant.cuisine.value, location=restaurant.location,
+                                           party_size=4, date=day(2), time="19:00")
+        assert restaurant.id not in [r["id"] for r in results]
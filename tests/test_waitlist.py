@@ -0,0 +1,60 @@
+def _fill_slot(tools, restaurant, date, time, guest):
+    """Book parties of two at a slot until it is full; returns their reservation ids"""
+    booked = []
+    while True:
+        result = tools.create_reservation(restaurant.id, party_size=2, date=date, time=time,
+                                          **guest(len(booked)))
+        if not result["success"]:
+            return booked
+        booked.append(result["reservation_id"])
+
+
+def test_cancellation_books_the_first_waiting_party(make_tools, day, guest):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    booked = _fill_slot(tools, restaurant, day(2), "19:00", guest)
+    assert booked
+
+    first = tools.join_waitlist(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(100))
+    second = tools.join_waitlist(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(101))
+    assert first["success"] and second["position"] == 2
+
+    result = tools.cancel_reservation(booked[0])
+    assert result["success"] and result["promoted_from_waitlist"] == 1
+
+    status = tools.get_waitlist_status(first["waitlist_id"])
+    assert status["waitlist"]["status"] == "promoted"
+    reservation_id = status["waitlist"]["reservation_id"]
+    details = tools.get_reservation_details(reservation_id)
+    assert details["found"], details
+    assert tools.get_waitlist_status(second["waitlist_id"])["position"] == 1
+    # The freed seats went to the waiting party, so the slot is full again
+    assert not tools.create_reservation(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(102))["success"]
+
+
+def test_party_that_does_not_fit_keeps_waiting(make_tools, day, guest):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    booked = _fill_slot(tools, restaurant, day(2), "19:00", guest)
+
+    # Joined first, but a cancelled party of two cannot make room for six
+    large = tools.join_waitlist(restaurant.id, party_size=6, date=day(2), time="19:00", **guest(100))
+    small = tools.join_waitlist(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(101))
+    assert large["success"] and small["position"] == 2
+
+    assert tools.cancel_reservation(booked[0])["promoted_from_waitlist"] == 1
+    assert tools.get_waitlist_status(small["waitlist_id"])["waitlist"]["status"] == "promoted"
+    assert tools.get_waitlist_status(large["waitlist_id"])["position"] == 1
+
+
+def test_parties_that_left_are_not_promoted(make_tools, day, guest):
+    tools = make_tools()
+    restaurant = tools.restaurants[0]
+    booked = _fill_slot(tools, restaurant, day(2), "19:00", guest)
+
+    waiting = tools.join_waitlist(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(100))
+    assert tools.leave_waitlist(waiting["waitlist_id"])["success"]
+
+    assert tools.cancel_reservation(booked[0])["promoted_from_waitlist"] == 0
+    assert tools.get_waitlist_status(waiting["waitlist_id"])["waitlist"]["status"] == "left"
+    assert tools.create_reservation(restaurant.id, party_size=2, date=day(2), time="19:00", **guest(102))["success"]
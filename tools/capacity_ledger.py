@@ -0,0 +1,250 @@
+from typing import List, Dict, Optional, Callable, Set, Sequence
+from datetime import date as Date, time as Time
+import math
+import threading
+import numpy as np
+
+
+class CapacityLedger:
+    """
+    Seats booked per restaurant, per day and per time slot.
+
+    Bookings live in one ``(restaurant, day, slot)`` int16 array covering a
+    rolling window that starts today. A booking occupies every slot of its
+    dining duration, so checking or booking a table touches a handful of
+    cells regardless of how many reservations exist. Slots past midnight are
+    clipped to the booking's own day. When the date changes the window is
+    shifted and the new last day starts empty.
+
+    A per-day summary keeps, for each restaurant and day, the smallest peak
+    occupancy over any booking span that starts while the restaurant is open.
+    Capacity minus that value is the largest party the day could still take,
+    so whole days can be ruled out without looking at individual slots.
+
+    Writes and the daily window shift hold an internal lock, so a booking can
+    never land on the wrong day while the window moves. The lock only covers
+    these few array operations; callers that need a larger atomic step (such
+    as ReservationEngine) hold their own per-restaurant locks around them.
+    """
+
+    _INITIAL_ROWS = 64
+    # Summary value of a restaurant that cannot take any booking (never open)
+    _NO_SEATS = np.iinfo(np.int16).max
+
+    def __init__(self,
+                 days: int = 31,
+                 slot_minutes: int = 30,
+                 duration_minutes: int = 120,
+                 clock: Callable[[], Date] = Date.today):
+        self.days = days
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = 24 * 60 // slot_minutes
+        self.slots_per_booking = max(1, math.ceil(duration_minutes / slot_minutes))
+        self.clock = clock
+        self.origin = clock()
+        self._lock = threading.RLock()
+
+        self._row_by_id: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self.capacity = np.zeros(self._INITIAL_ROWS, dtype=np.int32)
+        self.booked = np.zeros((self._INITIAL_ROWS, days, self.slots_per_day), dtype=np.int16)
+        self.min_peak = np.zeros((self._INITIAL_ROWS, days), dtype=np.int16)
+        # Start slots at which each restaurant takes bookings
+        self.open = np.ones((self._INITIAL_ROWS, self.slots_per_day), dtype=bool)
+        self._slot_starts = np.arange(self.slots_per_day) * slot_minutes
+
+    def __contains__(self, restaurant_id: str) -> bool:
+        return restaurant_id in self._row_by_id
+
+    def register(self, restaurant_id: str, capacity: int,
+                 opening: Optional[Time] = None, closing: Optional[Time] = None) -> None:
+        """
+        Track a restaurant that takes bookings starting between ``opening`` and
+        ``closing`` (all day when omitted); re-registering updates its capacity
+        and hours and keeps its bookings
+        """
+        with self._lock:
+            row = self._row_by_id.get(restaurant_id)
+            known = row is not None
+            if not known:
+                row = len(self._ids)
+                if row == len(self.capacity):
+                    self._grow(row * 2)
+                self._ids.append(restaurant_id)
+                self._row_by_id[restaurant_id] = row
+            self.capacity[row] = capacity
+            first = opening.hour * 60 + opening.minute if opening is not None else 0
+            last = closing.hour * 60 + closing.minute if closing is not None else 24 * 60
+            self.open[row] = (self._slot_starts >= first) & (self._slot_starts <= last)
+            if known:
+                self.min_peak[row] = self._open_min(self._window_peak(self.booked[row]), self.open[row])
+            else:
+                self.min_peak[row] = 0 if self.open[row].any() else self._NO_SEATS
+
+    def unregister(self, restaurant_id: str) -> None:
+        with self._lock:
+            row = self._row_by_id.pop(restaurant_id, None)
+            if row is not None:
+                self._ids[row] = None
+                self.capacity[row] = 0
+                self.booked[row] = 0
+                self.min_peak[row] = 0
+                self.open[row] = True
+
+    def day_index(self, day: Date) -> Optional[int]:
+        """Position of ``day`` in the window, or None when it is outside it"""
+        self._advance()
+        index = (day - self.origin).days
+        return index if 0 <= index < self.days else None
+
+    def slot_index(self, at: Time) -> int:
+        return (at.hour * 60 + at.minute) // self.slot_minutes
+
+    def seats_free(self, restaurant_id: str, day: Date, at: Time) -> int:
+        """Seats that can still be booked for the whole dining duration starting at ``at``"""
+        row = self._row_by_id.get(restaurant_id)
+        day_index = self.day_index(day)
+        if row is None or day_index is None:
+            return 0
+        start, end = self._span(at)
+        booked = int(self.booked[row, day_index, start:end].max())
+        return max(0, int(self.capacity[row]) - booked)
+
+    def book(self, restaurant_id: str, day: Date, at: Time, seats: int) -> bool:
+        """Reserve seats if they are free for the whole duration. Returns False otherwise."""
+        with self._lock:
+            if self.seats_free(restaurant_id, day, at) < seats:
+                return False
+            row, day_index = self._row_by_id[restaurant_id], self.day_index(day)
+            start, end = self._span(at)
+            self.booked[row, day_index, start:end] += seats
+            self._summarize(row, day_index)
+            return True
+
+    def release(self, restaurant_id: str, day: Date, at: Time, seats: int) -> None:
+        """Give seats back; bookings on days that already left the window are ignored"""
+        with self._lock:
+            row = self._row_by_id.get(restaurant_id)
+            day_index = self.day_index(day)
+            if row is None or day_index is None:
+                return
+            start, end = self._span(at)
+            cells = self.booked[row, day_index, start:end]
+            np.maximum(cells - seats, 0, out=cells)
+            self._summarize(row, day_index)
+
+    def rows_of(self, restaurant_ids: Sequence[str]) -> np.ndarray:
+        """Ledger row of each restaurant, -1 for restaurants that are not tracked"""
+        return np.array([self._row_by_id.get(rid, -1) for rid in restaurant_ids], dtype=np.intp)
+
+    def load(self, rows: np.ndarray, day_indices: np.ndarray, slot_indices: np.ndarray, seats: np.ndarray) -> None:
+        """
+        Add many bookings at once, given as parallel arrays of ledger rows (see
+        rows_of), day indices and start slots. Capacity is not checked: this is
+        for restoring or generating bookings that are already known to fit.
+        """
+        seats = np.asarray(seats, dtype=self.booked.dtype)
+        with self._lock:
+            for offset in range(self.slots_per_booking):
+                slots = np.asarray(slot_indices) + offset
+                inside = slots < self.slots_per_day
+                np.add.at(self.booked, (rows[inside], day_indices[inside], slots[inside]), seats[inside])
+            touched = np.unique(rows)
+            self.min_peak[touched] = self._open_min(self._window_peak(self.booked[touched]),
+                                                    self.open[touched][:, None, :])
+
+    def restaurants_with_seats(self, day: Date, at: Time, seats: int) -> Set[str]:
+        """Ids of every restaurant with at least ``seats`` free at that date and time"""
+        day_index = self.day_index(day)
+        if day_index is None:
+            return set()
+        n = len(self._ids)
+        start, end = self._span(at)
+        free = self.capacity[:n] - self.booked[:n, day_index, start:end].max(axis=1)
+        return {self._ids[row] for row in np.flatnonzero(free >= seats) if self._ids[row] is not None}
+
+    def free_seats_matrix(self,
+                          restaurant_ids: Sequence[str],
+                          day_indices: Sequence[int],
+                          slot_indices: Sequence[int]) -> np.ndarray:
+        """
+        Free seats for every (restaurant, day, start slot) combination in one pass.
+
+        Returns an int array of shape ``(restaurants, days, slots)``; unknown
+        restaurants get 0 everywhere. Day indices come from ``day_index``.
+        """
+        self._advance()
+        rows = self.rows_of(restaurant_ids)
+        known = rows >= 0
+        booked = self.booked[rows[known]][:, list(day_indices), :]
+        peak = self._window_peak(booked)[:, :, list(slot_indices)]
+
+        free = np.zeros((len(rows), len(day_indices), len(slot_indices)), dtype=np.int32)
+        free[known] = np.maximum(self.capacity[rows[known]][:, None, None] - peak, 0)
+        return free
+
+    def best_free_seats(self, restaurant_ids: Sequence[str], day_index: int) -> np.ndarray:
+        """Largest party each restaurant can still seat at any opening time on that day (0 if unknown)"""
+        self._advance()
+        rows = self.rows_of(restaurant_ids)
+        known = rows >= 0
+        best = np.zeros(len(rows), dtype=np.int32)
+        best[known] = np.maximum(self.capacity[rows[known]] - self.min_peak[rows[known], day_index], 0)
+        return best
+
+    def free_seats_by_slot(self, restaurant_id: str, day_index: int) -> np.ndarray:
+        """Free seats for a booking starting at each slot of the day"""
+        self._advance()
+        row = self._row_by_id.get(restaurant_id)
+        if row is None:
+            return np.zeros(self.slots_per_day, dtype=np.int32)
+        peak = self._window_peak(self.booked[row, day_index])
+        return np.maximum(int(self.capacity[row]) - peak.astype(np.int32), 0)
+
+    def _window_peak(self, booked: np.ndarray) -> np.ndarray:
+        # Max over each booking's span along the slot axis; late slots see a window clipped at midnight
+        peak = booked.copy()
+        for offset in range(1, self.slots_per_booking):
+            np.maximum(peak[..., :-offset], booked[..., offset:], out=peak[..., :-offset])
+        return peak
+
+    def _summarize(self, row: int, day_index: int) -> None:
+        self.min_peak[row, day_index] = self._open_min(self._window_peak(self.booked[row, day_index]), self.open[row])
+
+    def _open_min(self, peak: np.ndarray, open_slots: np.ndarray) -> np.ndarray:
+        # Smallest peak over the slots a booking may start at; closed hours never count as free
+        return np.where(open_slots, peak, self._NO_SEATS).min(axis=-1)
+
+    def _span(self, at: Time):
+        start = self.slot_index(at)
+        return start, min(start + self.slots_per_booking, self.slots_per_day)
+
+    def _advance(self) -> None:
+        today = self.clock()
+        if (today - self.origin).days <= 0:
+            return
+        with self._lock:
+            shift = (today - self.origin).days
+            if shift <= 0:
+                return
+            empty_day = np.where(self.open.any(axis=1), 0, self._NO_SEATS)[:, None]
+            if shift >= self.days:
+                self.booked[:] = 0
+                self.min_peak[:] = empty_day
+            else:
+                self.booked[:, :-shift] = self.booked[:, shift:]
+                self.booked[:, -shift:] = 0
+                self.min_peak[:, :-shift] = self.min_peak[:, shift:]
+                self.min_peak[:, -shift:] = empty_day
+            self.origin = today
+
+    def _grow(self, size: int) -> None:
+        capacity = np.zeros(size, dtype=self.capacity.dtype)
+        capacity[:len(self.capacity)] = self.capacity
+        booked = np.zeros((size, self.days, self.slots_per_day), dtype=self.booked.dtype)
+        booked[:len(self.booked)] = self.booked
+        min_peak = np.zeros((size, self.days), dtype=self.min_peak.dtype)
+        min_peak[:len(self.min_peak)] = self.min_peak
+        open_slots = np.ones((size, self.slots_per_day), dtype=bool)
+        open_slots[:len(self.open)] = self.open
+        self.capacity, self.booked, self.min_peak, self.open = capacity, booked, min_peak, open_slots
@@ -0,0 +1,156 @@
+from typing import List, Dict, Optional, Set, Iterable, Callable
+from collections import defaultdict
+import threading
+from models.restaurant import Restaurant
+
+
+class CatalogIndex:
+    """Inverted index over restaurant attributes used by the search filters.
+
+    Every cuisine, location, price range and special feature maps to a posting
+    set of restaurant ids, so a filtered search intersects a handful of sets
+    instead of scanning the whole catalog once per filter.
+
+    Restaurants can also be listed by an outline of their indexed fields
+    (add_outline); those are built by ``loader`` the first time they are
+    looked up, and every later lookup returns that same object.
+    """
+
+    def __init__(self, restaurants: Iterable[Restaurant] = (),
+                 loader: Optional[Callable[[str], Restaurant]] = None):
+        self.loader = loader
+        # None stands for a listed restaurant that has not been built yet
+        self._restaurants: Dict[str, Optional[Restaurant]] = {}
+        self._load_lock = threading.Lock()
+        self._order: Dict[str, int] = {}
+        self._next_position = 0
+        self._by_cuisine: Dict[str, Set[str]] = defaultdict(set)
+        self._by_location: Dict[str, Set[str]] = defaultdict(set)
+        self._by_price: Dict[str, Set[str]] = defaultdict(set)
+        self._by_feature: Dict[str, Set[str]] = defaultdict(set)
+
+        for restaurant in restaurants:
+            self.add(restaurant)
+
+    def __len__(self) -> int:
+        return len(self._restaurants)
+
+    def __contains__(self, restaurant_id: str) -> bool:
+        return restaurant_id in self._restaurants
+
+    def get(self, restaurant_id: str) -> Optional[Restaurant]:
+        restaurant = self._restaurants.get(restaurant_id)
+        if restaurant is None and restaurant_id in self._restaurants:
+            restaurant = self._load(restaurant_id)
+        return restaurant
+
+    def add(self, restaurant: Restaurant) -> None:
+        """Index a restaurant, replacing any previous entry with the same id"""
+        self._add(restaurant, restaurant)
+
+    def add_outline(self, outline) -> None:
+        """
+        Index a restaurant from an outline with the Restaurant attributes the
+        index reads (id, cuisine_key, location_key, price_range, feature_keys);
+        the restaurant itself is built by the loader on first lookup
+        """
+        self._add(outline, None)
+
+    def remove(self, restaurant_id: str) -> Optional[Restaurant]:
+        """Drop a restaurant from every posting set it appears in"""
+        restaurant = self.get(restaurant_id)
+        if restaurant is None:
+            return None
+        del self._restaurants[restaurant_id]
+
+        del self._order[restaurant_id]
+        for postings, key in self._posting_keys(restaurant):
+            ids = postings.get(key)
+            if ids is not None:
+                ids.discard(restaurant_id)
+                if not ids:
+                    del postings[key]
+        return restaurant
+
+    def lookup(self,
+               cuisine: Optional[str] = None,
+               location: Optional[str] = None,
+               price_range: Optional[str] = None,
+               features: Optional[List[str]] = None) -> List[Restaurant]:
+        """
+        Return restaurants matching every given filter, in catalog order.
+
+        Cuisine and location are case-insensitive substring matches against the
+        indexed values, price range is an exact match and each feature must match
+        one of the restaurant's special features case-insensitively.
+        """
+        matched = self.matching_ids(cuisine, location, price_range, features)
+        if matched is None:
+            return [restaurant if restaurant is not None else self._load(rid)
+                    for rid, restaurant in list(self._restaurants.items())]
+        return [self.get(rid) for rid in sorted(matched, key=self._order.__getitem__)]
+
+    def matching_ids(self,
+                     cuisine: Optional[str] = None,
+                     location: Optional[str] = None,
+                     price_range: Optional[str] = None,
+                     features: Optional[List[str]] = None) -> Optional[Set[str]]:
+        """Ids matching every given filter (see lookup), or None when no filter is given"""
+        candidates: List[Set[str]] = []
+
+        if cuisine:
+            candidates.append(self._match_substring(self._by_cuisine, cuisine.lower()))
+        if location:
+            candidates.append(self._match_substring(self._by_location, location.lower()))
+        if price_range:
+            candidates.append(self._by_price.get(price_range, set()))
+        for feature in features or []:
+            candidates.append(self._by_feature.get(feature.lower(), set()))
+
+        if not candidates:
+            return None
+
+        # Intersect smallest posting set first so the work is bounded by the rarest filter
+        candidates.sort(key=len)
+        matched = set(candidates[0])
+        for postings in candidates[1:]:
+            if not matched:
+                break
+            matched &= postings
+        return matched
+
+    def _add(self, indexed, restaurant: Optional[Restaurant]) -> None:
+        if indexed.id in self._restaurants:
+            self.remove(indexed.id)
+
+        self._restaurants[indexed.id] = restaurant
+        self._order[indexed.id] = self._next_position
+        self._next_position += 1
+
+        for postings, key in self._posting_keys(indexed):
+            postings[key].add(indexed.id)
+
+    def _load(self, restaurant_id: str) -> Optional[Restaurant]:
+        # Built once under the lock, so concurrent first lookups share one object
+        with self._load_lock:
+            restaurant = self._restaurants.get(restaurant_id)
+            if restaurant is None and restaurant_id in self._restaurants:
+                restaurant = self._restaurants[restaurant_id] = self.loader(restaurant_id)
+        return restaurant
+
+    def _posting_keys(self, restaurant: Restaurant):
+        yield self._by_cuisine, restaurant.cuisine_key
+        yield self._by_location, restaurant.location_key
+        yield self._by_price, restaurant.price_range.value
+        for feature in restaurant.feature_keys:
+            yield self._by_feature, feature
+
+    @staticmethod
+    def _match_substring(postings: Dict[str, Set[str]], needle: str) -> Set[str]:
+        # Distinct keys are few (cuisines, neighbourhoods) compared to restaurants
+        exact = postings.get(needle)
+        matched = set(exact) if exact else set()
+        for key, ids in postings.items():
+            if key != needle and needle in key:
+                matched |= ids
+        return matched
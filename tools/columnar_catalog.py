@@ -0,0 +1,261 @@
+from typing import List, Dict, Optional, Iterable, Sequence, Callable
+import numpy as np
+from models.restaurant import Restaurant, CuisineType, PriceRange
+from tools.table_allocator import max_party_size
+
+
+class ColumnarCatalog:
+    """
+    Column-oriented copy of the restaurant catalog backed by NumPy arrays.
+
+    Filters are evaluated as boolean masks over whole columns and the best rows
+    are picked with a partial selection (argpartition) instead of sorting the
+    full catalog. Rows are never moved: removed restaurants are tombstoned so
+    row numbers stay stable for the lifetime of the catalog.
+    """
+
+    _INITIAL_ROWS = 64
+    _FEATURE_WORD_BITS = 64
+
+    def __init__(self, restaurants: Iterable[Restaurant] = (), max_combined_tables: int = 3):
+        self.max_combined_tables = max_combined_tables
+        self.rows: List[Optional[Restaurant]] = []
+        self._row_by_id: Dict[str, int] = {}
+        # Builds the restaurant of a row that was filled from a mapped catalog
+        self._load: Optional[Callable[[int], Optional[Restaurant]]] = None
+
+        self._cuisine_codes: Dict[str, int] = {}
+        self._location_codes: Dict[str, int] = {}
+        self._price_codes: Dict[str, int] = {}
+        self._feature_bits: Dict[str, int] = {}
+
+        size = self._INITIAL_ROWS
+        self.rating = np.zeros(size, dtype=np.float64)
+        self.capacity = np.zeros(size, dtype=np.int32)
+        self.current_reservations = np.zeros(size, dtype=np.int32)
+        self.max_party = np.zeros(size, dtype=np.int32)
+        self.cuisine = np.zeros(size, dtype=np.int32)
+        self.location = np.zeros(size, dtype=np.int32)
+        self.price = np.zeros(size, dtype=np.int32)
+        self.features = np.zeros((size, 1), dtype=np.uint64)
+        self.alive = np.zeros(size, dtype=bool)
+
+        for restaurant in restaurants:
+            self.add(restaurant)
+
+    @classmethod
+    def from_view(cls, view, load: Optional[Callable[[int], Optional[Restaurant]]] = None) -> "ColumnarCatalog":
+        """
+        Columnar catalog over a MappedCatalog (data/catalog_file.py). The numeric
+        columns are copied from the mapped records in one pass and restaurants
+        are built only when a row is returned: by ``load(row)`` when given (so
+        an owner that also hands out the restaurants can share its objects),
+        from the file otherwise.
+        """
+        catalog = cls(max_combined_tables=view.max_combined_tables)
+        n = len(view)
+        catalog._grow(max(cls._INITIAL_ROWS, n))
+        for name in ("rating", "capacity", "current_reservations", "max_party", "cuisine", "location", "price"):
+            getattr(catalog, name)[:n] = view.records[name]
+        catalog.features = np.zeros((len(catalog.alive), view.feature_words), dtype=np.uint64)
+        catalog.features[:n] = view.records["features"]
+        catalog.alive[:n] = True
+        catalog.rows = [None] * n
+        catalog._row_by_id = {restaurant_id: row for row, restaurant_id in enumerate(view.ids())}
+        catalog._cuisine_codes = {cuisine.value.lower(): code for code, cuisine in enumerate(CuisineType)}
+        catalog._price_codes = {price.value: code for code, price in enumerate(PriceRange)}
+        catalog._location_codes = {location: code for code, location in enumerate(view.locations)}
+        catalog._feature_bits = {feature: bit for bit, feature in enumerate(view.features)}
+        catalog._load = load or view.__getitem__
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    @property
+    def available_tables(self) -> np.ndarray:
+        n = len(self.rows)
+        return np.maximum(0, self.capacity[:n] - self.current_reservations[:n])
+
+    def add(self, restaurant: Restaurant) -> None:
+        """Append a restaurant as a new row, tombstoning any row with the same id"""
+        self.remove(restaurant.id)
+
+        row = len(self.rows)
+        if row == len(self.alive):
+            self._grow(row * 2)
+        self.rows.append(restaurant)
+        self._row_by_id[restaurant.id] = row
+
+        self.rating[row] = restaurant.rating
+        self.capacity[row] = restaurant.capacity
+        self.current_reservations[row] = restaurant.current_reservations
+        self.max_party[row] = max_party_size(restaurant, self.max_combined_tables)
+        self.cuisine[row] = self._encode(self._cuisine_codes, restaurant.cuisine_key)
+        self.location[row] = self._encode(self._location_codes, restaurant.location_key)
+        self.price[row] = self._encode(self._price_codes, restaurant.price_range.value)
+        self.features[row] = 0
+        for feature in restaurant.feature_keys:
+            word, bit = divmod(self._feature_bit(feature), self._FEATURE_WORD_BITS)
+            self.features[row, word] |= np.uint64(1 << bit)
+        self.alive[row] = True
+
+    def remove(self, restaurant_id: str) -> Optional[Restaurant]:
+        row = self._row_by_id.pop(restaurant_id, None)
+        if row is None:
+            return None
+        restaurant = self._restaurant(row)
+        self.rows[row] = None
+        self.alive[row] = False
+        return restaurant
+
+    def sync_occupancy(self, restaurant: Restaurant) -> None:
+        """Copy the restaurant's current_reservations counter into its column"""
+        row = self._row_by_id.get(restaurant.id)
+        if row is not None:
+            self.current_reservations[row] = restaurant.current_reservations
+
+    def mask(self,
+             cuisine: Optional[str] = None,
+             location: Optional[str] = None,
+             price_range: Optional[str] = None,
+             features: Optional[Sequence[str]] = None,
+             any_features: Optional[Sequence[str]] = None,
+             min_available: Optional[int] = None,
+             min_party: Optional[int] = None,
+             min_capacity: Optional[int] = None,
+             max_capacity: Optional[int] = None) -> np.ndarray:
+        """
+        Build a boolean row mask for the given predicates.
+
+        Cuisine and location are case-insensitive substring matches, price range
+        is exact, every entry of ``features`` must be present and at least one of
+        ``any_features`` must be present (both compared case-insensitively). ``min_party``
+        keeps restaurants whose table inventory can seat a party that large.
+        """
+        n = len(self.rows)
+        result = self.alive[:n].copy()
+
+        if cuisine:
+            result &= np.isin(self.cuisine[:n], self._matching_codes(self._cuisine_codes, cuisine.lower()))
+        if location:
+            result &= np.isin(self.location[:n], self._matching_codes(self._location_codes, location.lower()))
+        if price_range:
+            code = self._price_codes.get(price_range)
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            result &= self.price[:n] == code
+        for feature in features or []:
+            bit = self._feature_bits.get(feature.lower())
+            if bit is None:
+                return np.zeros(n, dtype=bool)
+            result &= self._has_feature_bits(n, [bit])
+        if any_features:
+            bits = [self._feature_bits[f.lower()] for f in any_features if f.lower() in self._feature_bits]
+            result &= self._has_feature_bits(n, bits)
+        if min_available is not None:
+            result &= self.available_tables >= min_available
+        if min_party is not None:
+            result &= self.max_party[:n] >= min_party
+        if min_capacity is not None:
+            result &= self.capacity[:n] >= min_capacity
+        if max_capacity is not None:
+            result &= self.capacity[:n] <= max_capacity
+        return result
+
+    def rows_mask(self, restaurant_ids: Iterable[str]) -> np.ndarray:
+        """Boolean column that is True on the rows of the given restaurants"""
+        result = np.zeros(len(self.rows), dtype=bool)
+        rows = [self._row_by_id[rid] for rid in restaurant_ids if rid in self._row_by_id]
+        result[rows] = True
+        return result
+
+    def values_column(self, values: Dict[str, float]) -> np.ndarray:
+        """Float column holding ``values[restaurant_id]`` on each row and 0.0 elsewhere"""
+        result = np.zeros(len(self.rows), dtype=np.float64)
+        for restaurant_id, value in values.items():
+            row = self._row_by_id.get(restaurant_id)
+            if row is not None:
+                result[row] = value
+        return result
+
+    def has_any_feature(self, features: Sequence[str]) -> np.ndarray:
+        """Boolean column: row has at least one of the features (case-insensitive)"""
+        n = len(self.rows)
+        bits = [self._feature_bits[f.lower()] for f in features if f.lower() in self._feature_bits]
+        return self._has_feature_bits(n, bits)
+
+    def top_k(self,
+              mask: np.ndarray,
+              k: int,
+              primary: Optional[np.ndarray] = None,
+              secondary: Optional[np.ndarray] = None) -> List[int]:
+        """
+        Row numbers of the best ``k`` masked rows, ordered like a stable descending
+        sort on ``(primary, secondary)``; ``primary`` defaults to the rating column.
+
+        Only rows tied with or above the k-th best primary value are fully ordered.
+        """
+        n = len(self.rows)
+        if primary is None:
+            primary = self.rating[:n]
+        candidates = np.flatnonzero(mask[:n])
+        if len(candidates) > k > 0:
+            values = primary[candidates]
+            kth = np.partition(values, len(values) - k)[len(values) - k]
+            candidates = candidates[values >= kth]
+
+        keys = [candidates]
+        if secondary is not None:
+            keys.append(-secondary[candidates])
+        keys.append(-primary[candidates])
+        order = np.lexsort(keys)
+        return candidates[order][:k].tolist()
+
+    def restaurants_at(self, rows: Iterable[int]) -> List[Restaurant]:
+        return [self._restaurant(row) for row in rows]
+
+    def _restaurant(self, row: int) -> Optional[Restaurant]:
+        # Rows of a mapped catalog are built on first use
+        restaurant = self.rows[row]
+        if restaurant is None and self.alive[row] and self._load is not None:
+            restaurant = self.rows[row] = self._load(row)
+        return restaurant
+
+    def _has_feature_bits(self, n: int, bits: List[int]) -> np.ndarray:
+        if not bits:
+            return np.zeros(n, dtype=bool)
+        words = np.zeros(self.features.shape[1], dtype=np.uint64)
+        for bit in bits:
+            word, offset = divmod(bit, self._FEATURE_WORD_BITS)
+            words[word] |= np.uint64(1 << offset)
+        return ((self.features[:n] & words) != 0).any(axis=1)
+
+    def _feature_bit(self, feature: str) -> int:
+        bit = self._feature_bits.get(feature)
+        if bit is None:
+            bit = len(self._feature_bits)
+            self._feature_bits[feature] = bit
+            words_needed = bit // self._FEATURE_WORD_BITS + 1
+            if words_needed > self.features.shape[1]:
+                extra = np.zeros((len(self.features), words_needed - self.features.shape[1]), dtype=np.uint64)
+                self.features = np.hstack([self.features, extra])
+        return bit
+
+    def _grow(self, size: int) -> None:
+        for name in ("rating", "capacity", "current_reservations", "max_party", "cuisine", "location", "price", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+        features = np.zeros((size, self.features.shape[1]), dtype=np.uint64)
+        features[:len(self.features)] = self.features
+        self.features = features
+
+    @staticmethod
+    def _encode(codes: Dict[str, int], value: str) -> int:
+        return codes.setdefault(value, len(codes))
+
+    @staticmethod
+    def _matching_codes(codes: Dict[str, int], needle: str) -> List[int]:
+        return [code for value, code in codes.items() if needle in value]
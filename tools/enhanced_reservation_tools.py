@@ -1,17 +1,218 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, time, timedelta
+from itertools import islice
 import uuid
-import re
-from models.restaurant import Restaurant, Reservation, CuisineType, PriceRange
+import json
+import numpy as np
+from models.restaurant import Restaurant, Reservation, WaitlistEntry, CuisineType, PriceRange, feature_mask
 from data.sample_restaurants import generate_sample_restaurants
+from data.catalog_file import MappedCatalog
 from tools.tool_registry import tool_registry
+from tools.catalog_index import CatalogIndex
+from tools.columnar_catalog import ColumnarCatalog
+from tools.query_cache import QueryResultCache
+from tools.restaurant_payloads import RestaurantPayloadCache
+from tools.name_index import RestaurantNameIndex
+from tools.restaurant_list import RestaurantList
+from tools.spatial_index import SpatialIndex
+from tools.text_index import TextIndex
+from tools.capacity_ledger import CapacityLedger
+from tools.reservation_engine import ReservationEngine
+from tools.reservation_store import ReservationStore, normalize_email, normalize_phone
+from tools.table_allocator import TableAllocator, max_party_size
+from tools.waitlist import Waitlist
+from tools.idempotency import IdempotencyStore
+from storage import StorageBackend, create_backend
+from utils.validation import BOOKING_FIELDS, parse_date, parse_time, validate_booking, validate_bookings
+from config import config
+
+# (occasion keywords, features of which a restaurant needs at least one)
+OCCASION_FILTERS = [
+    (["romantic", "date", "anniversary"], ["romantic", "candlelit", "fine dining"]),
+    (["business", "meeting"], ["business lunch", "private dining", "power outlets"]),
+    (["family", "kids"], ["family friendly", "kids menu", "play area"]),
+]
+
+# Score bonus earned by the restaurant that best matches free-text preferences
+PREFERENCE_WEIGHT = 1.0
+
+# (occasion keyword, matching features, score bonus)
+OCCASION_BONUSES = [
+    ("romantic", ["romantic", "candlelit"], 1.0),
+    ("business", ["business lunch", "private dining"], 0.8),
+    ("family", ["family friendly", "kids menu"], 0.8),
+]
+
+# The same rules as feature masks, for testing against Restaurant.feature_mask
+_OCCASION_FILTER_MASKS = [(keywords, feature_mask(features)) for keywords, features in OCCASION_FILTERS]
+_OCCASION_BONUS_MASKS = [(keyword, feature_mask(features), bonus) for keyword, features, bonus in OCCASION_BONUSES]
+
+# (occasion keyword, matching features, reason given)
+OCCASION_REASONS = [
+    ("romantic", ["romantic", "candlelit"], "perfect for romantic occasions"),
+    ("business", ["business lunch", "private dining"], "ideal for business meetings"),
+    ("family", ["family friendly", "kids menu"], "great for families"),
+]
+_OCCASION_REASON_MASKS = [(keyword, feature_mask(features), reason) for keyword, features, reason in OCCASION_REASONS]
 
 class EnhancedReservationTools:
-    def __init__(self):
-        self.restaurants = generate_sample_restaurants(75)
-        self.reservations: List[Reservation] = []
+    def __init__(self,
+                 restaurants: Optional[List[Restaurant]] = None,
+                 columnar: Optional[bool] = None,
+                 storage: Optional[StorageBackend] = None,
+                 catalog_path: Optional[str] = None):
+        if storage is None:
+            storage = create_backend(config.STORAGE_BACKEND)
+        self.storage = storage
+        if catalog_path is None:
+            catalog_path = config.CATALOG_PATH
+        # A stored catalog wins over the catalog file or generated sample; explicit restaurants are stored
+        stored = storage.load_restaurants() if storage is not None and restaurants is None else []
+        view = None
+        if stored:
+            restaurants = stored
+        elif restaurants is None and catalog_path and storage is None:
+            # Without a backend to copy it into, the file is indexed from its records
+            # and restaurants are built on first use
+            view = MappedCatalog(catalog_path)
+        else:
+            if restaurants is None and catalog_path:
+                restaurants = list(MappedCatalog(catalog_path))
+            elif restaurants is None:
+                restaurants = generate_sample_restaurants(config.SAMPLE_RESTAURANT_COUNT)
+            if storage is not None:
+                storage.save_restaurants(restaurants)
+        if columnar is None:
+            columnar = config.USE_COLUMNAR_CATALOG
+        self._view = view
+        # Restaurants, or outlines of the mapped ones carrying the fields the indexes read
+        entries = list(view.outlines()) if view is not None else list(restaurants)
+        self.catalog_index = CatalogIndex(loader=self._load_restaurant)
+        for entry in entries:
+            if view is not None:
+                self.catalog_index.add_outline(entry)
+            else:
+                self.catalog_index.add(entry)
+        self.restaurants = RestaurantList(self.catalog_index, [entry.id for entry in entries])
+        self.name_index = RestaurantNameIndex(entries)
+        self.spatial_index = SpatialIndex(entries, cell_km=config.SPATIAL_CELL_KM,
+                                          max_radius_km=config.MAX_SEARCH_RADIUS_KM)
+        self.text_index = TextIndex(entries)
+        self.capacity_ledger = CapacityLedger(
+            days=config.MAX_RESERVATION_DAYS + 1,
+            slot_minutes=config.RESERVATION_SLOT_MINUTES,
+            duration_minutes=config.RESERVATION_DURATION_MINUTES
+        )
+        self.table_allocator = TableAllocator(
+            slot_minutes=config.RESERVATION_SLOT_MINUTES,
+            duration_minutes=config.RESERVATION_DURATION_MINUTES,
+            max_combined=config.MAX_COMBINED_TABLES
+        )
+        for entry in entries:
+            self.capacity_ledger.register(entry.id, entry.capacity, entry.opening_time, entry.closing_time)
+            if view is None:
+                self.table_allocator.register(entry)
+        if not columnar:
+            self.columnar_catalog = None
+        elif view is not None:
+            ids = self.restaurants.ids()
+            self.columnar_catalog = ColumnarCatalog.from_view(view, load=lambda row: self.catalog_index.get(ids[row]))
+        else:
+            self.columnar_catalog = ColumnarCatalog(entries, max_combined_tables=config.MAX_COMBINED_TABLES)
+        self.query_cache = QueryResultCache(config.QUERY_CACHE_SIZE)
+        self.payload_cache = RestaurantPayloadCache()
+        self.reservation_engine = ReservationEngine(self.capacity_ledger, self.table_allocator, self.catalog_index,
+                                                    storage=storage)
+        if storage is not None:
+            self.reservation_engine.restore(storage.load_reservations())
+        self.reservations: ReservationStore = self.reservation_engine.reservations
+        self.waitlist = Waitlist()
+        self.idempotency = IdempotencyStore(ttl_seconds=config.IDEMPOTENCY_TTL_SECONDS)
         self.conversation_context = {}
     
+    def add_restaurant(self, restaurant: Restaurant) -> None:
+        """
+        Add a restaurant to the catalog. An existing restaurant with the same id is
+        replaced, keeping the bookings already recorded for it.
+        """
+        self.add_restaurants([restaurant])
+    
+    def add_restaurants(self, restaurants: List[Restaurant]) -> None:
+        """Add several restaurants (see add_restaurant), storing them and invalidating caches once"""
+        for restaurant in restaurants:
+            self._index_restaurant(restaurant)
+        if self.storage is not None and restaurants:
+            self.storage.save_restaurants(restaurants)
+        self.query_cache.bump_version()
+    
+    def _load_restaurant(self, restaurant_id: str) -> Restaurant:
+        """Build a restaurant of the mapped catalog file on its first lookup; its tables are tracked from then on"""
+        restaurant = self._view.get(restaurant_id)
+        self.table_allocator.register(restaurant)
+        return restaurant
+    
+    def _index_restaurant(self, restaurant: Restaurant) -> None:
+        if restaurant.id in self.catalog_index:
+            self._unindex_restaurant(restaurant.id)
+        self.catalog_index.add(restaurant)
+        self.restaurants.append(restaurant.id)
+        self.name_index.add(restaurant)
+        self.spatial_index.add(restaurant)
+        self.text_index.add(restaurant)
+        self.capacity_ledger.register(restaurant.id, restaurant.capacity,
+                                      restaurant.opening_time, restaurant.closing_time)
+        self.table_allocator.register(restaurant)
+        if self.columnar_catalog is not None:
+            self.columnar_catalog.add(restaurant)
+    
+    def remove_restaurant(self, restaurant_id: str) -> bool:
+        """Remove a restaurant from the catalog. Returns False if it was not listed."""
+        if not self._unindex_restaurant(restaurant_id):
+            return False
+        self.capacity_ledger.unregister(restaurant_id)
+        self.table_allocator.unregister(restaurant_id)
+        if self.storage is not None:
+            self.storage.delete_restaurant(restaurant_id)
+        return True
+    
+    def _unindex_restaurant(self, restaurant_id: str) -> bool:
+        restaurant = self.catalog_index.remove(restaurant_id)
+        if restaurant is None:
+            return False
+        self.restaurants.remove(restaurant_id)
+        self.name_index.remove(restaurant_id)
+        self.spatial_index.remove(restaurant_id)
+        self.text_index.remove(restaurant_id)
+        if self.columnar_catalog is not None:
+            self.columnar_catalog.remove(restaurant_id)
+        self.payload_cache.discard(restaurant_id)
+        self.query_cache.bump_version()
+        return True
+    
+    def _sync_occupancy(self, *restaurants: Restaurant) -> None:
+        """Propagate changed current_reservations counters to derived catalogs and caches"""
+        if self.columnar_catalog is not None:
+            for restaurant in restaurants:
+                self.columnar_catalog.sync_occupancy(restaurant)
+        self.query_cache.bump_version()
+    
+    def resolve_restaurant_name(self, name: str, location: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Resolve a restaurant name to matching catalog entries, best match first"""
+        matches = []
+        for restaurant_id in self.name_index.lookup(name, location):
+            restaurant = self.catalog_index.get(restaurant_id)
+            matches.append({
+                "id": restaurant.id,
+                "name": restaurant.name,
+                "location": restaurant.location,
+                "address": restaurant.address
+            })
+        return matches
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the search result cache"""
+        return self.query_cache.stats()
+    
     @tool_registry.register_tool
     def search_restaurants(self, 
                           cuisine: Optional[str] = None,
@@ -20,10 +221,14 @@ class EnhancedReservationTools:
                           price_range: Optional[str] = None,
                           date: Optional[str] = None,
                           time: Optional[str] = None,
-                          features: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+                          features: Optional[List[str]] = None,
+                          near: Optional[str] = None,
+                          radius_km: Optional[float] = None,
+                          nearest: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Search for restaurants based on multiple criteria including cuisine, location, 
-        party size, price range, date, time, and special features.
+        party size, price range, date, time, and special features. With `near`, only
+        restaurants around that place are returned, closest first.
         
         Args:
             cuisine: Type of cuisine (Italian, Mexican, Chinese, etc.)
@@ -33,50 +238,182 @@ class EnhancedReservationTools:
             date: Reservation date in YYYY-MM-DD format
             time: Reservation time in HH:MM format  
             features: Special features like outdoor seating, romantic, etc.
+            near: Neighborhood name or "latitude,longitude" to search around
+            radius_km: Maximum distance from `near` in kilometers (default 2), greater than 0
+            nearest: Return only this many closest restaurants to `near`
         """
-        filtered_restaurants = self.restaurants.copy()
-        
+        radius_km = self._filter_value(radius_km)
+        if radius_km is not None:
+            try:
+                radius_km = float(radius_km)
+            except (ValueError, TypeError):
+                return {"success": False, "message": "Search radius must be a number of kilometers"}
+            if not radius_km > 0:
+                return {"success": False, "message": "Search radius must be greater than 0 km"}
+        arguments = {"cuisine": self._filter_value(cuisine), "location": self._filter_value(location),
+                     "party_size": party_size, "price_range": self._filter_value(price_range),
+                     "date": date, "time": time, "features": features,
+                     "near": self._filter_value(near), "radius_km": radius_km, "nearest": nearest}
+        key = self.query_cache.make_key("search_restaurants", arguments)
+        results = self.query_cache.get(key)
+        if results is None:
+            results = self._search_restaurants(**arguments)
+            self.query_cache.put(key, results)
+        return results
+    
+    def _search_restaurants(self, cuisine, location, party_size, price_range, date, time, features,
+                            near=None, radius_km=None, nearest=None) -> List[Dict[str, Any]]:
+        """Uncached body of search_restaurants"""
         # Apply filters - only if values are provided and not "null"
-        if cuisine and cuisine.lower() != "null":
-            filtered_restaurants = [r for r in filtered_restaurants 
-                                  if cuisine.lower() in r.cuisine.value.lower()]
-        
-        if location and location.lower() != "null":
-            filtered_restaurants = [r for r in filtered_restaurants 
-                                  if location.lower() in r.location.lower()]
+        cuisine, location = self._filter_value(cuisine), self._filter_value(location)
+        price_range, near = self._filter_value(price_range), self._filter_value(near)
+        if isinstance(features, str):
+            # Handle both list and single string features
+            features = [features]
+        features = [f for f in (features or []) if f and f.lower() != "null"]
         
+        party_size_int = None
         if party_size:
             # Ensure party_size is integer and within valid range
             try:
                 party_size_int = int(party_size)
-                if 1 <= party_size_int <= 20:
-                    filtered_restaurants = [r for r in filtered_restaurants 
-                                          if r.available_tables >= party_size_int]
+                if not 1 <= party_size_int <= 20:
+                    party_size_int = None
             except (ValueError, TypeError):
                 # If party_size is invalid, ignore the filter
-                pass
+                party_size_int = None
         
-        if price_range and price_range != "null":
-            filtered_restaurants = [r for r in filtered_restaurants 
-                                  if r.price_range.value == price_range]
+        # Features match on their words ("rooftop" finds "Rooftop", "bar" finds "Wine Bar")
+        required_ids = self._feature_matches(features)
         
-        if features:
-            # Handle both list and single string features
-            if isinstance(features, str):
-                features = [features]
-            
-            for feature in features:
-                if feature and feature.lower() != "null":
-                    filtered_restaurants = [r for r in filtered_restaurants 
-                                          if any(f.lower() == feature.lower() 
-                                               for f in r.special_features)]
+        # With a date and time, party size is checked against that slot's free seats and
+        # tables; otherwise against the largest party the table inventory can seat
+        slot = self._try_parse_slot(date, time) if party_size_int is not None else None
+        seatable = None
+        if slot is not None:
+            seat_ids = self.capacity_ledger.restaurants_with_seats(*slot, party_size_int)
+            required_ids = seat_ids if required_ids is None else required_ids & seat_ids
+            seatable = self._seatable_at(*slot, party_size_int)
+            party_size_int = None
+        
+        if near:
+            return self._search_nearby(near, radius_km, nearest, party_size_int, required_ids, seatable,
+                                       cuisine=cuisine, location=location, price_range=price_range)
+        
+        if self.columnar_catalog is not None:
+            catalog = self.columnar_catalog
+            mask = catalog.mask(cuisine=cuisine, location=location, price_range=price_range,
+                                min_party=party_size_int)
+            if required_ids is not None:
+                mask &= catalog.rows_mask(required_ids)
+            while True:
+                rows = catalog.top_k(mask, 10, secondary=catalog.available_tables)
+                restaurants = catalog.restaurants_at(rows)
+                # Table checks are too costly for every row: drop misfits from the top and refill
+                misfits = [row for row, r in zip(rows, restaurants) if seatable is not None and not seatable(r)]
+                if not misfits:
+                    return self._format_restaurant_results(restaurants)
+                mask[misfits] = False
+        
+        filtered_restaurants = self.catalog_index.lookup(
+            cuisine=cuisine, location=location, price_range=price_range
+        )
+        
+        if required_ids is not None:
+            filtered_restaurants = [r for r in filtered_restaurants if r.id in required_ids]
+        
+        if party_size_int is not None:
+            filtered_restaurants = [r for r in filtered_restaurants 
+                                  if max_party_size(r, config.MAX_COMBINED_TABLES) >= party_size_int]
         
         # Sort by relevance (rating, then availability)
         filtered_restaurants.sort(key=lambda x: (x.rating, x.available_tables), reverse=True)
+        if seatable is not None:
+            filtered_restaurants = list(islice(filter(seatable, filtered_restaurants), 10))
         
         return self._format_restaurant_results(filtered_restaurants[:10])
 
     
+    def _feature_matches(self, features: List[str]) -> Optional[set]:
+        """Ids of restaurants matching every requested feature, or None when no feature is requested"""
+        matched = None
+        for feature in features:
+            ids = self.text_index.feature_matches(feature)
+            matched = ids if matched is None else matched & ids
+        return matched
+    
+    def _search_nearby(self, near, radius_km, nearest, party_size, required_ids, seatable,
+                       **filters) -> List[Dict[str, Any]]:
+        """Spatial search mode of search_restaurants: nearest first, with distance_km"""
+        origin = self._resolve_point(near)
+        if origin is None:
+            return []
+        
+        matched = self.catalog_index.matching_ids(**filters)
+        if required_ids is not None:
+            matched = required_ids if matched is None else matched & required_ids
+        
+        def accept(restaurant_id: str) -> bool:
+            if matched is not None and restaurant_id not in matched:
+                return False
+            restaurant = self.catalog_index.get(restaurant_id)
+            if seatable is not None and not seatable(restaurant):
+                return False
+            return party_size is None or max_party_size(restaurant, config.MAX_COMBINED_TABLES) >= party_size
+        
+        try:
+            nearest = int(nearest) if nearest else None
+        except (ValueError, TypeError):
+            nearest = None
+        if nearest:
+            hits = self.spatial_index.nearest(*origin, nearest, max_radius_km=radius_km, predicate=accept)
+        else:
+            # Only the closest 10 inside the radius are returned, so expand rings instead of sweeping it
+            radius = radius_km if radius_km is not None else config.DEFAULT_SEARCH_RADIUS_KM
+            hits = self.spatial_index.nearest(*origin, 10, max_radius_km=radius, predicate=accept)
+        
+        results = self._format_restaurant_results([self.catalog_index.get(rid) for _, rid in hits])
+        for result, (distance, _) in zip(results, hits):
+            result["distance_km"] = round(distance, 2)
+        return results
+    
+    def _resolve_point(self, near: str) -> Optional[tuple]:
+        """Turn "lat,lon" or a neighborhood name into coordinates"""
+        parts = near.split(",")
+        if len(parts) == 2:
+            try:
+                return float(parts[0]), float(parts[1])
+            except ValueError:
+                pass
+        return self.spatial_index.area_centroid(near)
+    
+    @staticmethod
+    def _filter_value(value: Optional[str]) -> Optional[str]:
+        """A search filter, or None when it is empty or the model's "null" placeholder (any case)"""
+        if value is None or (isinstance(value, str) and value.strip().lower() in ("", "null")):
+            return None
+        return value
+    
+    @staticmethod
+    def _parse_slot(date: str, time: str) -> tuple:
+        """Parse validated YYYY-MM-DD and HH:MM strings into (date, time)"""
+        return parse_date(date), parse_time(time)
+    
+    def _try_parse_slot(self, date: Optional[str], time: Optional[str]) -> Optional[tuple]:
+        """Like _parse_slot, but None when either value is missing or malformed"""
+        day, at = parse_date(date), parse_time(time)
+        if day is None or at is None:
+            return None
+        return day, at
+    
+    def _table_fits(self, restaurant: Restaurant, day, at, party_size: int) -> bool:
+        """Whether a free table (or combination) can seat the party; restaurants without a layout only count seats"""
+        return not restaurant.tables or self.table_allocator.find(restaurant.id, day, at, party_size) is not None
+    
+    def _seatable_at(self, day, at, party_size: int):
+        """Predicate for _table_fits at one slot"""
+        return lambda restaurant: self._table_fits(restaurant, day, at, party_size)
+    
     @tool_registry.register_tool
     def check_availability(self, restaurant_id: str, date: str, time: str, party_size: int) -> Dict[str, Any]:
         """
@@ -88,39 +425,47 @@ class EnhancedReservationTools:
             time: Reservation time in HH:MM format
             party_size: Number of people in the party
         """
-        restaurant = next((r for r in self.restaurants if r.id == restaurant_id), None)
+        restaurant = self.catalog_index.get(restaurant_id)
         if not restaurant:
             return {"available": False, "message": "Restaurant not found"}
         
         # Validate date and time
-        if not self._validate_date(date):
+        reservation_date = parse_date(date)
+        if reservation_date is None:
             return {"available": False, "message": "Invalid date format. Use YYYY-MM-DD"}
         
-        if not self._validate_time(time):
+        reservation_time = parse_time(time)
+        if reservation_time is None:
             return {"available": False, "message": "Invalid time format. Use HH:MM"}
         
-        # Check capacity
-        if restaurant.available_tables < party_size:
-            return {
-                "available": False, 
-                "message": f"Not enough tables available for {party_size} people. Only {restaurant.available_tables} tables left."
-            }
-        
         # Check restaurant hours
-        reservation_time = datetime.strptime(time, "%H:%M").time()
         if not restaurant.is_open_at(reservation_time):
             return {
                 "available": False,
                 "message": f"Restaurant is closed at {time}. Open from {restaurant.opening_time} to {restaurant.closing_time}"
             }
         
-        # Check if date is too far in future
-        reservation_date = datetime.strptime(date, "%Y-%m-%d")
-        max_date = datetime.now() + timedelta(days=30)
-        if reservation_date > max_date:
+        # Check the date falls inside the booking window
+        if self.capacity_ledger.day_index(reservation_date) is None:
+            if reservation_date < self.capacity_ledger.origin:
+                message = "Reservations cannot be made for past dates"
+            else:
+                message = f"Reservations can only be made up to {config.MAX_RESERVATION_DAYS} days in advance"
+            return {"available": False, "message": message}
+        
+        # Check seats for the requested date and time slot
+        seats_free = self.capacity_ledger.seats_free(restaurant_id, reservation_date, reservation_time)
+        if seats_free < party_size:
+            return {
+                "available": False, 
+                "message": f"Not enough seats available for {party_size} people on {date} at {time}. Only {seats_free} seats left."
+            }
+        
+        # Free seats may be spread over tables that cannot hold the party together
+        if not self._table_fits(restaurant, reservation_date, reservation_time, party_size):
             return {
                 "available": False,
-                "message": "Reservations can only be made up to 30 days in advance"
+                "message": f"No free table can seat {party_size} people on {date} at {time}."
             }
         
         return {
@@ -130,10 +475,243 @@ class EnhancedReservationTools:
             "party_size": party_size,
             "date": date,
             "time": time,
-            "available_tables": restaurant.available_tables,
+            "available_seats": seats_free,
             "message": "Table available! Ready to book your reservation."
         }
     
+    @tool_registry.register_tool
+    def check_availability_matrix(self,
+                                  party_size: int,
+                                  date_from: str,
+                                  times: List[str],
+                                  date_to: Optional[str] = None,
+                                  restaurant_ids: Optional[List[str]] = None,
+                                  cuisine: Optional[str] = None,
+                                  location: Optional[str] = None,
+                                  price_range: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Check availability for many restaurants, dates and times in one call. Use this instead of
+        repeated check_availability calls, e.g. "which of these places can seat 4 on Friday 19:00-21:00".
+        
+        Args:
+            party_size: Number of people in the party
+            date_from: First date to check in YYYY-MM-DD format
+            times: Times in HH:MM format, or a range like "19:00-21:00"
+            date_to: Last date to check in YYYY-MM-DD format (defaults to date_from)
+            restaurant_ids: Restaurants to check; when omitted, restaurants matching the filters below
+            cuisine: Cuisine filter used when restaurant_ids is omitted
+            location: Location filter used when restaurant_ids is omitted
+            price_range: Price range filter used when restaurant_ids is omitted
+        """
+        try:
+            party_size = int(party_size)
+        except (ValueError, TypeError):
+            return {"success": False, "message": "Party size must be a number"}
+        
+        date_to = date_to or date_from
+        first_day, last_day = parse_date(date_from), parse_date(date_to)
+        if first_day is None or last_day is None:
+            return {"success": False, "message": "Invalid date format. Use YYYY-MM-DD"}
+        days = [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+        days = [day for day in days if self.capacity_ledger.day_index(day) is not None]
+        if not days:
+            return {"success": False, "message": f"Dates must be between today and {config.MAX_RESERVATION_DAYS} days ahead"}
+        
+        slot_times = self._expand_times(times)
+        if slot_times is None:
+            return {"success": False, "message": "Invalid time format. Use HH:MM or a range like 19:00-21:00"}
+        
+        if restaurant_ids:
+            if isinstance(restaurant_ids, str):
+                restaurant_ids = [rid.strip() for rid in restaurant_ids.split(",")]
+            restaurants = [r for r in map(self.catalog_index.get, restaurant_ids) if r is not None]
+        else:
+            restaurants = self.catalog_index.lookup(
+                cuisine=self._filter_value(cuisine),
+                location=self._filter_value(location),
+                price_range=self._filter_value(price_range)
+            )
+            restaurants.sort(key=lambda r: r.rating, reverse=True)
+        restaurants = restaurants[:config.MAX_MATRIX_RESTAURANTS]
+        if not restaurants:
+            return {"success": False, "message": "No matching restaurants found"}
+        
+        free = self.capacity_ledger.free_seats_matrix(
+            [r.id for r in restaurants],
+            [self.capacity_ledger.day_index(day) for day in days],
+            [self.capacity_ledger.slot_index(t) for t in slot_times]
+        )
+        # Opening hours do not depend on the date: (restaurants, times) mask broadcast over days
+        open_mask = np.array([[r.is_open_at(t) for t in slot_times] for r in restaurants])
+        free = np.where(open_mask[:, None, :], free, 0)
+        bookable = free >= party_size
+        # Free seats may be spread over tables that cannot hold the party together
+        for i, d, t in zip(*np.nonzero(bookable)):
+            if not self._table_fits(restaurants[i], days[d], slot_times[t], party_size):
+                bookable[i, d, t] = False
+        
+        time_labels = [t.strftime("%H:%M") for t in slot_times]
+        date_labels = [day.isoformat() for day in days]
+        matrix = []
+        for i, restaurant in enumerate(restaurants):
+            matrix.append({
+                "restaurant_id": restaurant.id,
+                "restaurant_name": restaurant.name,
+                "free_seats": {date_labels[d]: free[i, d].tolist() for d in range(len(days))},
+                "available_slots": [f"{date_labels[d]} {time_labels[t]}"
+                                    for d, t in zip(*np.nonzero(bookable[i]))]
+            })
+        
+        available_count = int(bookable.any(axis=(1, 2)).sum())
+        return {
+            "success": True,
+            "party_size": party_size,
+            "dates": date_labels,
+            "times": time_labels,
+            "restaurants": matrix,
+            "message": f"{available_count} of {len(restaurants)} restaurants can seat {party_size} people at one or more of the requested times"
+        }
+    
+    def _expand_times(self, times) -> Optional[List[time]]:
+        """Parse a list of HH:MM times and/or HH:MM-HH:MM ranges (stepped by slot) into times"""
+        if isinstance(times, str):
+            times = times.split(",")
+        parsed = []
+        for entry in times or []:
+            entry = entry.strip()
+            start, _, end = entry.partition("-")
+            first = parse_time(start.strip())
+            last = parse_time(end.strip()) if end else first
+            if first is None or last is None:
+                return None
+            first, last = datetime.combine(datetime.min, first), datetime.combine(datetime.min, last)
+            while first <= last:
+                parsed.append(first.time())
+                first += timedelta(minutes=config.RESERVATION_SLOT_MINUTES)
+        return sorted(set(parsed)) or None
+    
+    @tool_registry.register_tool
+    def find_next_available(self,
+                            restaurant_ids: List[str],
+                            party_size: int,
+                            date: str,
+                            time: str,
+                            limit: int = 5,
+                            include_similar: bool = True) -> Dict[str, Any]:
+        """
+        Find the closest bookable times when the requested slot is not available. Searches
+        outward from the preferred date and time, and across similar restaurants
+        (same cuisine and area) unless include_similar is false.
+        
+        Args:
+            restaurant_ids: Restaurant(s) the customer asked for
+            party_size: Number of people in the party
+            date: Preferred date in YYYY-MM-DD format
+            time: Preferred time in HH:MM format
+            limit: Maximum number of alternatives to return
+            include_similar: Also suggest similar restaurants
+        """
+        try:
+            party_size, limit = int(party_size), max(1, int(limit))
+        except (ValueError, TypeError):
+            return {"success": False, "message": "Party size and limit must be numbers"}
+        preferred_day, preferred_time = parse_date(date), parse_time(time)
+        if preferred_day is None:
+            return {"success": False, "message": "Invalid date format. Use YYYY-MM-DD"}
+        if preferred_time is None:
+            return {"success": False, "message": "Invalid time format. Use HH:MM"}
+        if isinstance(include_similar, str):
+            include_similar = include_similar.lower() != "false"
+        if isinstance(restaurant_ids, str):
+            restaurant_ids = [rid.strip() for rid in restaurant_ids.split(",")]
+        
+        requested = [r for r in map(self.catalog_index.get, restaurant_ids) if r is not None]
+        if not requested:
+            return {"success": False, "message": "Restaurant not found"}
+        candidates = requested + (self._similar_restaurants(requested) if include_similar else [])
+        candidates = candidates[:config.MAX_MATRIX_RESTAURANTS]
+        requested_ids = {r.id for r in requested}
+        
+        ledger = self.capacity_ledger
+        preferred_slot = ledger.slot_index(preferred_time)
+        candidate_ids = [r.id for r in candidates]
+        slot_times = [(datetime.min + timedelta(minutes=slot * ledger.slot_minutes)).time()
+                      for slot in range(ledger.slots_per_day)]
+        open_slots = {}
+        now = datetime.now()
+        
+        hits = []
+        for offset in self._outward_offsets(config.NEXT_AVAILABLE_SEARCH_DAYS):
+            day = preferred_day + timedelta(days=offset)
+            day_index = ledger.day_index(day)
+            if day_index is None:
+                continue
+            # Per-day summary rules out restaurants that cannot take the party at any time that day
+            viable = np.flatnonzero(ledger.best_free_seats(candidate_ids, day_index) >= party_size)
+            day_hits = []
+            for position in viable:
+                restaurant = candidates[position]
+                if restaurant.id not in open_slots:
+                    open_slots[restaurant.id] = np.array([restaurant.is_open_at(t) for t in slot_times])
+                free = ledger.free_seats_by_slot(restaurant.id, day_index)
+                bookable = open_slots[restaurant.id] & (free >= party_size)
+                if day == now.date():
+                    bookable[:ledger.slot_index(now.time()) + 1] = False
+                for slot in np.flatnonzero(bookable):
+                    day_hits.append((abs(int(slot) - preferred_slot), position, int(slot), int(free[slot])))
+            day_hits.sort()
+            for _, position, slot, seats in day_hits:
+                if len(hits) >= limit:
+                    break
+                restaurant = candidates[position]
+                # Only the closest slots are checked against the table layout
+                if not self._table_fits(restaurant, day, slot_times[slot], party_size):
+                    continue
+                hits.append({
+                    "restaurant_id": restaurant.id,
+                    "restaurant_name": restaurant.name,
+                    "location": restaurant.location,
+                    "date": day.isoformat(),
+                    "time": slot_times[slot].strftime("%H:%M"),
+                    "available_seats": seats,
+                    "similar_restaurant": restaurant.id not in requested_ids
+                })
+            if len(hits) >= limit:
+                break
+        
+        return {
+            "success": bool(hits),
+            "party_size": party_size,
+            "alternatives": hits,
+            "message": f"Found {len(hits)} available times near {date} {time}" if hits
+                       else f"No availability for {party_size} people within {config.NEXT_AVAILABLE_SEARCH_DAYS} days of {date}"
+        }
+    
+    def _similar_restaurants(self, restaurants: List[Restaurant]) -> List[Restaurant]:
+        """Same cuisine in the same area first, then same cuisine elsewhere; each by rating"""
+        seen = {r.id for r in restaurants}
+        similar = []
+        for same_area in (True, False):
+            for restaurant in restaurants:
+                matches = self.catalog_index.lookup(
+                    cuisine=restaurant.cuisine.value,
+                    location=restaurant.location if same_area else None
+                )
+                matches.sort(key=lambda r: r.rating, reverse=True)
+                for match in matches:
+                    if match.id not in seen:
+                        seen.add(match.id)
+                        similar.append(match)
+        return similar
+    
+    @staticmethod
+    def _outward_offsets(days: int):
+        """0, 1, -1, 2, -2, ... up to +/- days"""
+        yield 0
+        for offset in range(1, days + 1):
+            yield offset
+            yield -offset
+    
     @tool_registry.register_tool
     def create_reservation(self, 
                           restaurant_id: str,
@@ -143,10 +721,26 @@ class EnhancedReservationTools:
                           party_size: int,
                           date: str,
                           time: str,
-                          special_requests: str = "") -> Dict[str, Any]:
+                          special_requests: str = "",
+                          idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """
         Create a new restaurant reservation with customer details and special requests.
+        Retrying the same booking returns the original confirmation instead of booking twice.
         """
+        # A retry matches on the caller's key (e.g. the tool call id) or on the same
+        # customer booking the same restaurant, slot and party size
+        slot_key = ("create_reservation", restaurant_id, normalize_email(str(customer_email)),
+                    normalize_phone(str(customer_phone)), date, time, str(party_size))
+        return self.idempotency.run(
+            [idempotency_key, slot_key],
+            lambda: self._create_reservation(restaurant_id, customer_name, customer_phone, customer_email,
+                                             party_size, date, time, special_requests),
+            lambda result: result.get("reservation_id") if result.get("success") else None
+        )
+    
+    def _create_reservation(self, restaurant_id, customer_name, customer_phone, customer_email,
+                            party_size, date, time, special_requests) -> Dict[str, Any]:
+        """Uncached body of create_reservation"""
         try:
             # Validate inputs
             validation_result = self._validate_reservation_inputs(
@@ -174,14 +768,13 @@ class EnhancedReservationTools:
                 created_at=datetime.now().isoformat()
             )
 
-            # Update restaurant occupancy
-            restaurant = next((r for r in self.restaurants if r.id == restaurant_id), None)
-            if restaurant:
-                restaurant.current_reservations += 1
-            else:
+            # Book seats, update occupancy and store the reservation atomically
+            restaurant = self.catalog_index.get(restaurant_id)
+            if not restaurant:
                 return {"success": False, "message": "Restaurant not found"}
-
-            self.reservations.append(reservation)
+            if not self.reservation_engine.book(reservation):
+                return {"success": False, "message": "Sorry, that time slot was just booked. Please pick another time."}
+            self._sync_occupancy(restaurant)
 
             return {
                 "success": True,
@@ -193,12 +786,124 @@ class EnhancedReservationTools:
                 "date": date,
                 "time": time,
                 "special_requests": special_requests,
+                "table_ids": reservation.table_ids,
                 "message": f"🎉 Reservation confirmed! Your confirmation number is {reservation.id}"
             }
             
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @tool_registry.register_tool
+    def create_batch_reservations(self,
+                                  reservations: List[Dict[str, Any]],
+                                  customer_name: Optional[str] = None,
+                                  customer_phone: Optional[str] = None,
+                                  customer_email: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Book several reservations at once (group and event bookings, across restaurants or nights).
+        Either every reservation is booked or none is.
+        
+        Args:
+            reservations: List of {restaurant_id, party_size, date, time, special_requests}; each item may
+                also set customer_name, customer_phone and customer_email
+            customer_name: Contact name used for items that do not set their own
+            customer_phone: Contact phone used for items that do not set their own
+            customer_email: Contact email used for items that do not set their own
+        """
+        if isinstance(reservations, str):
+            try:
+                reservations = json.loads(reservations)
+            except ValueError:
+                return {"success": False, "message": "reservations must be a list of reservation objects"}
+        if not isinstance(reservations, list) or not reservations:
+            return {"success": False, "message": "Please provide at least one reservation"}
+        if len(reservations) > config.MAX_BATCH_RESERVATIONS:
+            return {"success": False, "message": f"At most {config.MAX_BATCH_RESERVATIONS} reservations can be booked at once"}
+        
+        # Validate everything before touching any capacity
+        defaults = {"customer_name": customer_name, "customer_phone": customer_phone, "customer_email": customer_email}
+        items = [{**defaults, **{k: v for k, v in (raw if isinstance(raw, dict) else {}).items() if v not in (None, "null")}}
+                 for raw in reservations]
+        values, errors = validate_bookings(items, required=("restaurant_id",) + BOOKING_FIELDS)
+        slots = []
+        for position, (item, value) in enumerate(zip(items, values)):
+            error, slot = self._validate_batch_item(item, value) if value is not None else (None, None)
+            if error:
+                errors[position] = error
+            slots.append(slot)
+        if errors:
+            return self._batch_failure(items, errors)
+        
+        booked = [Reservation(
+            id=f"RES_{uuid.uuid4().hex[:8].upper()}",
+            restaurant_id=item["restaurant_id"],
+            customer_name=item["customer_name"],
+            customer_phone=item["customer_phone"],
+            customer_email=item["customer_email"],
+            party_size=item["party_size"],
+            reservation_date=item["date"],
+            reservation_time=item["time"],
+            special_requests=item.get("special_requests", ""),
+            created_at=datetime.now().isoformat()
+        ) for item in items]
+        
+        try:
+            failed = self.reservation_engine.book_all(booked, slots)
+        except Exception as e:
+            # The engine rolled back every seat and table it had reserved
+            return {"success": False, "error": str(e),
+                    "message": "No reservations were made because they could not be saved. Please try again."}
+        if failed is not None:
+            item = items[failed]
+            return self._batch_failure(items, {failed: f"Not enough seats or tables for {item['party_size']} people "
+                                                       f"on {item['date']} at {item['time']}"})
+        
+        restaurants = {r.restaurant_id: self.catalog_index.get(r.restaurant_id) for r in booked}
+        self._sync_occupancy(*restaurants.values())
+        return {
+            "success": True,
+            "reservations": [{
+                "success": True,
+                "reservation_id": reservation.id,
+                "restaurant_name": restaurants[reservation.restaurant_id].name,
+                "customer_name": reservation.customer_name,
+                "party_size": reservation.party_size,
+                "date": reservation.reservation_date,
+                "time": reservation.reservation_time,
+                "table_ids": reservation.table_ids
+            } for reservation in booked],
+            "message": f"🎉 All {len(booked)} reservations confirmed!"
+        }
+    
+    def _validate_batch_item(self, item: Dict[str, Any], value: tuple) -> tuple:
+        """
+        (error message or None, (date, time) or None) for one batch item whose
+        details passed validate_bookings: checks its restaurant, hours and date
+        """
+        day, at, _ = value
+        restaurant = self.catalog_index.get(item["restaurant_id"])
+        if not restaurant:
+            return "Restaurant not found", None
+        if not restaurant.is_open_at(at):
+            return f"Restaurant is closed at {item['time']}", None
+        if self.capacity_ledger.day_index(day) is None:
+            return f"Dates must be between today and {config.MAX_RESERVATION_DAYS} days ahead", None
+        return None, (day, at)
+    
+    @staticmethod
+    def _batch_failure(items: List[Dict[str, Any]], errors: Dict[int, str]) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "reservations": [{
+                "success": False,
+                "restaurant_id": item.get("restaurant_id"),
+                "date": item.get("date"),
+                "time": item.get("time"),
+                "message": errors.get(position, "Not booked because another reservation in the batch failed")
+            } for position, item in enumerate(items)],
+            "message": f"No reservations were made: {len(errors)} of {len(items)} could not be booked"
+        }
+    
     @tool_registry.register_tool
     def cancel_reservation(self, reservation_id: str) -> Dict[str, Any]:
         """
@@ -207,24 +912,176 @@ class EnhancedReservationTools:
         Args:
             reservation_id: The unique reservation ID to cancel
         """
-        reservation = next((r for r in self.reservations if r.id == reservation_id), None)
+        # Remove the reservation and release its seats atomically
+        try:
+            reservation = self.reservation_engine.cancel(reservation_id)
+        except Exception as e:
+            # The engine kept the reservation and its seats
+            return {"success": False, "error": str(e),
+                    "message": f"Reservation {reservation_id} could not be cancelled. Please try again."}
         if not reservation:
             return {"success": False, "message": "Reservation not found. Please check your reservation ID."}
+        self.idempotency.invalidate(reservation_id)
         
-        # Update restaurant occupancy
-        restaurant = next((r for r in self.restaurants if r.id == reservation.restaurant_id), None)
+        restaurant = self.catalog_index.get(reservation.restaurant_id)
         if restaurant:
-            restaurant.current_reservations = max(0, restaurant.current_reservations - 1)
+            self._sync_occupancy(restaurant)
         
-        # Remove reservation
-        self.reservations = [r for r in self.reservations if r.id != reservation_id]
+        # Freed seats go to waiting parties before anyone else can take them
+        promoted = self._promote_waitlist(reservation)
         
         return {
             "success": True,
             "cancelled_reservation_id": reservation_id,
+            "promoted_from_waitlist": len(promoted),
             "message": f"Reservation {reservation_id} has been successfully cancelled."
         }
     
+    def _promote_waitlist(self, reservation: Reservation) -> List[WaitlistEntry]:
+        """Book waiting parties whose slot overlaps the seats a cancellation freed, closest slot first"""
+        day, at = self._parse_slot(reservation.reservation_date, reservation.reservation_time)
+        freed_at = at.hour * 60 + at.minute
+        
+        def overlap(waiting_time: str) -> int:
+            waiting = parse_time(waiting_time)
+            return abs(waiting.hour * 60 + waiting.minute - freed_at)
+        
+        promoted = []
+        waiting_times = self.waitlist.waiting_times(reservation.restaurant_id, reservation.reservation_date)
+        for waiting_time in sorted(waiting_times, key=overlap):
+            if overlap(waiting_time) >= config.RESERVATION_DURATION_MINUTES:
+                break
+            slot_time = parse_time(waiting_time)
+            promoted += self.waitlist.promote(
+                reservation.restaurant_id, reservation.reservation_date, waiting_time,
+                seats_free=lambda: self.capacity_ledger.seats_free(reservation.restaurant_id, day, slot_time),
+                book=self._book_waitlist_entry
+            )
+        return promoted
+    
+    def _book_waitlist_entry(self, entry: WaitlistEntry) -> Optional[str]:
+        reservation = Reservation(
+            id=f"RES_{uuid.uuid4().hex[:8].upper()}",
+            restaurant_id=entry.restaurant_id,
+            customer_name=entry.customer_name,
+            customer_phone=entry.customer_phone,
+            customer_email=entry.customer_email,
+            party_size=entry.party_size,
+            reservation_date=entry.reservation_date,
+            reservation_time=entry.reservation_time,
+            special_requests=entry.special_requests,
+            created_at=datetime.now().isoformat()
+        )
+        if not self.reservation_engine.book(reservation):
+            return None
+        self._sync_occupancy(self.catalog_index.get(entry.restaurant_id))
+        return reservation.id
+    
+    @tool_registry.register_tool
+    def join_waitlist(self,
+                      restaurant_id: str,
+                      customer_name: str,
+                      customer_phone: str,
+                      customer_email: str,
+                      party_size: int,
+                      date: str,
+                      time: str,
+                      special_requests: str = "") -> Dict[str, Any]:
+        """
+        Put a party on the waitlist for a fully booked restaurant, date and time. The party is
+        booked automatically if a cancellation frees enough seats.
+        
+        Args:
+            restaurant_id: Unique identifier for the restaurant
+            customer_name: Full name of the customer
+            customer_phone: Contact phone number
+            customer_email: Email address
+            party_size: Number of people in the party
+            date: Reservation date in YYYY-MM-DD format
+            time: Reservation time in HH:MM format
+            special_requests: Any special requests or dietary requirements
+        """
+        try:
+            party_size = int(party_size)
+        except (ValueError, TypeError):
+            return {"success": False, "message": "Party size must be a number"}
+        validation_result = self._validate_reservation_inputs(
+            customer_name, customer_phone, customer_email, party_size, date, time
+        )
+        if not validation_result["valid"]:
+            return {"success": False, "message": validation_result["message"]}
+        
+        restaurant = self.catalog_index.get(restaurant_id)
+        if not restaurant:
+            return {"success": False, "message": "Restaurant not found"}
+        day, at = self._parse_slot(date, time)
+        if not restaurant.is_open_at(at):
+            return {"success": False, "message": f"Restaurant is closed at {time}"}
+        if self.capacity_ledger.day_index(day) is None:
+            return {"success": False, "message": f"Dates must be between today and {config.MAX_RESERVATION_DAYS} days ahead"}
+        if max_party_size(restaurant, config.MAX_COMBINED_TABLES) < party_size:
+            return {"success": False, "message": f"{restaurant.name} cannot seat a party of {party_size}"}
+        
+        entry = WaitlistEntry(
+            id=f"WL_{uuid.uuid4().hex[:8].upper()}",
+            restaurant_id=restaurant_id,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            customer_email=customer_email,
+            party_size=party_size,
+            reservation_date=date,
+            reservation_time=at.strftime("%H:%M"),
+            special_requests=special_requests,
+            created_at=datetime.now().isoformat()
+        )
+        self.waitlist.join(entry)
+        return {
+            "success": True,
+            "waitlist_id": entry.id,
+            "restaurant_name": restaurant.name,
+            "position": self.waitlist.position(entry.id),
+            "message": f"You're on the waitlist for {restaurant.name} on {date} at {time}. Your waitlist ID is {entry.id}"
+        }
+    
+    @tool_registry.register_tool
+    def get_waitlist_status(self, waitlist_id: str) -> Dict[str, Any]:
+        """
+        Check a waitlist entry: its position in line, or the reservation it was booked into.
+        
+        Args:
+            waitlist_id: The waitlist ID returned by join_waitlist
+        """
+        entry = self.waitlist.get(waitlist_id)
+        if not entry:
+            return {"found": False, "message": "Waitlist entry not found"}
+        
+        result = {"found": True, "waitlist": entry.to_dict()}
+        if entry.status == "waiting":
+            result["position"] = self.waitlist.position(waitlist_id)
+            result["message"] = f"Still waiting, number {result['position']} in line"
+        elif entry.status == "promoted":
+            result["message"] = f"A table opened up! Your reservation number is {entry.reservation_id}"
+        else:
+            result["message"] = "This party has left the waitlist"
+        return result
+    
+    @tool_registry.register_tool
+    def leave_waitlist(self, waitlist_id: str) -> Dict[str, Any]:
+        """
+        Remove a party from the waitlist.
+        
+        Args:
+            waitlist_id: The waitlist ID returned by join_waitlist
+        """
+        entry = self.waitlist.leave(waitlist_id)
+        if not entry:
+            return {"success": False, "message": "No waiting party found with that waitlist ID"}
+        return {
+            "success": True,
+            "waitlist_id": waitlist_id,
+            "message": f"Waitlist entry {waitlist_id} has been removed."
+        }
+    
     @tool_registry.register_tool
     def get_reservation_details(self, reservation_id: str) -> Dict[str, Any]:
         """
@@ -233,11 +1090,11 @@ class EnhancedReservationTools:
         Args:
             reservation_id: The unique reservation ID to look up
         """
-        reservation = next((r for r in self.reservations if r.id == reservation_id), None)
+        reservation = self.reservation_engine.get(reservation_id)
         if not reservation:
             return {"found": False, "message": "Reservation not found"}
         
-        restaurant = next((r for r in self.restaurants if r.id == reservation.restaurant_id), None)
+        restaurant = self.catalog_index.get(reservation.restaurant_id)
         
         return {
             "found": True,
@@ -251,6 +1108,43 @@ class EnhancedReservationTools:
             }
         }
     
+    @tool_registry.register_tool
+    def get_customer_reservations(self,
+                                  customer_email: Optional[str] = None,
+                                  customer_phone: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List a customer's active reservations ("show my bookings") by email and/or phone number.
+        
+        Args:
+            customer_email: Email address used when booking
+            customer_phone: Phone number used when booking
+        """
+        customer_email = self._filter_value(customer_email)
+        customer_phone = self._filter_value(customer_phone)
+        if not customer_email and not customer_phone:
+            return {"found": False, "message": "Please provide the email address or phone number used for the booking"}
+        
+        reservations = sorted(
+            self.reservations.for_customer(email=customer_email, phone=customer_phone),
+            key=lambda r: (r.reservation_date, r.reservation_time)
+        )
+        if not reservations:
+            return {"found": False, "message": "No reservations found for those contact details"}
+        
+        bookings = []
+        for reservation in reservations:
+            restaurant = self.catalog_index.get(reservation.restaurant_id)
+            bookings.append({
+                **reservation.to_dict(),
+                "restaurant_name": restaurant.name if restaurant else "Unknown",
+                "restaurant_location": restaurant.location if restaurant else "Unknown"
+            })
+        return {
+            "found": True,
+            "reservations": bookings,
+            "message": f"Found {len(bookings)} reservation(s)"
+        }
+    
     @tool_registry.register_tool
     def get_restaurant_recommendations(self, 
                                      occasion: Optional[str] = None,
@@ -266,24 +1160,66 @@ class EnhancedReservationTools:
             preferences: Any specific preferences or requirements
             budget: Price range preference ($, $$, $$$, $$$$)
         """
-        all_restaurants = self.restaurants.copy()
-        filtered_restaurants = all_restaurants
+        arguments = {"occasion": self._filter_value(occasion), "group_type": self._filter_value(group_type),
+                     "preferences": self._filter_value(preferences), "budget": self._filter_value(budget)}
+        key = self.query_cache.make_key("get_restaurant_recommendations", arguments)
+        results = self.query_cache.get(key)
+        if results is None:
+            results = self._get_restaurant_recommendations(**arguments)
+            self.query_cache.put(key, results)
+        return results
+    
+    def _get_restaurant_recommendations(self, occasion, group_type, preferences, budget) -> List[Dict[str, Any]]:
+        """Uncached body of get_restaurant_recommendations"""
+        preference_scores = self._preference_scores(preferences)
+        if self.columnar_catalog is not None:
+            scored_restaurants = self._columnar_recommendations(occasion, group_type, budget, 8, preference_scores)
+        else:
+            scored_restaurants = self._scan_recommendations(occasion, group_type, preferences, budget, preference_scores)
+        
+        # Format results
+        results = []
+        for restaurant, score in scored_restaurants[:8]:
+            result = {
+                "id": restaurant.id,
+                "name": restaurant.name,
+                "location": restaurant.location,
+                "cuisine": restaurant.cuisine.value,
+                "price_range": restaurant.price_range.value,
+                "rating": restaurant.rating,
+                "available_tables": restaurant.available_tables,
+                "special_features": restaurant.special_features,
+                "match_score": round(score, 2),
+                "recommendation_reason": self._generate_recommendation_reason(
+                    restaurant, occasion, group_type, restaurant.id in preference_scores
+                )
+            }
+            results.append(result)
+        
+        return results
+    
+    def _preference_scores(self, preferences: Optional[str]) -> Dict[str, float]:
+        """BM25 relevance of free-text preferences, scaled so the best match earns PREFERENCE_WEIGHT"""
+        if not preferences or preferences.lower() == "null":
+            return {}
+        scores = self.text_index.scores(preferences)
+        if not scores:
+            return {}
+        best = max(scores.values())
+        return {restaurant_id: PREFERENCE_WEIGHT * score / best for restaurant_id, score in scores.items()}
+    
+    def _scan_recommendations(self, occasion, group_type, preferences, budget, preference_scores) -> List[tuple]:
+        """Filter and score the restaurant list, best (restaurant, score) pairs first"""
+        # Catalog order, so ties rank like the columnar rows
+        filtered_restaurants = self.catalog_index.lookup()
         
         # Filter by occasion
         if occasion:
             occasion_lower = occasion.lower()
-            if any(word in occasion_lower for word in ["romantic", "date", "anniversary"]):
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["romantic", "candlelit", "fine dining"] 
-                                           for feat in r.special_features)]
-            elif any(word in occasion_lower for word in ["business", "meeting"]):
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["business lunch", "private dining", "power outlets"] 
-                                           for feat in r.special_features)]
-            elif any(word in occasion_lower for word in ["family", "kids"]):
-                filtered_restaurants = [r for r in filtered_restaurants 
-                                      if any(feat.lower() in ["family friendly", "kids menu", "play area"] 
-                                           for feat in r.special_features)]
+            for keywords, occasion_mask in _OCCASION_FILTER_MASKS:
+                if any(word in occasion_lower for word in keywords):
+                    filtered_restaurants = [r for r in filtered_restaurants if r.feature_mask & occasion_mask]
+                    break
         
         # Filter by group type
         if group_type:
@@ -301,29 +1237,48 @@ class EnhancedReservationTools:
         scored_restaurants = []
         for restaurant in filtered_restaurants:
             score = self._calculate_recommendation_score(restaurant, occasion, group_type, preferences)
+            score += preference_scores.get(restaurant.id, 0.0)
             scored_restaurants.append((restaurant, score))
         
         # Sort by score
         scored_restaurants.sort(key=lambda x: x[1], reverse=True)
+        return scored_restaurants
+    
+    def _columnar_recommendations(self, occasion, group_type, budget, limit: int, preference_scores) -> List[tuple]:
+        """Same filters and scores as _scan_recommendations, evaluated as column masks"""
+        catalog = self.columnar_catalog
+        occasion_lower = occasion.lower() if occasion else ""
+        group_lower = group_type.lower() if group_type else ""
         
-        # Format results
-        results = []
-        for restaurant, score in scored_restaurants[:8]:
-            result = {
-                "id": restaurant.id,
-                "name": restaurant.name,
-                "location": restaurant.location,
-                "cuisine": restaurant.cuisine.value,
-                "price_range": restaurant.price_range.value,
-                "rating": restaurant.rating,
-                "available_tables": restaurant.available_tables,
-                "special_features": restaurant.special_features,
-                "match_score": round(score, 2),
-                "recommendation_reason": self._generate_recommendation_reason(restaurant, occasion, group_type)
-            }
-            results.append(result)
+        occasion_features = None
+        for keywords, features in OCCASION_FILTERS:
+            if occasion_lower and any(word in occasion_lower for word in keywords):
+                occasion_features = features
+                break
         
-        return results
+        min_capacity = max_capacity = None
+        if any(word in group_lower for word in ["large", "group"]):
+            min_capacity = 50
+        elif any(word in group_lower for word in ["small", "couple"]):
+            max_capacity = 40
+        
+        mask = catalog.mask(price_range=budget or None, any_features=occasion_features,
+                            min_capacity=min_capacity, max_capacity=max_capacity)
+        
+        n = len(catalog.rows)
+        scores = catalog.rating[:n].copy()
+        for keyword, features, bonus in OCCASION_BONUSES:
+            if keyword in occasion_lower:
+                scores += np.where(catalog.has_any_feature(features), bonus, 0.0)
+        if "large" in group_lower:
+            scores += np.where(catalog.capacity[:n] >= 50, 0.5, 0.0)
+        if "small" in group_lower:
+            scores += np.where(catalog.capacity[:n] <= 40, 0.3, 0.0)
+        if preference_scores:
+            scores += catalog.values_column(preference_scores)
+        
+        rows = catalog.top_k(mask, limit, primary=scores)
+        return [(restaurant, float(scores[row])) for row, restaurant in zip(rows, catalog.restaurants_at(rows))]
     
     def _calculate_recommendation_score(self, restaurant, occasion, group_type, preferences) -> float:
         """Calculate relevance score for recommendations"""
@@ -332,12 +1287,9 @@ class EnhancedReservationTools:
         # Occasion bonus
         if occasion:
             occasion_lower = occasion.lower()
-            if "romantic" in occasion_lower and any(feat.lower() in ["romantic", "candlelit"] for feat in restaurant.special_features):
-                score += 1.0
-            if "business" in occasion_lower and any(feat.lower() in ["business lunch", "private dining"] for feat in restaurant.special_features):
-                score += 0.8
-            if "family" in occasion_lower and any(feat.lower() in ["family friendly", "kids menu"] for feat in restaurant.special_features):
-                score += 0.8
+            for keyword, occasion_mask, bonus in _OCCASION_BONUS_MASKS:
+                if keyword in occasion_lower and restaurant.feature_mask & occasion_mask:
+                    score += bonus
         
         # Group type suitability
         if group_type:
@@ -349,7 +1301,7 @@ class EnhancedReservationTools:
         
         return score
     
-    def _generate_recommendation_reason(self, restaurant, occasion, group_type) -> str:
+    def _generate_recommendation_reason(self, restaurant, occasion, group_type, preference_match: bool = False) -> str:
         """Generate personalized recommendation reason"""
         reasons = []
         
@@ -359,82 +1311,28 @@ class EnhancedReservationTools:
             reasons.append("highly rated")
         
         if occasion:
-            if "romantic" in occasion.lower() and any(feat.lower() in ["romantic", "candlelit"] for feat in restaurant.special_features):
-                reasons.append("perfect for romantic occasions")
-            if "business" in occasion.lower() and any(feat.lower() in ["business lunch", "private dining"] for feat in restaurant.special_features):
-                reasons.append("ideal for business meetings")
-            if "family" in occasion.lower() and any(feat.lower() in ["family friendly", "kids menu"] for feat in restaurant.special_features):
-                reasons.append("great for families")
+            occasion_lower = occasion.lower()
+            for keyword, occasion_mask, reason in _OCCASION_REASON_MASKS:
+                if keyword in occasion_lower and restaurant.feature_mask & occasion_mask:
+                    reasons.append(reason)
+        
+        if preference_match:
+            reasons.append("matches your preferences")
         
         if reasons:
             return f"Recommended because: {', '.join(reasons)}"
         return "A wonderful dining option based on your preferences"
     
     def _format_restaurant_results(self, restaurants: List[Restaurant]) -> List[Dict[str, Any]]:
-        """Format restaurant objects for API response"""
-        return [
-            {
-                "id": r.id,
-                "name": r.name,
-                "location": r.location,
-                "cuisine": r.cuisine.value,
-                "price_range": r.price_range.value,
-                "rating": r.rating,
-                "available_tables": r.available_tables,
-                "capacity": r.capacity,
-                "special_features": r.special_features,
-                "contact_phone": r.contact_phone,
-                "address": r.address,
-                "opening_time": r.opening_time.strftime("%H:%M"),
-                "closing_time": r.closing_time.strftime("%H:%M")
-            }
-            for r in restaurants
-        ]
+        """Format restaurant objects for API response (cached static fields plus current availability)"""
+        return self.payload_cache.payloads(restaurants)
     
     def _validate_reservation_inputs(self, name, phone, email, party_size, date, time):
-        """Validate reservation inputs"""
-        if not all([name.strip(), phone.strip(), email.strip()]):
-            return {"valid": False, "message": "Please provide complete customer information"}
-        
-        if party_size <= 0 or party_size > 20:
-            return {"valid": False, "message": "Party size must be between 1 and 20 people"}
-        
-        if not self._validate_email(email):
-            return {"valid": False, "message": "Please provide a valid email address"}
-        
-        if not self._validate_phone(phone):
-            return {"valid": False, "message": "Please provide a valid phone number"}
-        
-        if not self._validate_date(date):
-            return {"valid": False, "message": "Invalid date format. Please use YYYY-MM-DD"}
-        
-        if not self._validate_time(time):
-            return {"valid": False, "message": "Invalid time format. Please use HH:MM"}
-        
+        """Validate reservation inputs (see utils.validation.validate_booking)"""
+        error, _ = validate_booking(name, phone, email, party_size, date, time)
+        if error:
+            return {"valid": False, "message": error}
         return {"valid": True, "message": "All inputs are valid"}
-    
-    def _validate_email(self, email: str) -> bool:
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
-    
-    def _validate_phone(self, phone: str) -> bool:
-        # Basic phone validation
-        cleaned = re.sub(r'[\s\-\(\)]', '', phone)
-        return cleaned.isdigit() and len(cleaned) >= 10
-    
-    def _validate_date(self, date_str: str) -> bool:
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')
-            return True
-        except ValueError:
-            return False
-    
-    def _validate_time(self, time_str: str) -> bool:
-        try:
-            datetime.strptime(time_str, '%H:%M')
-            return True
-        except ValueError:
-            return False
 
 # Global instance
 enhanced_reservation_tools = EnhancedReservationTools()
\ No newline at end of file
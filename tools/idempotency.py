@@ -0,0 +1,105 @@
+from typing import Dict, Any, Optional, Hashable, Sequence, Callable, Tuple, List
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+
+class IdempotencyStore:
+    """
+    Remembers the result of a successful call under one or more keys for a
+    limited time, so a retried call can be answered with the original result.
+
+    Entries expire after ``ttl_seconds`` and the oldest are evicted beyond
+    ``max_entries``. While a call is running its keys are marked in flight:
+    a concurrent retry waits for it and then gets its result instead of
+    running a second time. Failed calls are not remembered.
+    """
+
+    def __init__(self, ttl_seconds: float = 600, max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.replays = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._keys_by_result: Dict[str, List[Hashable]] = {}
+        self._in_flight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def run(self,
+            keys: Sequence[Hashable],
+            call: Callable[[], Dict[str, Any]],
+            result_id: Callable[[Dict[str, Any]], Optional[str]]) -> Dict[str, Any]:
+        """
+        Return the remembered result for any of ``keys``, or run ``call``. A
+        result for which ``result_id`` gives an id is remembered under every
+        key until it expires or ``invalidate(id)`` is called.
+        """
+        keys = [key for key in keys if key is not None]
+        while True:
+            with self._lock:
+                replay = self._lookup(keys)
+                if replay is not None:
+                    self.replays += 1
+                    return copy.deepcopy(replay)
+                waiting = next((self._in_flight[key] for key in keys if key in self._in_flight), None)
+                if waiting is None:
+                    done = threading.Event()
+                    for key in keys:
+                        self._in_flight[key] = done
+                    break
+            waiting.wait()
+
+        try:
+            result = call()
+            identifier = result_id(result)
+            if identifier is not None:
+                with self._lock:
+                    self._remember(keys, identifier, copy.deepcopy(result))
+            return result
+        finally:
+            with self._lock:
+                for key in keys:
+                    self._in_flight.pop(key, None)
+            done.set()
+
+    def invalidate(self, result_id: str) -> None:
+        """Forget every key that points at this result (e.g. a cancelled reservation)"""
+        with self._lock:
+            for key in self._keys_by_result.pop(result_id, []):
+                self._entries.pop(key, None)
+
+    def _lookup(self, keys: Sequence[Hashable]) -> Optional[Dict[str, Any]]:
+        now = self.clock()
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            expires_at, identifier, result = entry
+            if expires_at <= now:
+                self._forget(key)
+                continue
+            return result
+        return None
+
+    def _remember(self, keys: Sequence[Hashable], identifier: str, result: Dict[str, Any]) -> None:
+        expires_at = self.clock() + self.ttl_seconds
+        for key in keys:
+            self._forget(key)
+            self._entries[key] = (expires_at, identifier, result)
+        self._keys_by_result.setdefault(identifier, []).extend(keys)
+        # Entries share one TTL, so insertion order is expiry order
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or next(iter(self._entries.values()))[0] <= self.clock()):
+            self._forget(next(iter(self._entries)))
+
+    def _forget(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_result.get(entry[1])
+        if keys is not None:
+            keys.remove(key)
+            if not keys:
+                del self._keys_by_result[entry[1]]
@@ -0,0 +1,166 @@
+from typing import List, Dict, Optional, Set, Iterable, Tuple
+from collections import defaultdict, Counter
+from itertools import islice
+import bisect
+import re
+import unicodedata
+from models.restaurant import Restaurant
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold a restaurant name and strip accents, punctuation and a leading "the" """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).casefold()
+    name = name.replace("&", " and ").replace("'", "")
+    name = _SPACES.sub(" ", _NON_ALNUM.sub(" ", name)).strip()
+    if name.startswith("the "):
+        name = name[4:]
+    return name
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class RestaurantNameIndex:
+    """
+    Resolves free-form restaurant names to restaurant ids.
+
+    Lookups try, in order: the exact name, the normalized name, names that
+    start with the normalized query and finally trigram similarity. Restaurant
+    names repeat a lot across a chain, so the prefix and trigram structures
+    are built over distinct normalized names rather than over restaurants,
+    and each name keeps its restaurants grouped by location for disambiguation.
+    """
+
+    def __init__(self, restaurants: Iterable[Restaurant] = (), min_similarity: float = 0.5):
+        self.min_similarity = min_similarity
+        self._restaurants: Dict[str, Restaurant] = {}
+        self._exact: Dict[str, str] = {}
+        # Restaurants listed under each raw name, so a raw name is dropped with its last restaurant
+        self._exact_counts: Counter = Counter()
+        # Ordered dicts double as insertion-ordered sets of ids
+        self._ids_by_name: Dict[str, Dict[str, None]] = {}
+        self._ids_by_name_location: Dict[str, Dict[str, Dict[str, None]]] = {}
+        self._sorted_names: List[str] = []
+        self._names_by_trigram: Dict[str, Set[str]] = defaultdict(set)
+
+        for restaurant in restaurants:
+            self.add(restaurant)
+
+    def add(self, restaurant: Restaurant) -> None:
+        if restaurant.id in self._restaurants:
+            self.remove(restaurant.id)
+        self._restaurants[restaurant.id] = restaurant
+
+        normalized = normalize_name(restaurant.name)
+        self._exact[restaurant.name] = normalized
+        self._exact_counts[restaurant.name] += 1
+        if normalized not in self._ids_by_name:
+            self._ids_by_name[normalized] = {}
+            self._ids_by_name_location[normalized] = {}
+            bisect.insort(self._sorted_names, normalized)
+            for trigram in _trigrams(normalized):
+                self._names_by_trigram[trigram].add(normalized)
+        self._ids_by_name[normalized][restaurant.id] = None
+        by_location = self._ids_by_name_location[normalized]
+        by_location.setdefault(restaurant.location_key, {})[restaurant.id] = None
+
+    def remove(self, restaurant_id: str) -> Optional[Restaurant]:
+        restaurant = self._restaurants.pop(restaurant_id, None)
+        if restaurant is None:
+            return None
+
+        normalized = normalize_name(restaurant.name)
+        location = restaurant.location_key
+        by_location = self._ids_by_name_location[normalized]
+        del by_location[location][restaurant_id]
+        if not by_location[location]:
+            del by_location[location]
+
+        ids = self._ids_by_name[normalized]
+        del ids[restaurant_id]
+        if not ids:
+            del self._ids_by_name[normalized]
+            del self._ids_by_name_location[normalized]
+            del self._sorted_names[bisect.bisect_left(self._sorted_names, normalized)]
+            for trigram in _trigrams(normalized):
+                names = self._names_by_trigram[trigram]
+                names.discard(normalized)
+                if not names:
+                    del self._names_by_trigram[trigram]
+        self._exact_counts[restaurant.name] -= 1
+        if not self._exact_counts[restaurant.name]:
+            del self._exact_counts[restaurant.name]
+            del self._exact[restaurant.name]
+        return restaurant
+
+    def lookup(self, name: str, location: Optional[str] = None, limit: int = 5) -> List[str]:
+        """
+        Return up to ``limit`` restaurant ids for a name, best match first.
+
+        When ``location`` is given and some candidates are located there, only
+        those are returned; otherwise the location is ignored.
+        """
+        if not name or not name.strip():
+            return []
+        names = self._match_names(name.strip())
+
+        if location and location.strip():
+            needle = location.strip().lower()
+            local: List[str] = []
+            for matched_name in names:
+                for area, ids in self._ids_by_name_location[matched_name].items():
+                    if needle in area:
+                        local.extend(islice(ids, limit - len(local)))
+                        if len(local) >= limit:
+                            return local
+            if local:
+                return local
+
+        ranked: List[str] = []
+        for matched_name in names:
+            ranked.extend(islice(self._ids_by_name[matched_name], limit - len(ranked)))
+            if len(ranked) >= limit:
+                break
+        return ranked
+
+    def _match_names(self, raw_name: str) -> List[str]:
+        exact = self._exact.get(raw_name)
+        if exact is not None:
+            return [exact]
+
+        query = normalize_name(raw_name)
+        if not query:
+            return []
+        if query in self._ids_by_name:
+            return [query]
+
+        position = bisect.bisect_left(self._sorted_names, query)
+        prefixed = []
+        while position < len(self._sorted_names) and self._sorted_names[position].startswith(query):
+            prefixed.append(self._sorted_names[position])
+            position += 1
+        if prefixed:
+            return sorted(prefixed, key=len)
+
+        return [candidate for candidate, _ in self._similar_names(query)]
+
+    def _similar_names(self, query: str) -> List[Tuple[str, float]]:
+        query_trigrams = _trigrams(query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._names_by_trigram.get(trigram, ()))
+
+        scored = []
+        for candidate, overlap in shared.items():
+            # Dice coefficient over trigram sets
+            score = 2 * overlap / (len(query_trigrams) + len(_trigrams(candidate)))
+            if score >= self.min_similarity:
+                scored.append((candidate, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored
@@ -0,0 +1,86 @@
+from typing import Dict, Any, Optional, Hashable, Tuple
+from collections import OrderedDict
+import threading
+
+
+class QueryResultCache:
+    """
+    LRU cache for the results of read-only search tools.
+
+    Keys are built from normalized tool arguments plus the catalog version.
+    Any mutation that can change availability (bookings, cancellations,
+    catalog edits) bumps the version, which drops every cached result.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, tool_name: str, arguments: Dict[str, Any]) -> Tuple:
+        """Build a cache key that ignores argument case, "null" placeholders and list order"""
+        normalized = []
+        for name, value in sorted(arguments.items()):
+            value = self._normalize(value)
+            if value is not None:
+                normalized.append((name, value))
+        return (self.version, tool_name, tuple(normalized))
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._copy(result)
+
+    def put(self, key: Tuple, result: Any) -> None:
+        with self._lock:
+            if key[0] != self.version:
+                # Computed against a catalog version that has since changed
+                return
+            self._entries[key] = self._copy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump_version(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "version": self.version
+            }
+
+    @classmethod
+    def _normalize(cls, value: Any) -> Optional[Hashable]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.strip().casefold()
+            return None if value in ("", "null") else value
+        if isinstance(value, (list, tuple, set)):
+            items = [cls._normalize(item) for item in value]
+            items = sorted(item for item in items if item is not None)
+            return tuple(items) if items else None
+        return value
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        # Callers get their own list and dicts so they cannot mutate the cached entry
+        if isinstance(result, list):
+            return [item.copy() if isinstance(item, dict) else item for item in result]
+        return result
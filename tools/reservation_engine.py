@@ -0,0 +1,172 @@
+from typing import List, Dict, Optional, Sequence, Union
+from contextlib import ExitStack
+from datetime import datetime
+import threading
+from models.restaurant import Reservation
+from models.records import ReservationRecord
+from tools.capacity_ledger import CapacityLedger
+from tools.catalog_index import CatalogIndex
+from tools.table_allocator import TableAllocator
+from tools.reservation_store import ReservationStore
+from storage.base import StorageBackend
+
+
+class ReservationEngine:
+    """
+    Commit path for bookings and cancellations shared by every session.
+
+    Each restaurant has its own lock, so the table assignment, the ledger
+    write, the occupancy counter and the reservation record change together for
+    that restaurant while bookings at other restaurants proceed independently.
+    The reservation store is only ever modified in place under its own lock, so
+    readers holding a reference to it never see a stale copy. With a storage
+    backend, each change is written through while the restaurant locks are
+    still held; a failed write undoes the in-memory change.
+    """
+
+    def __init__(self, ledger: CapacityLedger, tables: TableAllocator, catalog: CatalogIndex,
+                 storage: Optional[StorageBackend] = None):
+        self.ledger = ledger
+        self.tables = tables
+        self.catalog = catalog
+        self.storage = storage
+        self.reservations = ReservationStore()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._store_lock = threading.Lock()
+
+    def restaurant_lock(self, restaurant_id: str) -> threading.Lock:
+        lock = self._locks.get(restaurant_id)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(restaurant_id, threading.Lock())
+        return lock
+
+    def book(self, reservation: Reservation) -> bool:
+        """
+        Record the reservation if its seats, and tables when the restaurant lists
+        them, are still free. The assigned tables are stored on the reservation.
+        Returns False when the party cannot be seated.
+        """
+        return self.book_all([reservation]) is None
+
+    def book_all(self, reservations: Sequence[Reservation], slots: Optional[Sequence[tuple]] = None) -> Optional[int]:
+        """
+        Book every reservation or none of them. Returns None on success, or the
+        position of the first reservation that could not be seated, in which
+        case everything reserved so far is rolled back. ``slots`` may carry
+        already parsed ``(date, time)`` pairs for the reservations.
+
+        The locks of all restaurants involved are taken in sorted order, so
+        overlapping batches cannot deadlock each other.
+        """
+        restaurants = [self.catalog.get(r.restaurant_id) for r in reservations]
+        if None in restaurants:
+            return restaurants.index(None)
+        if slots is None:
+            slots = [self._slot(r) for r in reservations]
+
+        with ExitStack() as locks:
+            for restaurant_id in sorted({r.id for r in restaurants}):
+                locks.enter_context(self.restaurant_lock(restaurant_id))
+
+            held = []
+            for position, (reservation, restaurant, (day, at)) in enumerate(zip(reservations, restaurants, slots)):
+                table_ids = self._reserve(restaurant.id, day, at, reservation.party_size)
+                if table_ids is None:
+                    self._unreserve(held, slots)
+                    return position
+                held.append((reservation, table_ids))
+
+            for (reservation, table_ids), restaurant in zip(held, restaurants):
+                reservation.table_ids = table_ids
+                restaurant.current_reservations += 1
+            if self.storage is not None:
+                try:
+                    self.storage.save_bookings(reservations, {r.id: r for r in restaurants}.values())
+                except Exception:
+                    for restaurant in restaurants:
+                        restaurant.current_reservations -= 1
+                    self._unreserve(held, slots)
+                    raise
+            with self._store_lock:
+                for reservation in reservations:
+                    self.reservations.add(reservation)
+        return None
+
+    def _reserve(self, restaurant_id: str, day, at, party_size: int) -> Optional[List[str]]:
+        # Tables first (when the restaurant lists them), then seats in the ledger
+        table_ids = []
+        if restaurant_id in self.tables:
+            table_ids = self.tables.assign(restaurant_id, day, at, party_size)
+            if table_ids is None:
+                return None
+        if not self.ledger.book(restaurant_id, day, at, party_size):
+            self.tables.release(restaurant_id, day, at, table_ids)
+            return None
+        return table_ids
+
+    def _unreserve(self, held: List[tuple], slots: Sequence[tuple]) -> None:
+        for (day, at), (reservation, table_ids) in zip(slots, held):
+            self.ledger.release(reservation.restaurant_id, day, at, reservation.party_size)
+            self.tables.release(reservation.restaurant_id, day, at, table_ids)
+
+    def restore(self, reservations: Sequence[Union[Reservation, ReservationRecord]]) -> None:
+        """
+        Load reservations saved by a storage backend. Seats and tables are taken
+        again (tables are picked afresh) for those still inside the booking
+        window; occupancy counters are left alone because the backend stores
+        them already.
+        """
+        for reservation in reservations:
+            # Looked up rather than tested for membership: the lookup builds a mapped restaurant and its tables
+            if self.catalog.get(reservation.restaurant_id) is not None:
+                day, at = self._slot(reservation)
+                if self.ledger.day_index(day) is not None:
+                    table_ids = self._reserve(reservation.restaurant_id, day, at, reservation.party_size)
+                    if table_ids is not None:
+                        reservation.table_ids = table_ids
+            with self._store_lock:
+                self.reservations.add(reservation)
+
+    def cancel(self, reservation_id: str) -> Optional[ReservationRecord]:
+        """
+        Remove a reservation and give its seats back. Returns the cancelled
+        reservation, or None when it does not exist or was already cancelled.
+        Seats and tables are only released once the storage backend has the
+        cancellation; a failed write puts the reservation back and re-raises.
+        """
+        reservation = self.reservations.get(reservation_id)
+        if reservation is None:
+            return None
+
+        restaurant = self.catalog.get(reservation.restaurant_id)
+        day, at = self._slot(reservation)
+        with self.restaurant_lock(reservation.restaurant_id):
+            with self._store_lock:
+                reservation = self.reservations.remove(reservation_id)
+            if reservation is None:
+                return None
+            if restaurant is not None:
+                restaurant.current_reservations = max(0, restaurant.current_reservations - 1)
+            if self.storage is not None:
+                try:
+                    self.storage.delete_booking(reservation, restaurant)
+                except Exception:
+                    if restaurant is not None:
+                        restaurant.current_reservations += 1
+                    with self._store_lock:
+                        self.reservations.add(reservation)
+                    raise
+            if restaurant is not None:
+                self.ledger.release(restaurant.id, day, at, reservation.party_size)
+                self.tables.release(restaurant.id, day, at, reservation.table_ids)
+        return reservation
+
+    def get(self, reservation_id: str) -> Optional[ReservationRecord]:
+        return self.reservations.get(reservation_id)
+
+    @staticmethod
+    def _slot(reservation: Reservation) -> tuple:
+        moment = datetime.strptime(f"{reservation.reservation_date} {reservation.reservation_time}", "%Y-%m-%d %H:%M")
+        return moment.date(), moment.time()
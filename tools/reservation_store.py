@@ -0,0 +1,93 @@
+from typing import List, Dict, Optional, Iterator, Tuple, Union
+from collections import defaultdict
+import re
+from models.restaurant import Reservation
+from models.records import ReservationRecord
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().casefold()
+
+
+def normalize_phone(phone: str) -> str:
+    """Digits only, so "+1 (555) 123-4567" and "15551234567" are the same key"""
+    return _NON_DIGITS.sub("", phone)
+
+
+class ReservationStore:
+    """
+    Reservations keyed by id, with secondary indexes by restaurant and date and
+    by customer email and phone.
+
+    Every lookup is a dictionary access followed by work proportional to the
+    number of matching reservations, so cancelling a booking or listing a
+    customer's bookings does not depend on how many reservations exist.
+    Iteration yields reservations in the order they were added. Reservations
+    are kept, and returned, as compact ReservationRecords.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, ReservationRecord] = {}
+        self._by_restaurant_date: Dict[Tuple[str, str], Dict[str, None]] = defaultdict(dict)
+        self._by_email: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_phone: Dict[str, Dict[str, None]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[ReservationRecord]:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, reservation_id: str) -> bool:
+        return reservation_id in self._by_id
+
+    def get(self, reservation_id: str) -> Optional[ReservationRecord]:
+        return self._by_id.get(reservation_id)
+
+    def add(self, reservation: Union[Reservation, ReservationRecord]) -> None:
+        """Store a reservation, replacing any previous one with the same id"""
+        reservation = ReservationRecord.from_model(reservation)
+        self.remove(reservation.id)
+        self._by_id[reservation.id] = reservation
+        for index, key in self._index_keys(reservation):
+            index[key][reservation.id] = None
+
+    def remove(self, reservation_id: str) -> Optional[ReservationRecord]:
+        reservation = self._by_id.pop(reservation_id, None)
+        if reservation is None:
+            return None
+        for index, key in self._index_keys(reservation):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(reservation_id, None)
+                if not ids:
+                    del index[key]
+        return reservation
+
+    def for_restaurant(self, restaurant_id: str, date: str) -> List[ReservationRecord]:
+        """Reservations at a restaurant on a date (YYYY-MM-DD), in booking order"""
+        return self._resolve(self._by_restaurant_date.get((restaurant_id, date)))
+
+    def for_customer(self, email: Optional[str] = None, phone: Optional[str] = None) -> List[ReservationRecord]:
+        """
+        Reservations made with the given email and/or phone. When both are given
+        a reservation matching either one is returned.
+        """
+        ids: Dict[str, None] = {}
+        if email:
+            ids.update(self._by_email.get(normalize_email(email), {}))
+        if phone and normalize_phone(phone):
+            ids.update(self._by_phone.get(normalize_phone(phone), {}))
+        return self._resolve(ids)
+
+    def _resolve(self, ids: Optional[Dict[str, None]]) -> List[ReservationRecord]:
+        return [self._by_id[rid] for rid in ids or ()]
+
+    def _index_keys(self, reservation: ReservationRecord):
+        yield self._by_restaurant_date, (reservation.restaurant_id, reservation.reservation_date)
+        yield self._by_email, normalize_email(reservation.customer_email)
+        phone = normalize_phone(reservation.customer_phone)
+        if phone:
+            yield self._by_phone, phone
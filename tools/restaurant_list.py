@@ -0,0 +1,56 @@
+from typing import List, Dict, Iterable, Iterator, Union, overload
+from models.restaurant import Restaurant
+from tools.catalog_index import CatalogIndex
+
+
+class RestaurantList:
+    """
+    The catalog's restaurants as a read-only list.
+
+    Only ids are kept; entries are looked up in the CatalogIndex when read, so
+    restaurants of a mapped catalog file are built on first access instead of
+    all at start-up. Changes go through ``append`` and ``remove``. Each id's
+    position is tracked and removal moves the last restaurant into the gap,
+    so both are O(1); the list is in catalog order only until the first
+    removal (CatalogIndex.lookup keeps catalog order).
+    """
+
+    def __init__(self, catalog: CatalogIndex, restaurant_ids: Iterable[str] = ()):
+        self._catalog = catalog
+        self._ids: List[str] = list(restaurant_ids)
+        self._positions: Dict[str, int] = {rid: position for position, rid in enumerate(self._ids)}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, position: int) -> Restaurant: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[Restaurant]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[Restaurant, List[Restaurant]]:
+        if isinstance(position, slice):
+            return [self._catalog.get(rid) for rid in self._ids[position]]
+        return self._catalog.get(self._ids[position])
+
+    def __iter__(self) -> Iterator[Restaurant]:
+        for restaurant_id in list(self._ids):
+            yield self._catalog.get(restaurant_id)
+
+    def copy(self) -> List[Restaurant]:
+        return list(self)
+
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def append(self, restaurant_id: str) -> None:
+        self._positions[restaurant_id] = len(self._ids)
+        self._ids.append(restaurant_id)
+
+    def remove(self, restaurant_id: str) -> None:
+        position = self._positions.pop(restaurant_id)
+        last = self._ids.pop()
+        if last != restaurant_id:
+            self._ids[position] = last
+            self._positions[last] = position
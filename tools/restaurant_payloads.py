@@ -0,0 +1,156 @@
+from typing import List, Dict, Any, Iterable
+import json
+from models.restaurant import Restaurant
+
+# Restaurant fields of a search result that change with bookings; the rest only change on edits
+DYNAMIC_FIELD = "available_tables"
+
+
+class _Fragment:
+    """Static part of one restaurant's payload, as a dict and as JSON around the dynamic field"""
+
+    __slots__ = ("restaurant", "revision", "fields", "head", "tail")
+
+    def __init__(self, restaurant: Restaurant):
+        self.restaurant = restaurant
+        self.revision = restaurant.revision
+        self.fields = {
+            "id": restaurant.id,
+            "name": restaurant.name,
+            "location": restaurant.location,
+            "cuisine": restaurant.cuisine.value,
+            "price_range": restaurant.price_range.value,
+            "rating": restaurant.rating,
+            DYNAMIC_FIELD: 0,
+            "capacity": restaurant.capacity,
+            "special_features": restaurant.special_features,
+            "contact_phone": restaurant.contact_phone,
+            "address": restaurant.address,
+            "opening_time": restaurant.opening_time.strftime("%H:%M"),
+            "closing_time": restaurant.closing_time.strftime("%H:%M")
+        }
+        keys = list(self.fields)
+        split = keys.index(DYNAMIC_FIELD)
+        # '{"id": ..., "rating": 4.5, "available_tables": ' and ', "capacity": ...' without the closing brace
+        self.head = json.dumps({key: self.fields[key] for key in keys[:split]})[:-1] + \
+            f", {json.dumps(DYNAMIC_FIELD)}: "
+        self.tail = ", " + json.dumps({key: self.fields[key] for key in keys[split + 1:]})[1:-1]
+
+
+class RestaurantPayload(dict):
+    """
+    A restaurant as returned by the search tools: a plain dict that also
+    remembers the pre-encoded JSON of its static fields. ``to_json`` reuses
+    it until one of those fields is overwritten or removed; keys added after
+    them (such as distance_km) are encoded on the spot.
+    """
+
+    __slots__ = ("_fragment",)
+
+    def __setitem__(self, key, value) -> None:
+        if key != DYNAMIC_FIELD and key in self:
+            self._fragment = None
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        self._fragment = None
+        dict.__delitem__(self, key)
+
+    def pop(self, *args):
+        self._fragment = None
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._fragment = None
+        return dict.popitem(self)
+
+    def update(self, *args, **kwargs) -> None:
+        self._fragment = None
+        dict.update(self, *args, **kwargs)
+
+    def clear(self) -> None:
+        self._fragment = None
+        dict.clear(self)
+
+    def __ior__(self, other):
+        self._fragment = None
+        return dict.__ior__(self, other)
+
+    def copy(self) -> "RestaurantPayload":
+        payload = RestaurantPayload(self)
+        payload._fragment = getattr(self, "_fragment", None)
+        return payload
+
+    def to_json(self) -> str:
+        """The same text as json.dumps(self)"""
+        fragment = getattr(self, "_fragment", None)
+        available = self.get(DYNAMIC_FIELD)
+        if fragment is None or type(available) is not int:
+            return json.dumps(self)
+        if len(self) == len(fragment.fields):
+            return f"{fragment.head}{available}{fragment.tail}}}"
+        extra = list(self.items())[len(fragment.fields):]
+        if not all(isinstance(key, str) for key, _ in extra):
+            return json.dumps(self)
+        extra = "".join(f", {json.dumps(key)}: {json.dumps(value)}" for key, value in extra)
+        return f"{fragment.head}{available}{fragment.tail}{extra}}}"
+
+
+class RestaurantPayloadCache:
+    """
+    Search result payloads of restaurants, built once per restaurant.
+
+    The static fields of a restaurant's payload are kept as a dict and as
+    pre-encoded JSON; each call copies the dict and fills in the number of
+    available tables, which is the only field that moves with bookings. An
+    entry is rebuilt when its restaurant is replaced or one of its fields
+    other than current_reservations is assigned (see Restaurant.revision).
+    """
+
+    def __init__(self):
+        self._fragments: Dict[str, _Fragment] = {}
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def payload(self, restaurant: Restaurant) -> RestaurantPayload:
+        fragment = self._fragments.get(restaurant.id)
+        if fragment is None or fragment.restaurant is not restaurant or fragment.revision != restaurant.revision:
+            fragment = self._fragments[restaurant.id] = _Fragment(restaurant)
+        payload = RestaurantPayload(fragment.fields)
+        dict.__setitem__(payload, DYNAMIC_FIELD, restaurant.available_tables)
+        payload._fragment = fragment
+        return payload
+
+    def payloads(self, restaurants: Iterable[Restaurant]) -> List[RestaurantPayload]:
+        return [self.payload(restaurant) for restaurant in restaurants]
+
+    def discard(self, restaurant_id: str) -> None:
+        self._fragments.pop(restaurant_id, None)
+
+    def clear(self) -> None:
+        self._fragments.clear()
+
+
+def encode_result(value: Any) -> str:
+    """
+    json.dumps for tool results: dicts and lists holding restaurant payloads
+    are assembled from the payloads' pre-encoded JSON, anything else is
+    encoded by json.dumps as usual.
+    """
+    if isinstance(value, RestaurantPayload):
+        return value.to_json()
+    if isinstance(value, dict) and _holds_payloads(value.values()) and all(isinstance(key, str) for key in value):
+        return "{" + ", ".join(f"{json.dumps(key)}: {encode_result(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)) and _holds_payloads(value):
+        return "[" + ", ".join(encode_result(item) for item in value) + "]"
+    return json.dumps(value)
+
+
+def _holds_payloads(values: Iterable[Any]) -> bool:
+    # Only one level deep: results nest restaurant payloads at most in a list under a key
+    return any(isinstance(item, RestaurantPayload) or
+               (isinstance(item, (list, tuple, dict)) and
+                any(isinstance(inner, RestaurantPayload)
+                    for inner in (item.values() if isinstance(item, dict) else item)))
+               for item in values)
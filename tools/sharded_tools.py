@@ -0,0 +1,353 @@
+from typing import List, Dict, Any, Optional, Iterator, Set
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+import os
+import threading
+from data.catalog_file import MappedCatalog
+from tools.enhanced_reservation_tools import EnhancedReservationTools
+from storage import StorageBackend, create_backend
+from config import config
+
+SHARD_EXTENSION = ".catalog"
+
+# Where each storage backend keeps a shard's data, next to its catalog file
+_STORAGE_SUFFIXES = {"sqlite": ".db", "journal": ".journal"}
+
+
+def shard_key(tenant: str, city: str) -> str:
+    """Shard of a tenant (restaurant chain or operator) in a city, e.g. "goodfoods/new-york" """
+    return f"{_slug(tenant)}/{_slug(city)}"
+
+
+class _Shard:
+    """One loaded shard and the calls currently using it"""
+
+    def __init__(self, tools: EnhancedReservationTools):
+        self.tools = tools
+        self.users = 0
+
+
+class ShardedReservationTools:
+    """
+    Restaurant catalogs split by tenant and city, each served by its own
+    EnhancedReservationTools with its own restaurants, indexes, capacity
+    ledger and storage.
+
+    Shards are catalog files laid out as ``<directory>/<tenant>/<city>.catalog``.
+    A shard is loaded on first use and up to ``max_loaded`` stay in memory:
+    loading another one unloads the least recently used shard that is idle
+    and can be rebuilt, i.e. it has nobody on its waitlist and its
+    reservations are persisted (or it has none). Search calls name their
+    shard; calls with a restaurant, reservation or waitlist id are routed to
+    the shard that owns it, so only that shard is touched. The one thing
+    kept for every shard is a directory of restaurant ids, read from the id
+    tables of the catalog files without loading them.
+
+    Shards are built outside the router lock: the first call for a shard
+    starts loading it and later calls for the same shard wait for that load,
+    while calls for other shards carry on. The lock is only taken to publish
+    a loaded shard and to keep the LRU order.
+    """
+
+    def __init__(self,
+                 directory: str = config.SHARD_DIR,
+                 max_loaded: int = config.MAX_LOADED_SHARDS,
+                 storage_backend: str = config.STORAGE_BACKEND,
+                 columnar: Optional[bool] = None):
+        self.directory = directory
+        self.max_loaded = max_loaded
+        self.storage_backend = storage_backend
+        self.columnar = columnar
+        self.loads = 0
+        self.unloads = 0
+        self._paths = self._discover()
+        self._loaded: "OrderedDict[str, _Shard]" = OrderedDict()
+        # Restaurant ids of every shard, read from the catalog files' id tables on first need
+        self._restaurant_shards: Optional[Dict[str, str]] = None
+        # Reservation and waitlist ids seen through this router, and the ids each loaded shard owns
+        self._owners: Dict[str, str] = {}
+        self._owned: Dict[str, Set[str]] = {}
+        # Shards being loaded, each with the future its other callers wait on
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+
+    def shard_keys(self) -> List[str]:
+        return sorted(self._paths)
+
+    def loaded_shards(self) -> List[str]:
+        """Loaded shards, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def shard(self, tenant: str, city: str) -> EnhancedReservationTools:
+        """Tools of one shard, loading it if needed"""
+        with self._use(shard_key(tenant, city)) as tools:
+            return tools
+
+    def shard_for_restaurant(self, restaurant_id: str) -> Optional[str]:
+        with self._lock:
+            # Loaded shards first: they also know restaurants added since their file was written
+            for key, shard in self._loaded.items():
+                if restaurant_id in shard.tools.catalog_index:
+                    return key
+            if self._restaurant_shards is None:
+                self._restaurant_shards = {}
+                for key, path in self._paths.items():
+                    catalog = MappedCatalog(path)
+                    self._restaurant_shards.update(dict.fromkeys(catalog.ids(), key))
+                    catalog.close()
+            return self._restaurant_shards.get(restaurant_id)
+
+    def unload(self, key: str) -> bool:
+        """Unload an idle shard whose state can be rebuilt. Returns False if it stays loaded."""
+        with self._lock:
+            shard = self._evict(key)
+        if shard is None:
+            return False
+        self._close(shard)
+        return True
+
+    # Searches within one shard
+
+    def search_restaurants(self, tenant: str, city: str, **arguments) -> List[Dict[str, Any]]:
+        with self._use(shard_key(tenant, city)) as tools:
+            return tools.search_restaurants(**arguments)
+
+    def check_availability_matrix(self, tenant: str, city: str, **arguments) -> Dict[str, Any]:
+        with self._use(shard_key(tenant, city)) as tools:
+            return tools.check_availability_matrix(**arguments)
+
+    def get_restaurant_recommendations(self, tenant: str, city: str, **arguments) -> List[Dict[str, Any]]:
+        with self._use(shard_key(tenant, city)) as tools:
+            return tools.get_restaurant_recommendations(**arguments)
+
+    def get_customer_reservations(self, tenant: str, city: str, **arguments) -> Dict[str, Any]:
+        with self._use(shard_key(tenant, city)) as tools:
+            return tools.get_customer_reservations(**arguments)
+
+    # Calls routed by restaurant id
+
+    def check_availability(self, restaurant_id: str, **arguments) -> Dict[str, Any]:
+        key = self.shard_for_restaurant(restaurant_id)
+        if key is None:
+            return {"available": False, "message": "Restaurant not found"}
+        with self._use(key) as tools:
+            return tools.check_availability(restaurant_id, **arguments)
+
+    def find_next_available(self, restaurant_ids: List[str], **arguments) -> Dict[str, Any]:
+        # Alternatives are searched in the shard of the first restaurant
+        key = next(filter(None, map(self.shard_for_restaurant, restaurant_ids or [])), None)
+        if key is None:
+            return {"success": False, "message": "Restaurant not found"}
+        with self._use(key) as tools:
+            return tools.find_next_available(restaurant_ids, **arguments)
+
+    def create_reservation(self, restaurant_id: str, **arguments) -> Dict[str, Any]:
+        key = self.shard_for_restaurant(restaurant_id)
+        if key is None:
+            return {"success": False, "message": "Restaurant not found"}
+        with self._use(key) as tools:
+            result = tools.create_reservation(restaurant_id, **arguments)
+            self._remember(key, result.get("reservation_id"))
+        return result
+
+    def create_batch_reservations(self, reservations: List[Dict[str, Any]], **arguments) -> Dict[str, Any]:
+        # A batch is all-or-nothing, which only one shard can promise
+        keys = {self.shard_for_restaurant(item.get("restaurant_id", "")) for item in reservations or []}
+        if len(keys) != 1 or None in keys:
+            return EnhancedReservationTools._batch_failure(reservations or [], {
+                position: "Restaurant not found" if self.shard_for_restaurant(item.get("restaurant_id", "")) is None
+                else "Batch reservations must all be in the same city and tenant"
+                for position, item in enumerate(reservations or [])})
+        key = keys.pop()
+        with self._use(key) as tools:
+            result = tools.create_batch_reservations(reservations, **arguments)
+            for item in result.get("reservations", []):
+                self._remember(key, item.get("reservation_id"))
+        return result
+
+    def join_waitlist(self, restaurant_id: str, **arguments) -> Dict[str, Any]:
+        key = self.shard_for_restaurant(restaurant_id)
+        if key is None:
+            return {"success": False, "message": "Restaurant not found"}
+        with self._use(key) as tools:
+            result = tools.join_waitlist(restaurant_id, **arguments)
+            self._remember(key, result.get("waitlist_id"))
+        return result
+
+    # Calls routed by reservation or waitlist id
+
+    def cancel_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        key = self._reservation_shard(reservation_id)
+        if key is None:
+            return {"success": False, "message": "Reservation not found. Please check your reservation ID."}
+        with self._use(key) as tools:
+            return tools.cancel_reservation(reservation_id)
+
+    def get_reservation_details(self, reservation_id: str) -> Dict[str, Any]:
+        key = self._reservation_shard(reservation_id)
+        if key is None:
+            return {"found": False, "message": "Reservation not found"}
+        with self._use(key) as tools:
+            return tools.get_reservation_details(reservation_id)
+
+    def get_waitlist_status(self, waitlist_id: str) -> Dict[str, Any]:
+        key = self._owners.get(waitlist_id)
+        if key is None:
+            return {"found": False, "message": "Waitlist entry not found"}
+        with self._use(key) as tools:
+            result = tools.get_waitlist_status(waitlist_id)
+            self._remember(key, result.get("waitlist", {}).get("reservation_id"))
+        return result
+
+    def leave_waitlist(self, waitlist_id: str) -> Dict[str, Any]:
+        key = self._owners.get(waitlist_id)
+        if key is None:
+            return {"success": False, "message": "No waiting party found with that waitlist ID"}
+        with self._use(key) as tools:
+            return tools.leave_waitlist(waitlist_id)
+
+    def close(self) -> None:
+        with self._lock:
+            shards = list(self._loaded.values())
+            self._loaded.clear()
+            self._owners.clear()
+            self._owned.clear()
+        for shard in shards:
+            self._close(shard)
+
+    @contextmanager
+    def _use(self, key: str) -> Iterator[EnhancedReservationTools]:
+        # Shards in use are never unloaded, so a call keeps working on the shard it started with
+        shard = self._acquire(key)
+        try:
+            yield shard.tools
+        finally:
+            with self._lock:
+                shard.users -= 1
+
+    def _acquire(self, key: str) -> _Shard:
+        """The loaded shard with one more user, loading it first if needed"""
+        if key not in self._paths:
+            raise ValueError(f"Unknown shard: {key}")
+        while True:
+            with self._lock:
+                shard = self._loaded.get(key)
+                if shard is not None:
+                    self._loaded.move_to_end(key)
+                    shard.users += 1
+                    return shard
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = Future()
+                    break
+            # Another call is loading the shard; it may be unloaded again before we get to it, so look again
+            loading.result()
+
+        try:
+            tools = self._load(key)
+        except BaseException as error:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(error)
+            raise
+        with self._lock:
+            evicted = []
+            for cold in list(self._loaded):
+                if len(self._loaded) < self.max_loaded:
+                    break
+                evicted.append(self._evict(cold))
+            shard = self._loaded[key] = _Shard(tools)
+            shard.users += 1
+            self._owned[key] = set()
+            for reservation in tools.reservations:
+                self._remember(key, reservation.id)
+            self.loads += 1
+            del self._loading[key]
+        loading.set_result(shard)
+        for cold in evicted:
+            if cold is not None:
+                self._close(cold)
+        return shard
+
+    def _load(self, key: str) -> EnhancedReservationTools:
+        return EnhancedReservationTools(columnar=self.columnar, storage=self._storage(key),
+                                        catalog_path=self._paths[key])
+
+    def _evict(self, key: str) -> Optional[_Shard]:
+        # Called with the lock held; the caller closes the shard after releasing it
+        shard = self._loaded.get(key)
+        if shard is None or not self._evictable(shard):
+            return None
+        del self._loaded[key]
+        for owned_id in self._owned.pop(key, ()):
+            self._owners.pop(owned_id, None)
+        self.unloads += 1
+        return shard
+
+    @staticmethod
+    def _close(shard: _Shard) -> None:
+        if shard.tools.storage is not None:
+            shard.tools.storage.close()
+
+    def _evictable(self, shard: _Shard) -> bool:
+        tools = shard.tools
+        if shard.users or len(tools.waitlist):
+            return False
+        return tools.storage is not None or not len(tools.reservations)
+
+    def _storage(self, key: str) -> Optional[StorageBackend]:
+        suffix = _STORAGE_SUFFIXES.get(self.storage_backend)
+        if suffix is None:
+            return create_backend(self.storage_backend)
+        return create_backend(self.storage_backend, self._paths[key][:-len(SHARD_EXTENSION)] + suffix)
+
+    def _reservation_shard(self, reservation_id: str) -> Optional[str]:
+        key = self._owners.get(reservation_id)
+        if key is not None:
+            return key
+        with self._lock:
+            # Booked from a waitlist, or persisted before this process started
+            for key, shard in self._loaded.items():
+                if shard.tools.reservation_engine.get(reservation_id) is not None:
+                    return self._remember(key, reservation_id)
+            suffix = _STORAGE_SUFFIXES.get(self.storage_backend)
+            if suffix is None:
+                return None
+            for key, path in self._paths.items():
+                if key not in self._loaded and os.path.exists(path[:-len(SHARD_EXTENSION)] + suffix):
+                    storage = self._storage(key)
+                    try:
+                        if storage.get_reservation(reservation_id) is not None:
+                            return self._remember(key, reservation_id)
+                    finally:
+                        storage.close()
+        return None
+
+    def _remember(self, key: str, owned_id: Optional[str]) -> Optional[str]:
+        if owned_id:
+            with self._lock:
+                # Only loaded shards keep their ids here; the others are found again through their storage
+                owned = self._owned.get(key)
+                if owned is not None:
+                    owned.add(owned_id)
+                    self._owners[owned_id] = key
+        return key
+
+    def _discover(self) -> Dict[str, str]:
+        paths = {}
+        if not os.path.isdir(self.directory):
+            return paths
+        for tenant in sorted(os.listdir(self.directory)):
+            folder = os.path.join(self.directory, tenant)
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if name.endswith(SHARD_EXTENSION):
+                    paths[shard_key(tenant, name[:-len(SHARD_EXTENSION)])] = os.path.join(folder, name)
+        return paths
+
+
+def _slug(name: str) -> str:
+    return "-".join(name.lower().split())
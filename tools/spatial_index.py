@@ -0,0 +1,193 @@
+from typing import List, Dict, Optional, Tuple, Callable, Iterable
+from collections import defaultdict
+import math
+from models.restaurant import Restaurant
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialIndex:
+    """
+    Uniform lat/lon grid over restaurant coordinates.
+
+    Radius queries only visit the grid cells overlapping the query's bounding
+    box and k-nearest queries expand ring by ring around the origin until no
+    unvisited cell can hold a closer match. The expansion starts at the first
+    ring that reaches occupied cells, only looks at the occupied rows and
+    columns of each ring, and never searches further than ``max_radius_km``.
+    Restaurants without coordinates are not indexed. The index also tracks
+    the centroid of every location name so "near Harbor View" can be answered
+    without a gazetteer.
+    """
+
+    def __init__(self, restaurants: Iterable[Restaurant] = (), cell_km: float = 1.0,
+                 max_radius_km: float = 50.0):
+        self.cell_degrees = cell_km / KM_PER_DEGREE_LAT
+        self.max_radius_km = max_radius_km
+        self._cells: Dict[Tuple[int, int], Dict[str, Tuple[float, float]]] = defaultdict(dict)
+        # Occupied columns of every occupied row, and occupied rows of every occupied column
+        self._rows: Dict[int, Dict[int, None]] = defaultdict(dict)
+        self._cols: Dict[int, Dict[int, None]] = defaultdict(dict)
+        self._cell_of: Dict[str, Tuple[int, int]] = {}
+        self._area_sums: Dict[str, List[float]] = {}
+        self._area_of: Dict[str, str] = {}
+        # Grid extent ever occupied (never shrinks), bounds the ring expansion
+        self._bounds = (0, 0, -1, -1)
+
+        for restaurant in restaurants:
+            self.add(restaurant)
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def add(self, restaurant: Restaurant) -> None:
+        self.remove(restaurant.id)
+        if restaurant.latitude is None or restaurant.longitude is None:
+            return
+
+        cell = self._cell(restaurant.latitude, restaurant.longitude)
+        self._cells[cell][restaurant.id] = (restaurant.latitude, restaurant.longitude)
+        self._rows[cell[0]][cell[1]] = None
+        self._cols[cell[1]][cell[0]] = None
+        self._cell_of[restaurant.id] = cell
+        if self._bounds[2] < self._bounds[0]:
+            self._bounds = (cell[0], cell[1], cell[0], cell[1])
+        else:
+            min_row, min_col, max_row, max_col = self._bounds
+            self._bounds = (min(min_row, cell[0]), min(min_col, cell[1]),
+                            max(max_row, cell[0]), max(max_col, cell[1]))
+
+        area = restaurant.location_key
+        sums = self._area_sums.setdefault(area, [0.0, 0.0, 0])
+        sums[0] += restaurant.latitude
+        sums[1] += restaurant.longitude
+        sums[2] += 1
+        self._area_of[restaurant.id] = area
+
+    def remove(self, restaurant_id: str) -> None:
+        cell = self._cell_of.pop(restaurant_id, None)
+        if cell is None:
+            return
+        lat, lon = self._cells[cell].pop(restaurant_id)
+        if not self._cells[cell]:
+            del self._cells[cell]
+            for lines, line, position in ((self._rows, cell[0], cell[1]), (self._cols, cell[1], cell[0])):
+                del lines[line][position]
+                if not lines[line]:
+                    del lines[line]
+
+        area = self._area_of.pop(restaurant_id)
+        sums = self._area_sums[area]
+        sums[0] -= lat
+        sums[1] -= lon
+        sums[2] -= 1
+        if not sums[2]:
+            del self._area_sums[area]
+
+    def area_centroid(self, area: str) -> Optional[Tuple[float, float]]:
+        """Mean coordinates of the restaurants whose location matches ``area``"""
+        sums = self._area_sums.get(area.strip().lower())
+        if not sums:
+            return None
+        return sums[0] / sums[2], sums[1] / sums[2]
+
+    def within(self,
+               lat: float,
+               lon: float,
+               radius_km: float,
+               predicate: Optional[Callable[[str], bool]] = None) -> List[Tuple[float, str]]:
+        """All ``(distance_km, restaurant_id)`` pairs within the radius (at most max_radius_km), nearest first"""
+        radius_km = min(radius_km, self.max_radius_km)
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lon_span = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        min_row, min_col = self._cell(lat - lat_span, lon - lon_span)
+        max_row, max_col = self._cell(lat + lat_span, lon + lon_span)
+
+        hits = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                cell = self._cells.get((row, col))
+                if cell:
+                    self._collect(cell, lat, lon, radius_km, predicate, hits)
+        hits.sort()
+        return hits
+
+    def nearest(self,
+                lat: float,
+                lon: float,
+                k: int,
+                max_radius_km: Optional[float] = None,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[Tuple[float, str]]:
+        """
+        The ``k`` closest ``(distance_km, restaurant_id)`` pairs within
+        ``max_radius_km`` (and never beyond the index's own cap), nearest first.
+        An empty list means nothing is close enough.
+        """
+        if k <= 0 or not self._cells:
+            return []
+        limit = min(max_radius_km, self.max_radius_km) if max_radius_km is not None else self.max_radius_km
+        origin_row, origin_col = self._cell(lat, lon)
+        min_row, min_col, max_row, max_col = self._bounds
+        # Rings closer than the occupied extent are empty; rings past it hold nothing new
+        first_ring = max(min_row - origin_row, origin_row - max_row, min_col - origin_col, origin_col - max_col, 0)
+        max_ring = max(abs(origin_row - min_row), abs(origin_row - max_row),
+                       abs(origin_col - min_col), abs(origin_col - max_col))
+        # Rows are a whole cell high at any latitude: too many rows away is out of reach
+        rows_away = max(min_row - origin_row, origin_row - max_row, 0)
+        if max(rows_away - 1, 0) * self.cell_degrees * KM_PER_DEGREE_LAT > limit:
+            return []
+        # Narrowest cell edge in km, used to bound the distance to unvisited rings
+        cell_km = self.cell_degrees * KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6)
+
+        hits: List[Tuple[float, str]] = []
+        for ring in range(first_ring, max_ring + 1):
+            # The origin may sit anywhere in its cell, so ring N is at least N - 1 cells away
+            unvisited_km = max(ring - 1, 0) * cell_km
+            if unvisited_km > limit or (len(hits) >= k and unvisited_km >= hits[k - 1][0]):
+                break
+            for cell_key in self._ring(origin_row, origin_col, ring):
+                self._collect(self._cells[cell_key], lat, lon, limit, predicate, hits)
+            hits.sort()
+        return hits[:k]
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def _ring(self, row: int, col: int, ring: int):
+        """Occupied cells of one ring around (row, col)"""
+        if ring == 0:
+            if (row, col) in self._cells:
+                yield row, col
+            return
+        for side_row in (row - ring, row + ring):
+            for c in self._occupied(self._rows, side_row, col - ring, col + ring):
+                yield side_row, c
+        for side_col in (col - ring, col + ring):
+            for r in self._occupied(self._cols, side_col, row - ring + 1, row + ring - 1):
+                yield r, side_col
+
+    @staticmethod
+    def _occupied(lines: Dict[int, Dict[int, None]], line: int, first: int, last: int) -> Iterable[int]:
+        positions = lines.get(line)
+        if not positions:
+            return ()
+        if len(positions) < last - first + 1:
+            return [position for position in positions if first <= position <= last]
+        return [position for position in range(first, last + 1) if position in positions]
+
+    @staticmethod
+    def _collect(cell, lat, lon, radius_km, predicate, hits) -> None:
+        for restaurant_id, (r_lat, r_lon) in cell.items():
+            distance = haversine_km(lat, lon, r_lat, r_lon)
+            if distance <= radius_km and (predicate is None or predicate(restaurant_id)):
+                hits.append((distance, restaurant_id))
@@ -0,0 +1,210 @@
+from typing import List, Dict, Optional, Tuple, Callable, Sequence
+from datetime import date as Date, time as Time
+from itertools import combinations_with_replacement
+import math
+import threading
+from models.restaurant import Restaurant, Table
+
+
+def max_party_size(restaurant: Restaurant, max_combined: int = 3) -> int:
+    """
+    Largest party the restaurant can seat at all: its biggest table, or its
+    ``max_combined`` biggest combinable tables pushed together. Restaurants
+    without a table inventory can seat up to their capacity.
+    """
+    if not restaurant.tables:
+        return restaurant.capacity
+    largest = max(table.seats for table in restaurant.tables)
+    combinable = sorted((t.seats for t in restaurant.tables if t.combinable), reverse=True)
+    return max(largest, sum(combinable[:max_combined]) if len(combinable) > 1 else 0)
+
+
+class _Layout:
+    """Table inventory of one restaurant with one bit per table"""
+
+    def __init__(self, tables: Sequence[Table]):
+        self.tables = sorted(tables, key=lambda t: (t.seats, t.id))
+        self.bit_by_id = {table.id: 1 << position for position, table in enumerate(self.tables)}
+        self.all_mask = (1 << len(self.tables)) - 1
+        self.combinable_mask = sum(self.bit_by_id[t.id] for t in self.tables if t.combinable)
+        # seats -> (mask of tables that size, bits of those tables in order)
+        self.by_seats: Dict[int, Tuple[int, List[int]]] = {}
+        for table in self.tables:
+            mask, bits = self.by_seats.get(table.seats, (0, []))
+            self.by_seats[table.seats] = (mask | self.bit_by_id[table.id], bits + [self.bit_by_id[table.id]])
+        self.sizes = sorted(self.by_seats)
+
+
+class TableAllocator:
+    """
+    Assigns parties to real tables, slot by slot.
+
+    Occupancy is one integer bitmask per restaurant, day and time slot, with a
+    bit per table, so "which tables are free for this whole dining span" is an
+    OR over a few integers. A party gets the single free table that wastes the
+    fewest seats or, when that wastes more, the tightest combination of up to
+    ``max_combined`` combinable tables. Among tables of the chosen size the one
+    next to existing bookings in time is preferred, which keeps free time on
+    the other tables in long contiguous blocks for later parties.
+    """
+
+    def __init__(self,
+                 slot_minutes: int = 30,
+                 duration_minutes: int = 120,
+                 max_combined: int = 3,
+                 clock: Callable[[], Date] = Date.today):
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = 24 * 60 // slot_minutes
+        self.slots_per_booking = max(1, math.ceil(duration_minutes / slot_minutes))
+        self.max_combined = max_combined
+        self.clock = clock
+        self._layouts: Dict[str, _Layout] = {}
+        self._occupied: Dict[str, Dict[Date, List[int]]] = {}
+        self._pruned_on = clock()
+        self._lock = threading.Lock()
+
+    def __contains__(self, restaurant_id: str) -> bool:
+        return restaurant_id in self._layouts
+
+    def register(self, restaurant: Restaurant) -> None:
+        """Track a restaurant's tables; bookings on tables it still has are kept"""
+        with self._lock:
+            previous = self._layouts.pop(restaurant.id, None)
+            if not restaurant.tables:
+                self._occupied.pop(restaurant.id, None)
+                return
+            layout = _Layout(restaurant.tables)
+            self._layouts[restaurant.id] = layout
+            if previous is not None:
+                self._remap(restaurant.id, previous, layout)
+
+    def unregister(self, restaurant_id: str) -> None:
+        with self._lock:
+            self._layouts.pop(restaurant_id, None)
+            self._occupied.pop(restaurant_id, None)
+
+    def find(self, restaurant_id: str, day: Date, at: Time, party_size: int) -> Optional[List[str]]:
+        """Tables that would be assigned to the party, without booking them"""
+        layout = self._layouts.get(restaurant_id)
+        if layout is None:
+            return None
+        bits = self._choose(layout, self._slots(restaurant_id, day), self._span(at), party_size)
+        return self._table_ids(layout, bits)
+
+    def assign(self, restaurant_id: str, day: Date, at: Time, party_size: int) -> Optional[List[str]]:
+        """Pick tables for the party and mark them occupied. Returns None when nothing fits."""
+        layout = self._layouts.get(restaurant_id)
+        if layout is None:
+            return None
+        with self._lock:
+            self._prune()
+            days = self._occupied.setdefault(restaurant_id, {})
+            slots = days.setdefault(day, [0] * self.slots_per_day)
+            start, end = self._span(at)
+            bits = self._choose(layout, slots, (start, end), party_size)
+            if bits is None:
+                return None
+            chosen = 0
+            for bit in bits:
+                chosen |= bit
+            for slot in range(start, end):
+                slots[slot] |= chosen
+        return self._table_ids(layout, bits)
+
+    def release(self, restaurant_id: str, day: Date, at: Time, table_ids: Sequence[str]) -> None:
+        layout = self._layouts.get(restaurant_id)
+        with self._lock:
+            slots = self._slots(restaurant_id, day)
+            if layout is None or slots is None:
+                return
+            freed = 0
+            for table_id in table_ids:
+                freed |= layout.bit_by_id.get(table_id, 0)
+            start, end = self._span(at)
+            for slot in range(start, end):
+                slots[slot] &= ~freed
+
+    def seated(self, restaurant_id: str, day: Date, slot: int) -> int:
+        """Seats at tables that are occupied during a slot (for utilization reports)"""
+        layout = self._layouts.get(restaurant_id)
+        slots = self._slots(restaurant_id, day)
+        if layout is None or slots is None:
+            return 0
+        mask = slots[slot]
+        return sum(table.seats for table in layout.tables if mask & layout.bit_by_id[table.id])
+
+    def _choose(self, layout: _Layout, slots: Optional[List[int]], span: Tuple[int, int],
+                party_size: int) -> Optional[List[int]]:
+        start, end = span
+        busy = 0
+        neighbours = 0
+        if slots is not None:
+            for slot in range(start, end):
+                busy |= slots[slot]
+            if start > 0:
+                neighbours |= slots[start - 1]
+            if end < self.slots_per_day:
+                neighbours |= slots[end]
+        free = layout.all_mask & ~busy
+
+        best: Optional[Tuple[int, int, List[int]]] = None
+        for seats in layout.sizes:
+            if seats >= party_size and free & layout.by_seats[seats][0]:
+                best = (seats - party_size, 1, [seats])
+                break
+
+        # Combinations only need to beat the best single table's wasted seats
+        free_combinable = free & layout.combinable_mask
+        counts = {seats: bin(free_combinable & layout.by_seats[seats][0]).count("1") for seats in layout.sizes}
+        sizes = [seats for seats in layout.sizes if counts[seats]]
+        for k in range(2, self.max_combined + 1 if best is None or best[0] else 2):
+            for combo in combinations_with_replacement(sizes, k):
+                total = sum(combo)
+                if total < party_size or any(combo.count(s) > counts[s] for s in set(combo)):
+                    continue
+                candidate = (total - party_size, k, list(combo))
+                if best is None or candidate[:2] < best[:2]:
+                    best = candidate
+
+        if best is None:
+            return None
+        taken = 0
+        chosen = []
+        for seats in best[2]:
+            pool = layout.all_mask if len(best[2]) == 1 else layout.combinable_mask
+            bits = [bit for bit in layout.by_seats[seats][1] if free & pool & bit and not taken & bit]
+            # Prefer a table already booked right before or after this span
+            bit = next((b for b in bits if neighbours & b), bits[0])
+            taken |= bit
+            chosen.append(bit)
+        return chosen
+
+    def _slots(self, restaurant_id: str, day: Date) -> Optional[List[int]]:
+        days = self._occupied.get(restaurant_id)
+        return days.get(day) if days else None
+
+    def _span(self, at: Time) -> Tuple[int, int]:
+        start = (at.hour * 60 + at.minute) // self.slot_minutes
+        return start, min(start + self.slots_per_booking, self.slots_per_day)
+
+    @staticmethod
+    def _table_ids(layout: _Layout, bits: Optional[List[int]]) -> Optional[List[str]]:
+        if bits is None:
+            return None
+        return [layout.tables[bit.bit_length() - 1].id for bit in bits]
+
+    def _remap(self, restaurant_id: str, previous: _Layout, layout: _Layout) -> None:
+        moves = [(previous.bit_by_id[table_id], bit) for table_id, bit in layout.bit_by_id.items()
+                 if table_id in previous.bit_by_id]
+        for slots in self._occupied.get(restaurant_id, {}).values():
+            for slot, mask in enumerate(slots):
+                slots[slot] = sum(new for old, new in moves if mask & old)
+
+    def _prune(self) -> None:
+        # Forget days that are over, at most once per day
+        today = self.clock()
+        if today != self._pruned_on:
+            for days in self._occupied.values():
+                for day in [day for day in days if day < today]:
+                    del days[day]
+            self._pruned_on = today
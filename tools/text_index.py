@@ -0,0 +1,126 @@
+from typing import List, Dict, Optional, Set, Iterable, Tuple
+from collections import Counter, defaultdict
+import math
+import re
+from models.restaurant import Restaurant
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "at", "for", "in", "is", "it", "of", "on", "or", "the", "to",
+    "with", "we", "i", "my", "our", "some", "something", "place", "restaurant", "want", "like"
+}
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stopwords dropped and plurals folded"""
+    return [_stem(token) for token in _TOKEN.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+class TextIndex:
+    """
+    In-process inverted index with BM25 scoring over restaurant text.
+
+    Each restaurant is one document made of its name, cuisine, special features
+    and address. Queries walk only the posting lists of their own terms, so the
+    cost depends on how common the query words are, not on catalog size. A
+    second, feature-only posting map answers "has a feature mentioning X".
+    """
+
+    def __init__(self, restaurants: Iterable[Restaurant] = (), k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._feature_postings: Dict[str, Set[str]] = defaultdict(set)
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_features: Dict[str, Set[str]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+        for restaurant in restaurants:
+            self.add(restaurant)
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, restaurant: Restaurant) -> None:
+        self.remove(restaurant.id)
+
+        feature_terms = set(tokenize(" ".join(restaurant.special_features)))
+        terms = Counter(tokenize(" ".join([
+            restaurant.name, restaurant.cuisine.value,
+            " ".join(restaurant.special_features), restaurant.address
+        ])))
+
+        for term, frequency in terms.items():
+            self._postings[term][restaurant.id] = frequency
+        for term in feature_terms:
+            self._feature_postings[term].add(restaurant.id)
+
+        self._doc_terms[restaurant.id] = terms
+        self._doc_features[restaurant.id] = feature_terms
+        length = sum(terms.values())
+        self._doc_lengths[restaurant.id] = length
+        self._total_length += length
+
+    def remove(self, restaurant_id: str) -> None:
+        terms = self._doc_terms.pop(restaurant_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[restaurant_id]
+            if not postings:
+                del self._postings[term]
+        for term in self._doc_features.pop(restaurant_id):
+            postings = self._feature_postings[term]
+            postings.discard(restaurant_id)
+            if not postings:
+                del self._feature_postings[term]
+        self._total_length -= self._doc_lengths.pop(restaurant_id)
+
+    def scores(self, query: str, candidates: Optional[Set[str]] = None) -> Dict[str, float]:
+        """BM25 score of every document sharing a term with the query"""
+        n_docs = len(self._doc_lengths)
+        if not n_docs:
+            return {}
+        average_length = self._total_length / n_docs
+
+        totals: Dict[str, float] = defaultdict(float)
+        for term, query_frequency in Counter(tokenize(query)).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                totals[doc_id] += query_frequency * idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return dict(totals)
+
+    def search(self, query: str, k: int = 10, candidates: Optional[Set[str]] = None) -> List[Tuple[float, str]]:
+        """Top ``k`` ``(score, restaurant_id)`` pairs for a free-text query"""
+        ranked = sorted(((score, doc_id) for doc_id, score in self.scores(query, candidates).items()),
+                        key=lambda item: (-item[0], item[1]))
+        return ranked[:k]
+
+    def feature_matches(self, feature: str) -> Set[str]:
+        """Ids of restaurants whose special features contain every word of ``feature``"""
+        terms = set(tokenize(feature))
+        if not terms:
+            return set()
+        postings = sorted((self._feature_postings.get(term, set()) for term in terms), key=len)
+        matched = set(postings[0])
+        for ids in postings[1:]:
+            matched &= ids
+        return matched
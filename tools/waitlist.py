@@ -0,0 +1,141 @@
+from typing import List, Dict, Optional, Tuple, Callable
+from collections import defaultdict
+from datetime import date as Date
+import heapq
+import itertools
+import threading
+from models.restaurant import WaitlistEntry
+
+# (negated priority, arrival sequence, entry id): heap order is best first
+_HeapItem = Tuple[int, int, str]
+
+
+class Waitlist:
+    """
+    Parties waiting for a restaurant, date and time slot.
+
+    Each slot keeps one heap per party size, ordered by priority and then by
+    request time. Promoting the best party that fits the freed seats only
+    compares the heads of those heaps (at most one per party size) and pops one
+    of them, so it costs O(log n) in the number of waiting parties. Parties
+    that leave are marked and dropped lazily when they reach the head.
+    """
+
+    def __init__(self, clock: Callable[[], Date] = Date.today):
+        self.clock = clock
+        self._entries: Dict[str, WaitlistEntry] = {}
+        self._heaps: Dict[Tuple[str, str, str], Dict[int, List[_HeapItem]]] = {}
+        self._times: Dict[Tuple[str, str], Dict[str, None]] = defaultdict(dict)
+        self._sequence = itertools.count()
+        self._pruned_on = clock()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries.values() if entry.status == "waiting")
+
+    def get(self, entry_id: str) -> Optional[WaitlistEntry]:
+        return self._entries.get(entry_id)
+
+    def join(self, entry: WaitlistEntry) -> None:
+        with self._lock:
+            self._prune()
+            key = (entry.restaurant_id, entry.reservation_date, entry.reservation_time)
+            buckets = self._heaps.setdefault(key, {})
+            heapq.heappush(buckets.setdefault(entry.party_size, []),
+                           (-entry.priority, next(self._sequence), entry.id))
+            self._times[key[:2]][entry.reservation_time] = None
+            self._entries[entry.id] = entry
+
+    def leave(self, entry_id: str) -> Optional[WaitlistEntry]:
+        """Take a waiting party off the list; returns None if it is not waiting"""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None or entry.status != "waiting":
+                return None
+            entry.status = "left"
+            return entry
+
+    def position(self, entry_id: str) -> Optional[int]:
+        """1-based place of a waiting party among everyone waiting for the same slot"""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None or entry.status != "waiting":
+                return None
+            buckets = self._heaps.get((entry.restaurant_id, entry.reservation_date, entry.reservation_time), {})
+            own = next(item for item in buckets[entry.party_size] if item[2] == entry_id)
+            return 1 + sum(1 for heap in buckets.values() for item in heap
+                           if item < own and self._entries[item[2]].status == "waiting")
+
+    def waiting_times(self, restaurant_id: str, date: str) -> List[str]:
+        """Times (HH:MM) that have parties waiting at a restaurant on a date"""
+        return list(self._times.get((restaurant_id, date), ()))
+
+    def promote(self,
+                restaurant_id: str,
+                date: str,
+                time: str,
+                seats_free: Callable[[], int],
+                book: Callable[[WaitlistEntry], Optional[str]]) -> List[WaitlistEntry]:
+        """
+        Book waiting parties for a slot while seats allow.
+
+        The best party (highest priority, then earliest) among those no larger
+        than ``seats_free()`` is passed to ``book``, which returns the new
+        reservation id or None when the party could not be seated after all;
+        the next-best party of another size is tried then. Returns the entries
+        that were booked.
+        """
+        promoted = []
+        with self._lock:
+            key = (restaurant_id, date, time)
+            buckets = self._heaps.get(key)
+            while buckets:
+                free = seats_free()
+                heads = sorted((self._head(heap), size) for size, heap in buckets.items()
+                               if size <= free and self._head(heap) is not None)
+                for item, size in heads:
+                    entry = self._entries[item[2]]
+                    reservation_id = book(entry)
+                    if reservation_id is not None:
+                        heapq.heappop(buckets[size])
+                        entry.status = "promoted"
+                        entry.reservation_id = reservation_id
+                        promoted.append(entry)
+                        break
+                else:
+                    break
+            self._drop_empty(key)
+        return promoted
+
+    def _head(self, heap: List[_HeapItem]) -> Optional[_HeapItem]:
+        # Discard parties that left before looking at the head
+        while heap and self._entries[heap[0][2]].status != "waiting":
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _drop_empty(self, key: Tuple[str, str, str]) -> None:
+        buckets = self._heaps.get(key)
+        if buckets is None:
+            return
+        for size in [size for size, heap in buckets.items() if self._head(heap) is None]:
+            del buckets[size]
+        if not buckets:
+            del self._heaps[key]
+            times = self._times.get(key[:2])
+            if times is not None:
+                times.pop(key[2], None)
+                if not times:
+                    del self._times[key[:2]]
+
+    def _prune(self) -> None:
+        # Forget slots on days that are over, at most once per day
+        today = self.clock()
+        if today == self._pruned_on:
+            return
+        cutoff = today.isoformat()
+        for key in [key for key in self._heaps if key[1] < cutoff]:
+            for heap in self._heaps.pop(key).values():
+                for _, _, entry_id in heap:
+                    self._entries.pop(entry_id, None)
+            self._times.pop(key[:2], None)
+        self._pruned_on = today
@@ -1,32 +1,21 @@
-from datetime import datetime, time
-import re
+from datetime import datetime, timedelta
+from utils import validation
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return validation.validate_email(email)
 
 def validate_phone(phone: str) -> bool:
-    """Validate phone number format"""
-    # Basic validation - can be enhanced based on requirements
-    pattern = r'^[\+]?[1-9][\d]{0,15}$'
-    return bool(re.match(pattern, phone.replace(' ', '').replace('-', '')))
+    """Validate phone number format (10 to 15 digits, optionally after "+")"""
+    return validation.normalize_phone(phone) is not None
 
 def validate_date(date_str: str) -> bool:
     """Validate date format YYYY-MM-DD"""
-    try:
-        datetime.strptime(date_str, '%Y-%m-%d')
-        return True
-    except ValueError:
-        return False
+    return validation.parse_date(date_str) is not None
 
 def validate_time(time_str: str) -> bool:
     """Validate time format HH:MM"""
-    try:
-        datetime.strptime(time_str, '%H:%M')
-        return True
-    except ValueError:
-        return False
+    return validation.parse_time(time_str) is not None
 
 def get_future_dates(days: int = 30):
     """Get list of future dates for dropdowns"""
@@ -0,0 +1,150 @@
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from datetime import date, time
+from functools import lru_cache
+import re
+
+_EMAIL = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+# The same inputs strptime accepts for "%Y-%m-%d" and "%H:%M": month, day and hour may drop the leading zero
+_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_TIME = re.compile(r"(\d{1,2}):(\d{1,2})")
+_PHONE_SEPARATORS = re.compile(r"[\s\-().]")
+_PHONE = re.compile(r"\+?\d{10,15}")
+
+MAX_PARTY_SIZE = 20
+
+BOOKING_FIELDS = ("customer_name", "customer_phone", "customer_email", "party_size", "date", "time")
+
+# Messages the tools return for invalid booking details
+INCOMPLETE_CONTACT = "Please provide complete customer information"
+INVALID_PARTY_SIZE = f"Party size must be between 1 and {MAX_PARTY_SIZE} people"
+INVALID_EMAIL = "Please provide a valid email address"
+INVALID_PHONE = "Please provide a valid phone number"
+INVALID_DATE = "Invalid date format. Please use YYYY-MM-DD"
+INVALID_TIME = "Invalid time format. Please use HH:MM"
+INVALID_SLOT = "Invalid date or time format. Please use YYYY-MM-DD and HH:MM"
+
+
+def validate_email(email: str) -> bool:
+    return isinstance(email, str) and _EMAIL.fullmatch(email) is not None
+
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """
+    A phone number without spaces, dashes, dots or brackets: 10 to 15 digits,
+    optionally after a leading "+". None when the number is not valid.
+    """
+    if not isinstance(phone, str):
+        return None
+    cleaned = _PHONE_SEPARATORS.sub("", phone)
+    return cleaned if _PHONE.fullmatch(cleaned) else None
+
+
+def parse_date(value: str) -> Optional[date]:
+    """A YYYY-MM-DD string as a date, or None. Parsed once per distinct value."""
+    return _parse_date(value) if isinstance(value, str) else None
+
+
+def parse_time(value: str) -> Optional[time]:
+    """An HH:MM string as a time, or None. Parsed once per distinct value."""
+    return _parse_time(value) if isinstance(value, str) else None
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> Optional[date]:
+    match = _DATE.fullmatch(value)
+    if match is None:
+        return None
+    try:
+        return date(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_time(value: str) -> Optional[time]:
+    match = _TIME.fullmatch(value)
+    if match is None:
+        return None
+    try:
+        return time(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+def validate_booking(name: str, phone: str, email: str, party_size: int,
+                     booking_date: str, booking_time: str) -> Tuple[Optional[str], Optional[tuple]]:
+    """
+    (error message, None) for invalid booking details, or
+    (None, (date, time, normalized phone)) for valid ones
+    """
+    if not all(isinstance(value, str) and value.strip() for value in (name, phone, email)):
+        return INCOMPLETE_CONTACT, None
+    if not 0 < party_size <= MAX_PARTY_SIZE:
+        return INVALID_PARTY_SIZE, None
+    if not validate_email(email):
+        return INVALID_EMAIL, None
+    normalized_phone = normalize_phone(phone)
+    if normalized_phone is None:
+        return INVALID_PHONE, None
+    day = parse_date(booking_date)
+    if day is None:
+        return INVALID_DATE, None
+    at = parse_time(booking_time)
+    if at is None:
+        return INVALID_TIME, None
+    return None, (day, at, normalized_phone)
+
+
+def validate_bookings(rows: Iterable[Dict[str, Any]],
+                      required: Iterable[str] = BOOKING_FIELDS) -> Tuple[List[Optional[tuple]], Dict[int, str]]:
+    """
+    Validate many booking rows (dicts with BOOKING_FIELDS) in one call, for bulk
+    imports and batch bookings.
+
+    Returns the (date, time, normalized phone) of every row, None where the row
+    is invalid, and the error message of each invalid row by position. Each row's
+    party_size is normalized to int in place. Contact details and date/time pairs
+    shared by several rows are checked once.
+    """
+    required = tuple(required)
+    values: List[Optional[tuple]] = []
+    errors: Dict[int, str] = {}
+    contacts: Dict[tuple, Any] = {}
+    for position, row in enumerate(rows):
+        error, value = _validate_row(row, required, contacts)
+        if error:
+            errors[position] = error
+        values.append(value)
+    return values, errors
+
+
+def _validate_row(row: Dict[str, Any], required: Tuple[str, ...], contacts: Dict[tuple, Any]) -> tuple:
+    missing = [field for field in required if not row.get(field)]
+    if missing:
+        return f"Missing {', '.join(missing)}", None
+    try:
+        row["party_size"] = int(row["party_size"])
+    except (ValueError, TypeError):
+        return "Party size must be a number", None
+    if not 0 < row["party_size"] <= MAX_PARTY_SIZE:
+        return INVALID_PARTY_SIZE, None
+
+    contact = (row["customer_name"], row["customer_phone"], row["customer_email"])
+    checked = contacts.get(contact)
+    if checked is None:
+        _, phone, email = contact
+        normalized_phone = normalize_phone(phone)
+        checked = contacts[contact] = (
+            INCOMPLETE_CONTACT if not all(isinstance(s, str) and s.strip() for s in contact) else
+            INVALID_EMAIL if not validate_email(email) else
+            INVALID_PHONE if normalized_phone is None else None,
+            normalized_phone
+        )
+    error, normalized_phone = checked
+    if error:
+        return error, None
+
+    day, at = parse_date(row["date"]), parse_time(row["time"])
+    if day is None or at is None:
+        return INVALID_SLOT, None
+    return None, (day, at, normalized_phone)